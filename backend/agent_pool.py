@@ -0,0 +1,154 @@
+"""CrewAI 에이전트 풀
+
+토론을 시작할 때마다 ChatRoundtable이 LLM 하나와 Agent 여섯 개(도구 바인딩 포함)를 새로 만들던 것을
+페르소나 내용(모델, role, goal, backstory)과 LLM 접속 설정(base_url, API 키)의 해시를 키로 재사용합니다. 페르소나가 실제로 바뀐
+에이전트만 새로 만들고, 서버 시작 시 저장된 페르소나로 미리 만들어 둡니다(warm).
+
+AGENT_POOL=0 으로 끄면 매번 새로 만듭니다 (비교/디버깅용).
+
+풀의 Agent는 여러 토론과 LLM 실행 풀 스레드가 함께 씁니다. 직접 호출 경로(direct_llm)는 role/goal/
+backstory만 읽으므로 그대로 공유해도 되지만, CrewAI는 실행할 때마다 Agent에 상태를 써 넣습니다
+(Crew가 agent.crew를, execute_task가 agent.agent_executor를 덮어씀). 같은 Agent로 두 Crew가 동시에
+돌면 서로의 실행기/작업 프롬프트를 쓰게 되므로, Crew 실행은 exclusive()로 에이전트별로 직렬화합니다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, Optional
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+def persona_key(persona: Dict, model: str = DEFAULT_MODEL, settings: Optional[Dict] = None) -> str:
+    """페르소나 내용 + LLM 접속 설정 해시 (같은 내용/설정이면 같은 키)
+
+    settings: get_openai_settings() 결과. 키나 base_url이 바뀌면 이전 설정의 LLM이 묶인 Agent를 쓰지 않도록 키에 포함
+    """
+    settings = settings or {}
+    payload = json.dumps([model, settings.get("api_key"), settings.get("base_url"),
+                          persona["role"], persona["goal"], persona["backstory"]], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _openai_settings() -> Dict:
+    from direct_llm import get_openai_settings
+    return get_openai_settings()
+
+
+class AgentPool:
+    """페르소나 해시 → 생성된 Agent (LRU, 최대 max_size개)"""
+
+    def __init__(self, model: str = DEFAULT_MODEL, max_size: int = 64, enabled: Optional[bool] = None):
+        self.model = model
+        self.max_size = max_size
+        self.enabled = enabled if enabled is not None else os.getenv("AGENT_POOL", "1") != "0"
+        self._agents = OrderedDict()
+        self._llm = None
+        self._llm_settings = None  # _llm을 만들 때 쓴 (api_key, base_url)
+        self._lock = threading.Lock()
+        self._exec_locks: Dict[int, threading.Lock] = {}  # id(Agent) → Crew 실행 잠금
+        self.hits = 0
+        self.builds = 0
+        self.build_s = 0.0
+
+    def _get_llm(self, settings: Optional[Dict] = None):
+        """현재 접속 설정의 LLM 반환 (설정이 바뀌었으면 새로 만듦)"""
+        settings = settings or _openai_settings()
+        settings_key = (settings["api_key"], settings["base_url"])
+        if self._llm is None or self._llm_settings != settings_key or not self.enabled:
+            from crewai.llm import LLM
+            if settings["base_url"]:
+                llm = LLM(model=self.model, api_key=settings["api_key"], base_url=settings["base_url"])
+            else:
+                llm = LLM(model=self.model, api_key=settings["api_key"])
+            if not self.enabled:
+                return llm
+            self._llm = llm
+            self._llm_settings = settings_key
+        return self._llm
+
+    def _build(self, persona: Dict, llm):
+        # crewai는 무거워서 처음 에이전트를 만들 때 불러옴
+        from crewai import Agent
+        from chat_roundtable import openai_research_crewai_tool, web_search_tool
+        started = time.perf_counter()
+        agent = Agent(
+            role=persona["role"],
+            goal=persona["goal"],
+            backstory=persona["backstory"],
+            verbose=True,
+            tools=[openai_research_crewai_tool, web_search_tool],
+            llm=llm
+        )
+        self.builds += 1
+        self.build_s += time.perf_counter() - started
+        return agent
+
+    def get(self, persona: Dict, llm=None):
+        """페르소나에 맞는 Agent 반환 (풀에 없을 때만 생성)"""
+        if not self.enabled:
+            with self._lock:
+                return self._build(persona, llm or self._get_llm())
+
+        settings = _openai_settings()
+        key = persona_key(persona, self.model, settings)
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is not None:
+                self._agents.move_to_end(key)
+                self.hits += 1
+                return agent
+            agent = self._build(persona, self._get_llm(settings))
+            self._agents[key] = agent
+            while len(self._agents) > self.max_size:
+                _, evicted = self._agents.popitem(last=False)
+                self._exec_locks.pop(id(evicted), None)
+            return agent
+
+    @contextmanager
+    def exclusive(self, agents: Iterable):
+        """Crew 실행 동안 해당 Agent들을 다른 Crew 실행과 겹치지 않게 잠금 (교착을 피하려고 id 순서로 획득)"""
+        with self._lock:
+            locks = [self._exec_locks.setdefault(id(agent), threading.Lock())
+                     for agent in sorted({id(a): a for a in agents}.values(), key=id)]
+        with ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+            yield
+
+    def get_many(self, personas: Dict[str, Dict]) -> Dict:
+        """{이름: 페르소나} → {이름: Agent} (같은 LLM 공유)"""
+        llm = None if self.enabled else self._get_llm()
+        return {name: self.get(persona, llm) for name, persona in personas.items()}
+
+    def warm(self, personas: Dict[str, Dict]) -> float:
+        """미리 생성해 두기 (블로킹, 걸린 시간(초) 반환)"""
+        started = time.perf_counter()
+        self.get_many(personas)
+        return time.perf_counter() - started
+
+    def clear(self):
+        with self._lock:
+            self._agents.clear()
+            self._exec_locks.clear()
+            self._llm = None
+            self._llm_settings = None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._agents),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "builds": self.builds,
+                "mean_build_ms": round(self.build_s / self.builds * 1000, 2) if self.builds else None
+            }
+
+
+# 전역 인스턴스
+agent_pool = AgentPool()
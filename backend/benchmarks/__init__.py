@@ -0,0 +1 @@
+"""백엔드 성능 벤치마크 모음"""
@@ -0,0 +1,105 @@
+"""토론 시작 지연 벤치마크: 에이전트 풀 사용/미사용 비교
+
+/api/start_discussion이 하는 일 중 LLM 호출 전 단계(ChatRoundtable 생성 + start_discussion)를
+반복 측정합니다. 에이전트 생성에는 네트워크가 필요 없으므로 API 키 없이 실행됩니다.
+
+측정 모드:
+  no_pool        : 매번 LLM/Agent를 새로 생성 (기존 동작)
+  pool_cold      : 풀을 비운 직후 첫 토론 시작
+  pool_warm      : 미리 만들어 둔 에이전트 재사용
+  persona_change : 페르소나 하나만 바뀐 상태로 시작 (바뀐 에이전트만 새로 생성)
+
+실행 예시 (backend 디렉토리에서):
+    python -m benchmarks.agent_pool_benchmark --repeat 20 --output agent_pool.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+import chat_roundtable
+from agent_pool import agent_pool
+from benchmarks.memory_benchmark import collect_environment, latency_summary
+from personas_storage import persona_storage
+
+
+def start_discussion_once() -> float:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        roundtable = chat_roundtable.ChatRoundtable()
+        roundtable.start_discussion("벤치마크 주제", {"industry": "제조"})
+    return time.perf_counter() - started
+
+
+def measure(mode: str, repeat: int) -> Dict:
+    samples: List[float] = []
+    builds_before = agent_pool.builds
+    for i in range(repeat):
+        if mode == "no_pool":
+            agent_pool.enabled = False
+        else:
+            agent_pool.enabled = True
+            if mode == "pool_cold":
+                agent_pool.clear()
+            elif mode == "persona_change":
+                # 진행자 페르소나의 backstory만 매번 다르게 바꿔 저장된 상태를 흉내 냄
+                personas = persona_storage.load_personas()
+                personas["진행자"]["backstory"] += f" (변경 {i})"
+                original_load = persona_storage.load_personas
+                persona_storage.load_personas = lambda p=personas: p
+        try:
+            samples.append(start_discussion_once())
+        finally:
+            if mode == "persona_change":
+                persona_storage.load_personas = original_load
+    return {
+        "mode": mode,
+        "latency": latency_summary(samples),
+        "agents_built_per_start": round((agent_pool.builds - builds_before) / repeat, 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="에이전트 풀 사용/미사용 토론 시작 지연 벤치마크")
+    parser.add_argument("--repeat", type=int, default=20, help="모드별 반복 횟수")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (미지정 시 stdout)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "agent_pool",
+        "environment": collect_environment(),
+        "params": vars(args),
+        "results": [],
+    }
+
+    # 모듈 import와 첫 생성 비용이 첫 모드에만 몰리지 않도록 한 번 예열
+    start_discussion_once()
+    for mode in ("no_pool", "pool_cold", "pool_warm", "persona_change"):
+        print(f"⏱️ 측정 중: {mode}", file=sys.stderr)
+        if mode == "pool_warm":
+            agent_pool.enabled = True
+            agent_pool.warm(persona_storage.load_personas())
+        result = measure(mode, args.repeat)
+        print(f"  p50 {result['latency']['p50_ms']:.2f}ms / p99 {result['latency']['p99_ms']:.2f}ms, "
+              f"시작당 생성 에이전트 {result['agents_built_per_start']}개", file=sys.stderr)
+        report["results"].append(result)
+
+    baseline = report["results"][0]["latency"]["p50_ms"]
+    for result in report["results"]:
+        result["speedup_vs_no_pool_p50"] = round(baseline / result["latency"]["p50_ms"], 2)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
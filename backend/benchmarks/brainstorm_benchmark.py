@@ -0,0 +1,151 @@
+"""brainstorm_solutions 벤치마크 (LLM 대신 지연만 흉내 내는 스텁 Crew 사용)
+
+기존 순차 실행(동시 실행 1, 제한 시간/정족수 없음)과 현재 설정의 동시 실행을
+같은 에이전트 지연 분포로 비교합니다. 네트워크나 API 키가 필요 없습니다.
+
+실행 예시 (backend 디렉토리에서):
+    python -m benchmarks.brainstorm_benchmark --agents 5 --latency 0.5 --repeat 5 --output brainstorm.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+import chat_roundtable
+from benchmarks.memory_benchmark import collect_environment, latency_summary
+
+# 시나리오별 에이전트 지연 배수 (straggler: 마지막 에이전트 하나가 매우 느림)
+SCENARIOS = {
+    "uniform": lambda i, n: 1.0,
+    "straggler": lambda i, n: 6.0 if i == n - 1 else 1.0,
+}
+
+
+class StubTask:
+    def __init__(self, description: str = "", expected_output: str = "", agent=None, **kwargs):
+        self.description = description
+        self.expected_output = expected_output
+        self.agent = agent
+
+
+class StubCrew:
+    """agents[0].role 별로 정해진 지연만큼 잠든 뒤 고정 문자열을 반환"""
+    latencies: Dict[str, float] = {}
+
+    def __init__(self, agents, tasks, **kwargs):
+        self.agents = agents
+        self.tasks = tasks
+        self.role = agents[0].role
+
+    def kickoff(self):
+        time.sleep(self.latencies.get(self.role, 0.0))
+        return f"{self.role}의 아이디어: 1. 핵심 아이디어 2. 실행 방법 3. 예상 효과 4. 필요 자원"
+
+
+def build_roundtable(agent_count: int):
+    with contextlib.redirect_stdout(io.StringIO()):
+        roundtable = chat_roundtable.ChatRoundtable()
+        roundtable.start_discussion("벤치마크 주제", {"industry": "제조"})
+    roundtable.active_agents = roundtable.active_agents[:agent_count]
+    return roundtable
+
+
+def run_once(roundtable, concurrent: bool, settings: Dict) -> Dict:
+    if concurrent:
+        for key, value in settings.items():
+            setattr(roundtable, key, value)
+    else:
+        roundtable.brainstorm_concurrency = 1
+        roundtable.brainstorm_agent_timeout = float("inf")
+        roundtable.brainstorm_quorum_ratio = 1.0
+        roundtable.brainstorm_quorum_deadline = float("inf")
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        messages = roundtable.brainstorm_solutions("원가 절감 방안")
+    elapsed = time.perf_counter() - started
+    return {"wall_s": elapsed, "ideas": len(messages) - 1}
+
+
+def run_scenario(name: str, agent_count: int, latency: float, jitter: float, repeat: int,
+                 settings: Dict, rng: random.Random) -> Dict:
+    roundtable = build_roundtable(agent_count)
+    roles = [agent.role for agent in roundtable.active_agents]
+    result = {"scenario": name, "agents": len(roles)}
+
+    for label, concurrent in (("sequential", False), ("concurrent", True)):
+        walls, ideas = [], []
+        for _ in range(repeat):
+            StubCrew.latencies = {
+                role: latency * SCENARIOS[name](i, len(roles)) * rng.uniform(1 - jitter, 1 + jitter)
+                for i, role in enumerate(roles)
+            }
+            StubCrew.latencies[roundtable.moderator.role] = latency
+            run = run_once(roundtable, concurrent, settings)
+            walls.append(run["wall_s"])
+            ideas.append(run["ideas"])
+        result[label] = {"wall": latency_summary(walls), "ideas_min": min(ideas)}
+
+    result["speedup_p50"] = round(result["sequential"]["wall"]["p50_ms"] /
+                                  result["concurrent"]["wall"]["p50_ms"], 2)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="brainstorm_solutions 순차/동시 실행 벤치마크")
+    parser.add_argument("--agents", type=int, default=5, help="참여 에이전트 수 (최대 5)")
+    parser.add_argument("--latency", type=float, default=0.5, help="스텁 LLM 기본 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="지연 변동 비율")
+    parser.add_argument("--repeat", type=int, default=5, help="시나리오별 반복 횟수")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="실행할 시나리오")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 실행 에이전트 수")
+    parser.add_argument("--agent-timeout", type=float, default=None, help="에이전트별 제한 시간 (기본: 지연의 4배)")
+    parser.add_argument("--quorum-ratio", type=float, default=0.6, help="정족수 비율")
+    parser.add_argument("--quorum-deadline", type=float, default=None, help="정족수 마감 (기본: 지연의 3배)")
+    parser.add_argument("--seed", type=int, default=42, help="지연 난수 시드")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (미지정 시 stdout)")
+    args = parser.parse_args(argv)
+
+    settings = {
+        "brainstorm_concurrency": args.concurrency,
+        "brainstorm_agent_timeout": args.agent_timeout or args.latency * 4,
+        "brainstorm_quorum_ratio": args.quorum_ratio,
+        "brainstorm_quorum_deadline": args.quorum_deadline or args.latency * 3,
+    }
+
+    chat_roundtable.Crew = StubCrew
+    chat_roundtable.Task = StubTask
+    # 반복 측정마다 같은 프롬프트이므로 응답 캐시를 끄고 매번 스텁 지연을 거치게 함
+    chat_roundtable.llm_cache.mode = "off"
+    rng = random.Random(args.seed)
+
+    report = {
+        "benchmark": "brainstorm",
+        "environment": collect_environment(),
+        "params": {**vars(args), **settings},
+        "results": [],
+    }
+    for name in [s for s in args.scenarios.split(",") if s.strip()]:
+        print(f"⏱️ 시나리오 측정 중: {name}", file=sys.stderr)
+        result = run_scenario(name, args.agents, args.latency, args.jitter, args.repeat, settings, rng)
+        print(f"  순차 p50 {result['sequential']['wall']['p50_ms']:.0f}ms → "
+              f"동시 p50 {result['concurrent']['wall']['p50_ms']:.0f}ms "
+              f"({result['speedup_p50']}배, 최소 아이디어 {result['concurrent']['ideas_min']}개)", file=sys.stderr)
+        report["results"].append(result)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
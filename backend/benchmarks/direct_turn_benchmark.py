@@ -0,0 +1,140 @@
+"""단일 에이전트 작업: Crew 경로와 직접 호출(fast path) 비교
+
+자동 발언(_generate_crewai_response), 전문가 질문(ask_specific_person), 사용자 메시지 응답
+(continue_discussion)을 DIRECT_TURNS 끔(Crew: Task + Crew + kickoff)/켬(채팅 완성 한 번) 두 경로로
+반복 실행하고, 호출당 지연, LLM 요청 수(왕복), 프롬프트/응답 토큰 수를 비교합니다.
+LLM은 로컬 스텁 서버(benchmarks.stub_llm_server)를 띄워 사용하므로 API 키 없이 실행됩니다.
+
+실행 예시 (backend 디렉토리에서):
+    python -m benchmarks.direct_turn_benchmark --repeat 10 --llm-profile fast --output direct.json
+    # 조사가 필요한 주제(웹 검색 후 답변)
+    python -m benchmarks.direct_turn_benchmark --topic "2024년 국내 전기차 시장 동향과 대응 전략"
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks.load_test import BACKEND_DIR, free_port, wait_for_http
+from benchmarks.memory_benchmark import collect_environment, latency_summary
+
+OPERATIONS = ("auto_turn", "ask_expert", "user_message")
+
+
+def start_stub(profile: str, seed: int, workdir: str):
+    port = free_port()
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get("PYTHONPATH")]))
+    log = open(os.path.join(workdir, "stub_llm.log"), "w")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_llm_server", "--port", str(port), "--profile", profile,
+         "--seed", str(seed)],
+        cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    url = f"http://127.0.0.1:{port}"
+    wait_for_http(f"{url}/stub/config", process=process)
+    return process, url
+
+
+def run_operation(roundtable, operation: str, i: int):
+    if operation == "auto_turn":
+        agent = roundtable.active_agents[i % len(roundtable.active_agents)]
+        return roundtable._generate_crewai_response(agent)
+    if operation == "ask_expert":
+        return roundtable.ask_specific_person("김창의", f"고객 경험 측면에서 가장 먼저 바꿀 점은? ({i})")
+    return roundtable.continue_discussion(f"일정을 앞당기려면 무엇이 필요할까요? ({i})")
+
+
+def measure(roundtable, operation: str, repeat: int, stub_url: str) -> Dict:
+    import metrics
+
+    samples: List[float] = []
+    requests_before = requests.get(f"{stub_url}/stub/stats").json()["requests"]
+    prompt_before = metrics.llm_tokens.total(direction="prompt")
+    completion_before = metrics.llm_tokens.total(direction="completion")
+    for i in range(repeat):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_operation(roundtable, operation, i)
+        samples.append(time.perf_counter() - started)
+    llm_requests = requests.get(f"{stub_url}/stub/stats").json()["requests"] - requests_before
+    return {
+        "latency": latency_summary(samples),
+        "llm_requests_per_call": round(llm_requests / repeat, 2),
+        "prompt_tokens_per_call": round((metrics.llm_tokens.total(direction="prompt") - prompt_before) / repeat, 1),
+        "completion_tokens_per_call": round(
+            (metrics.llm_tokens.total(direction="completion") - completion_before) / repeat, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="단일 에이전트 작업: Crew 경로 대비 직접 호출 지연/토큰 비교")
+    parser.add_argument("--repeat", type=int, default=10, help="경로/작업별 반복 횟수")
+    parser.add_argument("--llm-profile", default="fast", help="스텁 LLM 지연 프로필")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--topic", default="신제품 출시 전략", help="토론 주제 (조사 키워드가 있으면 웹 검색 포함)")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (미지정 시 stdout)")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="roundtable_direct_")
+    stub, stub_url = start_stub(args.llm_profile, args.seed, workdir)
+    try:
+        os.environ["LLM_BASE_URL"] = f"{stub_url}/v1"
+        os.environ["SERPAPI_URL"] = f"{stub_url}/serpapi/search"
+        os.environ["DUCKDUCKGO_URL"] = f"{stub_url}/duckduckgo/"
+        os.environ.pop("OPENAI_API_KEY", None)
+
+        import chat_roundtable
+        from llm_cache import llm_cache
+        from research_cache import research_cache
+        # 반복 호출이 캐시 적중으로 끝나지 않도록 캐시를 끔
+        llm_cache.mode = "off"
+        research_cache.mode = "off"
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            roundtable = chat_roundtable.ChatRoundtable()
+            roundtable.start_discussion(args.topic, {"industry": "제조", "company_size": "중견기업"})
+
+        report = {
+            "benchmark": "direct_turn",
+            "environment": collect_environment(),
+            "params": vars(args),
+            "research_topic": chat_roundtable.needs_research(args.topic),
+            "results": [],
+        }
+        for operation in OPERATIONS:
+            row = {"operation": operation}
+            for path, direct in (("crew", False), ("direct", True)):
+                print(f"⏱️ 측정 중: {operation} / {path}", file=sys.stderr)
+                roundtable.direct_turns = direct
+                roundtable.research_notes.clear()
+                row[path] = measure(roundtable, operation, args.repeat, stub_url)
+            row["speedup_p50"] = round(row["crew"]["latency"]["p50_ms"] / row["direct"]["latency"]["p50_ms"], 2)
+            print(f"  p50 crew {row['crew']['latency']['p50_ms']:.1f}ms → direct "
+                  f"{row['direct']['latency']['p50_ms']:.1f}ms, LLM 요청 {row['crew']['llm_requests_per_call']} → "
+                  f"{row['direct']['llm_requests_per_call']}", file=sys.stderr)
+            report["results"].append(row)
+    finally:
+        stub.terminate()
+        stub.wait(timeout=10)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""이벤트 루프 지연 벤치마크: 블로킹 LLM 호출을 루프에서 직접 부를 때와 llm_executor를 쓸 때 비교
+
+스텁 kickoff(time.sleep)를 여러 "요청"이 동시에 호출하는 동안 EventLoopLagMonitor와
+가벼운 프로브 요청(/api/status 역할)의 응답 지연을 측정합니다.
+
+실행 예시 (backend 디렉토리에서):
+    python -m benchmarks.event_loop_benchmark --requests 10 --latency 0.3 --output loop_lag.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.memory_benchmark import collect_environment, latency_summary
+from llm_executor import EventLoopLagMonitor, LLMExecutor
+
+
+def stub_kickoff(latency: float) -> str:
+    time.sleep(latency)
+    return "응답"
+
+
+async def run_mode(mode: str, requests: int, latency: float, workers: int, probe_interval: float) -> Dict:
+    monitor = EventLoopLagMonitor(interval=0.01, window=100000)
+    executor = LLMExecutor(max_workers=workers)
+    probe_latencies: List[float] = []
+    done = asyncio.Event()
+
+    async def handle_request():
+        if mode == "inline":
+            stub_kickoff(latency)
+        else:
+            await executor.run(stub_kickoff, latency)
+
+    async def probe():
+        # 가벼운 엔드포인트가 루프 차례를 기다리는 시간
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0)
+            probe_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(probe_interval)
+
+    monitor.start()
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(handle_request() for _ in range(requests)))
+    wall = time.perf_counter() - started
+    done.set()
+    await probe_task
+    monitor.stop()
+    executor.shutdown(wait=True)
+
+    return {
+        "mode": mode,
+        "wall_s": round(wall, 3),
+        "loop_lag": monitor.get_stats(),
+        "probe": latency_summary(probe_latencies),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="블로킹 LLM 호출의 이벤트 루프 지연 벤치마크")
+    parser.add_argument("--requests", type=int, default=10, help="동시 요청 수")
+    parser.add_argument("--latency", type=float, default=0.3, help="스텁 LLM 호출 지연 (초)")
+    parser.add_argument("--workers", type=int, default=8, help="llm_executor 스레드 수")
+    parser.add_argument("--probe-interval", type=float, default=0.02, help="프로브 요청 간격 (초)")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (미지정 시 stdout)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "event_loop_lag",
+        "environment": collect_environment(),
+        "params": vars(args),
+        "results": [],
+    }
+    for mode in ("inline", "executor"):
+        print(f"⏱️ 측정 중: {mode}", file=sys.stderr)
+        result = asyncio.run(run_mode(mode, args.requests, args.latency, args.workers, args.probe_interval))
+        print(f"  총 {result['wall_s']}초, 루프 지연 p99 {result['loop_lag']['p99_ms']}ms / 최대 {result['loop_lag']['max_ms']}ms, "
+              f"프로브 p99 {result['probe']['p99_ms']}ms", file=sys.stderr)
+        report["results"].append(result)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
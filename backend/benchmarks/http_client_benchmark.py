@@ -0,0 +1,201 @@
+"""외부 HTTP 클라이언트: 호출마다 새로 만들기 vs 풀에서 재사용
+
+로컬 스텁 서버(benchmarks.stub_llm_server, instant 프로필)를 대상으로 다음을 비교해 호출당 연결 준비
+(클라이언트 생성 + TCP 연결, --tls면 TLS 핸드셰이크 포함)에 쓰던 시간이 얼마나 줄었는지 측정합니다.
+  search_get        : requests.get (기존 검색 도구) vs http_clients.lease_session
+  openai_completion : 호출마다 openai.OpenAI(...) (기존 조사 도구/직접 호출) vs http_clients.lease_openai_client
+  async_get         : 요청마다 httpx.AsyncClient vs http_clients.async_http_client (동시 요청 --concurrency개)
+
+실행 예시 (backend 디렉토리에서):
+    python -m benchmarks.http_client_benchmark --repeat 200 --tls --output http_clients.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.load_test import BACKEND_DIR, free_port, wait_for_http
+from benchmarks.memory_benchmark import collect_environment, latency_summary
+
+
+def make_certificate(workdir: str):
+    """127.0.0.1용 자체 서명 인증서 (openssl 명령 필요)"""
+    cert = os.path.join(workdir, "cert.pem")
+    key = os.path.join(workdir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert, "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+
+def start_stub(workdir: str, tls: bool):
+    port = free_port()
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get("PYTHONPATH")]))
+    command = [sys.executable, "-m", "benchmarks.stub_llm_server", "--port", str(port), "--profile", "instant"]
+    scheme = "http"
+    if tls:
+        cert, key = make_certificate(workdir)
+        command += ["--ssl-certfile", cert, "--ssl-keyfile", key]
+        # requests는 REQUESTS_CA_BUNDLE, httpx(openai 포함)는 SSL_CERT_FILE로 자체 서명 인증서를 신뢰
+        os.environ["REQUESTS_CA_BUNDLE"] = cert
+        os.environ["SSL_CERT_FILE"] = cert
+        scheme = "https"
+    log = open(os.path.join(workdir, "stub_llm.log"), "w")
+    process = subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    url = f"{scheme}://127.0.0.1:{port}"
+    wait_for_http(f"{url}/stub/config", process=process)
+    return process, url
+
+
+def time_calls(call: Callable[[], None], repeat: int) -> List[float]:
+    call()  # 첫 호출(모듈 로드 등)은 제외
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def compare(fresh: List[float], pooled: List[float]) -> Dict:
+    fresh_summary, pooled_summary = latency_summary(fresh), latency_summary(pooled)
+    return {
+        "fresh": fresh_summary,
+        "pooled": pooled_summary,
+        "saved_ms_per_call_p50": round(fresh_summary["p50_ms"] - pooled_summary["p50_ms"], 3),
+        "saved_ms_per_call_mean": round(fresh_summary["mean_ms"] - pooled_summary["mean_ms"], 3),
+    }
+
+
+def bench_search_get(url: str, repeat: int) -> Dict:
+    import requests
+    from http_clients import lease_session, search_timeout
+
+    search_url = f"{url}/duckduckgo/?q=test&format=json"
+
+    def fresh():
+        requests.get(search_url, timeout=10).raise_for_status()
+
+    def pooled():
+        with lease_session() as session:
+            session.get(search_url, timeout=search_timeout()).raise_for_status()
+
+    return compare(time_calls(fresh, repeat), time_calls(pooled, repeat))
+
+
+def bench_openai_completion(url: str, repeat: int) -> Dict:
+    import openai
+    from http_clients import lease_openai_client
+
+    settings = {"api_key": "local-stub", "base_url": f"{url}/v1"}
+    request = {"model": "gpt-4o-mini", "max_tokens": 20,
+               "messages": [{"role": "system", "content": "당신은 정보 조사 전문가입니다."},
+                            {"role": "user", "content": "전기차 시장 동향"}]}
+
+    def fresh():
+        client = openai.OpenAI(**settings)
+        try:
+            client.chat.completions.create(**request)
+        finally:
+            client.close()
+
+    def pooled():
+        with lease_openai_client(settings) as client:
+            client.chat.completions.create(**request)
+
+    return compare(time_calls(fresh, repeat), time_calls(pooled, repeat))
+
+
+def bench_async_get(url: str, repeat: int, concurrency: int) -> Dict:
+    import httpx
+    from http_clients import aclose_async_clients, async_http_client
+
+    search_url = f"{url}/duckduckgo/?q=test&format=json"
+
+    async def fresh_one():
+        async with httpx.AsyncClient(timeout=10) as client:
+            (await client.get(search_url)).raise_for_status()
+
+    async def pooled_one():
+        (await async_http_client().get(search_url)).raise_for_status()
+
+    async def run(one) -> List[float]:
+        samples = []
+
+        async def timed():
+            started = time.perf_counter()
+            await one()
+            samples.append(time.perf_counter() - started)
+
+        await one()  # 준비 호출
+        for _ in range(max(1, repeat // concurrency)):
+            await asyncio.gather(*(timed() for _ in range(concurrency)))
+        return samples
+
+    async def main():
+        fresh = await run(fresh_one)
+        pooled = await run(pooled_one)
+        await aclose_async_clients()
+        return fresh, pooled
+
+    fresh, pooled = asyncio.run(main())
+    return {"concurrency": concurrency, **compare(fresh, pooled)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="외부 HTTP 클라이언트 재사용 시 호출당 연결 준비 시간 절감 측정")
+    parser.add_argument("--repeat", type=int, default=200, help="방식별 호출 횟수")
+    parser.add_argument("--concurrency", type=int, default=8, help="async_get 동시 요청 수")
+    parser.add_argument("--tls", action="store_true", help="스텁 서버를 HTTPS로 띄워 TLS 핸드셰이크 비용까지 측정")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (미지정 시 stdout)")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="roundtable_http_")
+    stub, url = start_stub(workdir, args.tls)
+    try:
+        import http_clients
+
+        report = {
+            "benchmark": "http_clients",
+            "environment": collect_environment(),
+            "params": vars(args),
+            "results": {},
+        }
+        for name, bench in (("search_get", lambda: bench_search_get(url, args.repeat)),
+                            ("openai_completion", lambda: bench_openai_completion(url, args.repeat)),
+                            ("async_get", lambda: bench_async_get(url, args.repeat, args.concurrency))):
+            print(f"⏱️ 측정 중: {name}", file=sys.stderr)
+            row = report["results"][name] = bench()
+            print(f"  p50 새로 만들기 {row['fresh']['p50_ms']:.2f}ms → 재사용 {row['pooled']['p50_ms']:.2f}ms "
+                  f"(호출당 {row['saved_ms_per_call_p50']:.2f}ms 절감)", file=sys.stderr)
+        report["pools"] = http_clients.get_stats()["pools"]
+        # keep-alive 연결이 남아 있으면 스텁 서버가 종료를 기다리므로 먼저 닫음
+        http_clients.close_all()
+    finally:
+        stub.terminate()
+        try:
+            stub.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            stub.kill()
+            stub.wait()
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
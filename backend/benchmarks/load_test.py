@@ -0,0 +1,433 @@
+"""REST + WebSocket 토론 흐름 부하 테스트
+
+한 프로세스가 동시 시청자 몇 명까지 버티는지 보기 위해 실제 흐름을 그대로 실행합니다.
+  1. 스텁 LLM/검색 서버(benchmarks.stub_llm_server)와 백엔드(uvicorn main:app)를 임시 디렉토리에서 띄움
+     (--server-url을 주면 이미 떠 있는 서버를 사용)
+  2. /ws 클라이언트 N개 연결 → /api/start_discussion → /api/start_auto_discussion
+  3. 측정 시간 동안 폴러 M개가 /api/status를 주기적으로 호출하고, 드라이버가 /api/send_message와
+     /api/switch_chatroom(현재 방으로 재전환)을 섞어 호출
+  4. 엔드포인트별 지연 백분위수, 클라이언트별 브로드캐스트 전달 지연(서버 송신 시각 server_ts 기준),
+     끊긴 연결 수, 서버 CPU/RSS를 기록
+
+실행 예시 (backend 디렉토리에서):
+    python -m benchmarks.load_test --clients 50 --pollers 5 --duration 60 --output load.json
+    python -m benchmarks.load_test --clients 200 --llm-profile realistic --pacing adaptive
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+import websockets
+
+from benchmarks.memory_benchmark import collect_environment, latency_summary
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARTICIPANTS = ["김창의", "박매출", "이현실", "최홍보", "박테크"]
+USER_MESSAGES = [
+    "비용 측면에서 가장 먼저 줄일 수 있는 부분은 어디인가요?",
+    "고객 반응을 빠르게 확인할 방법이 있을까요?",
+    "일정을 한 달 앞당기려면 무엇이 필요할까요?",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_http(url: str, timeout: float = 60.0, process: Optional[subprocess.Popen] = None):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"프로세스가 종료되었습니다 (코드 {process.returncode}): {url}")
+        try:
+            if requests.get(url, timeout=2).status_code < 500:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"{timeout}초 안에 응답이 없습니다: {url}")
+
+
+class ProcessSampler:
+    """서버 프로세스 CPU 사용률/RSS를 주기적으로 기록 (psutil이 없으면 /proc 사용, 리눅스 전용)"""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[Dict] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="load_test_sampler", daemon=True)
+        try:
+            import psutil
+            self._process = psutil.Process(pid)
+        except ImportError:
+            self._process = None
+
+    def _read(self) -> Optional[Dict]:
+        if self._process is not None:
+            with self._process.oneshot():
+                times = self._process.cpu_times()
+                return {"cpu_s": times.user + times.system, "rss_bytes": self._process.memory_info().rss}
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            ticks = os.sysconf("SC_CLK_TCK")
+            cpu_s = (int(fields[11]) + int(fields[12])) / ticks  # utime + stime
+            with open(f"/proc/{self.pid}/status") as f:
+                rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+            return {"cpu_s": cpu_s, "rss_bytes": rss_kb * 1024}
+        except (OSError, StopIteration, IndexError, ValueError):
+            return None
+
+    def _run(self):
+        previous = None
+        while not self._stop.wait(self.interval):
+            reading = self._read()
+            if reading is None:
+                continue
+            now = time.perf_counter()
+            if previous is not None:
+                reading["cpu_percent"] = (reading["cpu_s"] - previous[1]["cpu_s"]) / (now - previous[0]) * 100
+                self.samples.append(reading)
+            previous = (now, reading)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Dict:
+        self._stop.set()
+        self._thread.join(timeout=2)
+        if not self.samples:
+            return {"samples": 0}
+        cpu = [s["cpu_percent"] for s in self.samples]
+        rss = [s["rss_bytes"] for s in self.samples]
+        return {
+            "samples": len(self.samples),
+            "cpu_percent_mean": round(sum(cpu) / len(cpu), 1),
+            "cpu_percent_max": round(max(cpu), 1),
+            "rss_start_bytes": rss[0],
+            "rss_peak_bytes": max(rss),
+            "rss_end_bytes": rss[-1],
+        }
+
+
+class LocalStack:
+    """스텁 LLM/검색 서버 + 백엔드 서버를 임시 작업 디렉토리에서 실행 (메모리 저장소를 건드리지 않음)"""
+
+    def __init__(self, llm_profile: str, pacing: str, seed: Optional[int], verbose: bool = False):
+        self.llm_profile = llm_profile
+        self.pacing = pacing
+        self.seed = seed
+        self.verbose = verbose
+        self.workdir = tempfile.mkdtemp(prefix="roundtable_load_")
+        self.stub_port = free_port()
+        self.backend_port = free_port()
+        self.processes: List[subprocess.Popen] = []
+
+    @property
+    def backend_url(self) -> str:
+        return f"http://127.0.0.1:{self.backend_port}"
+
+    def _spawn(self, args: List[str], env: Dict, name: str) -> subprocess.Popen:
+        output = None if self.verbose else open(os.path.join(self.workdir, f"{name}.log"), "w")
+        process = subprocess.Popen(args, cwd=self.workdir, env=env, stdout=output, stderr=subprocess.STDOUT)
+        self.processes.append(process)
+        return process
+
+    def start(self) -> subprocess.Popen:
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get("PYTHONPATH")]))
+        stub_url = f"http://127.0.0.1:{self.stub_port}"
+
+        stub_args = [sys.executable, "-m", "benchmarks.stub_llm_server", "--port", str(self.stub_port),
+                     "--profile", self.llm_profile]
+        if self.seed is not None:
+            stub_args += ["--seed", str(self.seed)]
+        stub = self._spawn(stub_args, env, "stub_llm")
+        wait_for_http(f"{stub_url}/stub/config", process=stub)
+
+        env.update({
+            "LLM_BASE_URL": f"{stub_url}/v1",
+            "SERPAPI_URL": f"{stub_url}/serpapi/search",
+            "DUCKDUCKGO_URL": f"{stub_url}/duckduckgo/",
+            "SERPER_API_KEY": "local-stub",
+            "LLM_CACHE_MODE": "off",
+            "RESEARCH_CACHE_MODE": "off",
+            "DISCUSSION_PACING": self.pacing,
+        })
+        env.pop("OPENAI_API_KEY", None)
+        backend = self._spawn([sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR,
+                               "--host", "127.0.0.1", "--port", str(self.backend_port), "--log-level", "warning"],
+                              env, "backend")
+        wait_for_http(f"{self.backend_url}/api/status", timeout=120, process=backend)
+        self._wait_for_preload(backend)
+        return backend
+
+    def _wait_for_preload(self, backend: subprocess.Popen, timeout: float = 120.0):
+        """백그라운드 예열(crewai import + 에이전트 풀)이 끝날 때까지 대기 (시작 비용이 측정에 섞이지 않도록)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline and backend.poll() is None:
+            try:
+                phases = requests.get(f"{self.backend_url}/api/debug/startup", timeout=5).json().get("phases", {})
+                if "agent_pool_warm" in phases or phases.get("discussion_modules", {}).get("status", "ok") != "ok":
+                    return
+            except (requests.RequestException, ValueError):
+                pass
+            time.sleep(0.5)
+
+    def stub_stats(self) -> Optional[Dict]:
+        try:
+            return requests.get(f"http://127.0.0.1:{self.stub_port}/stub/stats", timeout=5).json()
+        except requests.RequestException:
+            return None
+
+    def stop(self, keep_workdir: bool = False):
+        for process in reversed(self.processes):
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if not keep_workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class LoadTest:
+    def __init__(self, base_url: str, clients: int, pollers: int, duration: float,
+                 poll_interval: float, message_interval: float, switch_interval: float, pacing: str):
+        self.base_url = base_url.rstrip("/")
+        self.ws_url = "ws" + self.base_url[len("http"):] + "/ws"
+        self.clients = clients
+        self.pollers = pollers
+        self.duration = duration
+        self.poll_interval = poll_interval
+        self.message_interval = message_interval
+        self.switch_interval = switch_interval
+        self.pacing = pacing
+
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.client_lags: List[List[float]] = [[] for _ in range(clients)]
+        self.client_messages = [0] * clients
+        self.message_types: Dict[str, int] = {}
+        self.connect_failures = 0
+        self.dropped_connections = 0
+        self._stopping = False
+        self.room_id: Optional[str] = None
+
+    # ---- REST ----
+
+    async def call(self, session: requests.Session, method: str, path: str, **kwargs) -> Optional[Dict]:
+        """블로킹 requests 호출을 스레드에서 실행하며 지연/실패를 엔드포인트별로 기록"""
+        loop = asyncio.get_running_loop()
+        name = path.split("?")[0]
+        started = time.perf_counter()
+        try:
+            response = await loop.run_in_executor(
+                None, lambda: session.request(method, self.base_url + path, timeout=60, **kwargs)
+            )
+            elapsed = time.perf_counter() - started
+            self.latencies.setdefault(name, []).append(elapsed)
+            body = response.json()
+            if response.status_code >= 400 or (isinstance(body, dict) and body.get("success") is False):
+                self.errors[name] = self.errors.get(name, 0) + 1
+            return body
+        except Exception:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            return None
+
+    # ---- WebSocket ----
+
+    async def ws_client(self, index: int, ready: asyncio.Event):
+        try:
+            connection = await websockets.connect(self.ws_url, max_size=None, open_timeout=30)
+        except Exception:
+            self.connect_failures += 1
+            ready.set()
+            return
+        ready.set()
+        try:
+            async for raw in connection:
+                received = time.time()
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    continue
+                self.client_messages[index] += 1
+                kind = message.get("type", "unknown")
+                self.message_types[kind] = self.message_types.get(kind, 0) + 1
+                server_ts = message.get("server_ts")
+                if server_ts is not None:
+                    self.client_lags[index].append(max(0.0, received - server_ts))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            if not self._stopping:
+                self.dropped_connections += 1
+            await connection.close()
+
+    # ---- 시나리오 ----
+
+    async def poller(self):
+        session = requests.Session()
+        while not self._stopping:
+            await self.call(session, "GET", "/api/status")
+            await asyncio.sleep(self.poll_interval)
+
+    async def driver(self):
+        session = requests.Session()
+        next_message = time.perf_counter() + self.message_interval
+        next_switch = time.perf_counter() + self.switch_interval
+        turn = 0
+        while not self._stopping:
+            now = time.perf_counter()
+            if now >= next_message:
+                await self.call(session, "POST", "/api/send_message",
+                                json={"content": USER_MESSAGES[turn % len(USER_MESSAGES)]})
+                turn += 1
+                next_message = time.perf_counter() + self.message_interval
+            elif self.room_id and now >= next_switch:
+                # 현재 방으로 다시 전환 (기록 로드 + 스케줄러 정지) 후 자동 토론 재개
+                await self.call(session, "POST", "/api/switch_chatroom", json={"room_id": self.room_id})
+                await self.call(session, "POST", f"/api/start_auto_discussion?pacing={self.pacing}")
+                next_switch = time.perf_counter() + self.switch_interval
+            else:
+                await asyncio.sleep(min(0.2, max(0.0, min(next_message, next_switch) - now)))
+
+    async def run(self) -> Dict:
+        print(f"🔌 WebSocket 클라이언트 {self.clients}개 연결 중", file=sys.stderr)
+        ready_events = [asyncio.Event() for _ in range(self.clients)]
+        client_tasks = [asyncio.create_task(self.ws_client(i, ready_events[i])) for i in range(self.clients)]
+        await asyncio.gather(*(event.wait() for event in ready_events))
+
+        session = requests.Session()
+        started = await self.call(session, "POST", "/api/start_discussion", json={
+            "topic": "부하 테스트: 신제품 출시 전략",
+            "participants": PARTICIPANTS,
+            "company_info": {"industry": "제조", "size": "중견기업"},
+        })
+        if not started or started.get("success") is False:
+            raise RuntimeError(f"토론 시작 실패: {started}")
+        status = await self.call(session, "GET", "/api/status")
+        self.room_id = (status or {}).get("current_room_id")
+        await self.call(session, "POST", f"/api/start_auto_discussion?pacing={self.pacing}")
+
+        print(f"⏱️ {self.duration}초 동안 측정 (폴러 {self.pollers}개)", file=sys.stderr)
+        workers = [asyncio.create_task(self.poller()) for _ in range(self.pollers)]
+        workers.append(asyncio.create_task(self.driver()))
+        await asyncio.sleep(self.duration)
+
+        self._stopping = True
+        await asyncio.gather(*workers, return_exceptions=True)
+        await self.call(session, "POST", "/api/stop_auto_discussion")
+        for task in client_tasks:
+            task.cancel()
+        await asyncio.gather(*client_tasks, return_exceptions=True)
+        return self.report()
+
+    def report(self) -> Dict:
+        all_lags = [lag for lags in self.client_lags for lag in lags]
+        per_client_p99 = [latency_summary(lags)["p99_ms"] for lags in self.client_lags if lags]
+        return {
+            "endpoints": {
+                name: {**latency_summary(samples), "errors": self.errors.get(name, 0)}
+                for name, samples in sorted(self.latencies.items())
+            },
+            "failed_endpoints": {name: count for name, count in self.errors.items() if name not in self.latencies},
+            "broadcast": {
+                "messages_per_client_mean": round(sum(self.client_messages) / max(1, self.clients), 1),
+                "message_types": self.message_types,
+                "delivery_lag": latency_summary(all_lags) if all_lags else None,
+                "worst_client_p99_ms": max(per_client_p99) if per_client_p99 else None,
+            },
+            "connections": {
+                "requested": self.clients,
+                "connect_failures": self.connect_failures,
+                "dropped": self.dropped_connections,
+            },
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="REST + WebSocket 토론 흐름 부하 테스트")
+    parser.add_argument("--clients", type=int, default=20, help="동시 WebSocket 클라이언트 수")
+    parser.add_argument("--pollers", type=int, default=3, help="/api/status 폴링 작업 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간(초)")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--message-interval", type=float, default=10.0, help="사용자 메시지 전송 간격(초)")
+    parser.add_argument("--switch-interval", type=float, default=20.0, help="채팅방 재전환 간격(초)")
+    parser.add_argument("--pacing", default="none", help="자동 토론 페이싱 (fixed/adaptive/none)")
+    parser.add_argument("--llm-profile", default="fast", help="스텁 LLM 지연 프로필")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server-url", default=None, help="이미 실행 중인 백엔드 주소 (지정 시 서버를 띄우지 않음)")
+    parser.add_argument("--server-pid", type=int, default=None, help="--server-url 사용 시 CPU/RSS를 측정할 PID")
+    parser.add_argument("--verbose", action="store_true", help="서버 로그를 그대로 출력")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (미지정 시 stdout)")
+    args = parser.parse_args(argv)
+
+    stack = None
+    sampler = None
+    exit_code = 0
+    report = {
+        "benchmark": "load_test",
+        "environment": collect_environment(),
+        "params": vars(args),
+    }
+    try:
+        if args.server_url:
+            base_url, server_pid = args.server_url, args.server_pid
+        else:
+            print(f"🚀 스텁 서버 + 백엔드 실행 (LLM 프로필: {args.llm_profile})", file=sys.stderr)
+            stack = LocalStack(args.llm_profile, args.pacing, args.seed, args.verbose)
+            server_pid = stack.start().pid
+            base_url = stack.backend_url
+        if server_pid:
+            sampler = ProcessSampler(server_pid)
+            sampler.start()
+
+        test = LoadTest(base_url, args.clients, args.pollers, args.duration, args.poll_interval,
+                        args.message_interval, args.switch_interval, args.pacing)
+        report.update(asyncio.run(test.run()))
+    except Exception as e:
+        print(f"❌ 부하 테스트 실패: {e}", file=sys.stderr)
+        report["error"] = str(e)
+        exit_code = 1
+    finally:
+        if sampler is not None:
+            report["server_process"] = sampler.stop()
+        if stack is not None:
+            report["stub_llm"] = stack.stub_stats()
+            stack.stop(keep_workdir=exit_code != 0)
+            if exit_code != 0:
+                print(f"   서버 로그: {stack.workdir}", file=sys.stderr)
+
+    lag = (report.get("broadcast") or {}).get("delivery_lag")
+    if lag:
+        print(f"  브로드캐스트 지연 p50 {lag['p50_ms']:.1f}ms / p99 {lag['p99_ms']:.1f}ms, "
+              f"끊긴 연결 {report['connections']['dropped']}개", file=sys.stderr)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
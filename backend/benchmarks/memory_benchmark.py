@@ -0,0 +1,382 @@
+"""FAISSMemorySystem 벤치마크
+
+합성 한국어 대화 채팅방을 만들어 메모리 시스템의 주요 경로를 측정하고
+결과를 JSON으로 출력합니다. 버전 간 회귀를 추적하려면 이전 결과 파일을
+--baseline 으로 넘기면 됩니다.
+
+실행 예시 (backend 디렉토리에서):
+    python -m benchmarks.memory_benchmark --messages 10,1000,100000 --rooms 20 --output bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+SPEAKERS = [
+    "시스템",
+    "사용자",
+    "토론 진행자",
+    "디자인팀 팀장 김창의",
+    "영업팀 팀장 박매출",
+    "생산팀 팀장 이현실",
+    "마케팅팀 팀장 최홍보",
+    "IT팀 팀장 박테크",
+]
+
+TOPICS = [
+    "ESG 경영을 위한 친환경 제품 개발",
+    "비용 절감을 위한 생산 프로세스 혁신",
+    "버티컬 사이트의 전망과 존폐 여부 판단",
+    "새로운 프리미엄 제품 라인 출시 전략",
+    "글로벌 시장 진출을 위한 브랜드 리뉴얼",
+]
+
+PHRASES = [
+    "사용자 경험 관점에서 보면 온보딩 과정을 단순화해야 합니다",
+    "고객 피드백을 보면 가격 민감도가 생각보다 높습니다",
+    "현실적으로 생산 일정을 고려하면 단계적 접근이 안전합니다",
+    "브랜드 포지셔닝을 먼저 정리하고 캠페인을 설계해야 합니다",
+    "클라우드 인프라 비용과 보안 요구사항을 함께 검토해야 합니다",
+    "재활용 소재 비중을 30%까지 늘리는 방안을 제안합니다",
+    "경쟁사 대비 우리의 강점을 어떻게 부각시킬지 고민해봐야겠습니다",
+    "MVP부터 시작해서 시장 반응을 확인하는 것이 좋겠습니다",
+    "품질 관리 기준을 공급망 전체로 확대해야 합니다",
+    "데이터 분석으로 타겟 고객층을 더 세분화할 수 있습니다",
+]
+
+# 원시 FAISS 인덱스 타입별 검색 지연 비교 대상
+INDEX_TYPES = ["flat_ip", "hnsw_flat", "ivf_flat"]
+
+
+def generate_messages(count: int, rng: random.Random, start: datetime) -> List[Dict]:
+    """합성 한국어 토론 메시지 생성"""
+    messages = []
+    for i in range(count):
+        sentences = rng.sample(PHRASES, rng.randint(1, 3))
+        messages.append({
+            "sender": rng.choice(SPEAKERS),
+            "content": f"{rng.choice(TOPICS)} 관련 의견 #{i}: " + ". ".join(sentences) + ".",
+            "timestamp": (start + timedelta(seconds=i * 7)).isoformat(),
+        })
+    return messages
+
+
+def seed_chatroom(memory_system, room_id: str, messages: List[Dict]):
+    """add_message_to_chatroom을 거치지 않고 채팅방을 일괄 적재
+
+    add_message_to_chatroom은 매 호출마다 인덱스 전체를 다시 저장하므로
+    대용량 워크로드 준비에는 쓰지 않고, 같은 파일 형식으로 한 번에 기록합니다.
+    """
+    import numpy as np
+
+    memory = memory_system.get_chatroom_memory(room_id)
+    if messages:
+        embeddings = np.vstack([
+            memory._create_simple_embedding(msg["content"]) for msg in messages
+        ])
+        memory.index.add(embeddings.astype('float32'))
+    for msg in messages:
+        memory.metadata["texts"].append(msg["content"])
+        memory.metadata["data"].append({**msg, "room_id": room_id})
+    memory.metadata["count"] += len(messages)
+    memory.metadata["last_updated"] = datetime.now().isoformat()
+    memory._save_index()
+
+    metadata = {
+        "room_id": room_id,
+        "room_name": f"벤치마크 채팅방 {room_id[:8]}",
+        "topic": TOPICS[0],
+        "created_at": messages[0]["timestamp"] if messages else datetime.now().isoformat(),
+        "participants": sorted({msg["sender"] for msg in messages}),
+        "message_count": len(messages),
+        "last_updated": messages[-1]["timestamp"] if messages else datetime.now().isoformat(),
+    }
+    with open(f"{memory_system.memory_dir}/chatrooms/{room_id}_chatroom.json", 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+    with open(f"{memory_system.memory_dir}/chatrooms/{room_id}_conversation.md", 'w', encoding='utf-8') as f:
+        f.write("# 채팅방 대화 기록\n\n")
+        f.write(f"**채팅방 ID**: {room_id}\n")
+        f.write(f"**생성일**: {metadata['created_at']}\n\n")
+        f.write("---\n\n")
+        for msg in messages:
+            timestamp = datetime.fromisoformat(msg["timestamp"]).strftime('%Y-%m-%d %H:%M:%S')
+            f.write(f"## {msg['sender']} ({timestamp})\n\n")
+            f.write(f"{msg['content']}\n\n")
+            f.write("---\n\n")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """최근접 순위 방식 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def latency_summary(samples: List[float]) -> Dict:
+    """지연 시간 샘플(초)을 밀리초 요약으로 변환"""
+    return {
+        "samples": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 4) if samples else None,
+        "p99_ms": round(percentile(samples, 99) * 1000, 4) if samples else None,
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 4) if samples else None,
+    }
+
+
+def dir_size_bytes(path: str) -> int:
+    """디렉토리 전체 파일 크기 합계"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def peak_rss_bytes() -> int:
+    """현재 프로세스의 최대 RSS (바이트)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위로 보고함
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def build_raw_index(index_type: str, vectors, dim: int):
+    """비교용 원시 FAISS 인덱스 생성 (데이터가 부족하면 None)"""
+    import faiss
+
+    if index_type == "flat_ip":
+        index = faiss.IndexFlatIP(dim)
+    elif index_type == "hnsw_flat":
+        index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+    elif index_type == "ivf_flat":
+        nlist = max(1, int(len(vectors) ** 0.5))
+        # IVF 학습에는 클러스터당 최소 39개 정도의 샘플이 필요
+        if len(vectors) < nlist * 39:
+            return None
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.nprobe = min(8, nlist)
+    else:
+        raise ValueError(f"알 수 없는 인덱스 타입: {index_type}")
+    index.add(vectors)
+    return index
+
+
+def run_workload(messages_per_room: int, rooms: int, queries: int, add_samples: int,
+                 repeat: int, index_types: List[str], seed: int, work_dir: Optional[str],
+                 verbose: bool) -> Dict:
+    """단일 워크로드 측정 (별도 프로세스에서 실행되어 RSS가 섞이지 않음)"""
+    from memory_system import FAISSMemorySystem
+
+    rng = random.Random(seed + messages_per_room)
+    memory_dir = tempfile.mkdtemp(prefix=f"membench_{messages_per_room}_", dir=work_dir)
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    result = {"messages_per_room": messages_per_room, "rooms": rooms}
+
+    try:
+        with quiet:
+            memory_system = FAISSMemorySystem(memory_dir=memory_dir)
+
+            # 1. 채팅방 적재
+            start = datetime(2025, 1, 1, 9, 0, 0)
+            room_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(rooms)]
+            seed_start = time.perf_counter()
+            for room_id in room_ids:
+                seed_chatroom(memory_system, room_id, generate_messages(messages_per_room, rng, start))
+            result["seed_s"] = round(time.perf_counter() - seed_start, 4)
+
+            # 2. add_message_to_chatroom 처리량 (매 호출마다 인덱스 전체 저장 포함)
+            target_room = room_ids[0]
+            extra = generate_messages(add_samples, rng, start + timedelta(days=1))
+            add_latencies = []
+            for msg in extra:
+                t0 = time.perf_counter()
+                memory_system.add_message_to_chatroom(target_room, msg["sender"], msg["content"], msg["timestamp"])
+                add_latencies.append(time.perf_counter() - t0)
+            total = sum(add_latencies)
+            result["add_message_to_chatroom"] = {
+                **latency_summary(add_latencies),
+                "throughput_msgs_per_s": round(len(add_latencies) / total, 2) if total > 0 else None,
+            }
+
+            # 3. 검색 지연: 실제 경로(MemoryIndex.search) + 인덱스 타입별 원시 검색
+            memory = memory_system.get_chatroom_memory(target_room)
+            query_texts = [msg["content"] for msg in generate_messages(queries, rng, start)]
+            search_latencies = []
+            for query in query_texts:
+                t0 = time.perf_counter()
+                memory.search(query, top_k=5)
+                search_latencies.append(time.perf_counter() - t0)
+            result["search"] = {"memory_index": latency_summary(search_latencies)}
+
+            vectors = memory.index.reconstruct_n(0, memory.index.ntotal)
+            query_vectors = [memory._create_simple_embedding(q) for q in query_texts]
+            for index_type in index_types:
+                raw_index = build_raw_index(index_type, vectors, memory.embedding_dim)
+                if raw_index is None:
+                    result["search"][index_type] = {"skipped": "학습 데이터 부족"}
+                    continue
+                raw_latencies = []
+                for query_vector in query_vectors:
+                    t0 = time.perf_counter()
+                    raw_index.search(query_vector, 5)
+                    raw_latencies.append(time.perf_counter() - t0)
+                result["search"][index_type] = latency_summary(raw_latencies)
+
+            # 4. _initialize_memories 시작 시간
+            init_latencies = []
+            for _ in range(repeat):
+                memory_system.agent_memories = {}
+                memory_system.chatroom_memories = {}
+                t0 = time.perf_counter()
+                memory_system._initialize_memories()
+                init_latencies.append(time.perf_counter() - t0)
+            result["initialize_memories"] = latency_summary(init_latencies)
+
+            # 5. get_chatroom_list 지연
+            list_latencies = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                memory_system.get_chatroom_list()
+                list_latencies.append(time.perf_counter() - t0)
+            result["get_chatroom_list"] = latency_summary(list_latencies)
+
+        result["disk_bytes"] = dir_size_bytes(memory_dir)
+        result["peak_rss_bytes"] = peak_rss_bytes()
+        return result
+    finally:
+        shutil.rmtree(memory_dir, ignore_errors=True)
+
+
+def collect_environment() -> Dict:
+    """회귀 비교를 위한 실행 환경 정보"""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(),
+    }
+    try:
+        import faiss
+        info["faiss"] = getattr(faiss, "__version__", "unknown")
+    except ImportError:
+        info["faiss"] = None
+    try:
+        info["git_commit"] = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        info["git_commit"] = None
+    return info
+
+
+METRIC_PATHS = [
+    ("add_message_to_chatroom", "p50_ms"),
+    ("search.memory_index", "p50_ms"),
+    ("search.memory_index", "p99_ms"),
+    ("initialize_memories", "p50_ms"),
+    ("get_chatroom_list", "p50_ms"),
+]
+
+
+def _lookup(entry: Dict, path: str):
+    for key in path.split("."):
+        if not isinstance(entry, dict) or key not in entry:
+            return None
+        entry = entry[key]
+    return entry
+
+
+def compare_with_baseline(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """기준 결과 대비 느려진 지표 목록 반환"""
+    regressions = []
+    baseline_by_size = {r["messages_per_room"]: r for r in baseline.get("results", [])}
+    for entry in report["results"]:
+        previous = baseline_by_size.get(entry["messages_per_room"])
+        if not previous:
+            continue
+        for section, metric in METRIC_PATHS:
+            new_value = _lookup(entry, f"{section}.{metric}")
+            old_value = _lookup(previous, f"{section}.{metric}")
+            if not new_value or not old_value:
+                continue
+            change = (new_value - old_value) / old_value
+            print(f"  [{entry['messages_per_room']}] {section}.{metric}: {old_value} → {new_value} ({change:+.1%})", file=sys.stderr)
+            if change > tolerance:
+                regressions.append(f"{entry['messages_per_room']}:{section}.{metric}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="FAISSMemorySystem 벤치마크")
+    parser.add_argument("--messages", default="10,1000,10000",
+                        help="채팅방당 메시지 수 목록 (쉼표 구분, 최대 1000000)")
+    parser.add_argument("--rooms", type=int, default=10, help="워크로드당 채팅방 수")
+    parser.add_argument("--queries", type=int, default=200, help="검색 쿼리 수")
+    parser.add_argument("--add-samples", type=int, default=100, help="add_message_to_chatroom 측정 호출 수")
+    parser.add_argument("--repeat", type=int, default=5, help="시작/목록 측정 반복 횟수")
+    parser.add_argument("--index-types", default=",".join(INDEX_TYPES), help="비교할 원시 FAISS 인덱스 타입")
+    parser.add_argument("--seed", type=int, default=42, help="합성 데이터 시드")
+    parser.add_argument("--work-dir", default=None, help="임시 메모리 디렉토리 위치")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (미지정 시 stdout)")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 판단할 지연 증가율")
+    parser.add_argument("--verbose", action="store_true", help="메모리 시스템 로그 출력")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.messages.split(",") if s.strip()]
+    index_types = [t for t in args.index_types.split(",") if t.strip()]
+
+    report = {
+        "benchmark": "memory_system",
+        "environment": collect_environment(),
+        "params": {**vars(args), "messages": sizes, "index_types": index_types},
+        "results": [],
+    }
+
+    for size in sizes:
+        print(f"⏱️ 워크로드 측정 중: 채팅방 {args.rooms}개 × 메시지 {size}개", file=sys.stderr)
+        # 워크로드마다 새 프로세스를 사용해 최대 RSS를 독립적으로 측정
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            result = pool.submit(
+                run_workload, size, args.rooms, args.queries, args.add_samples,
+                args.repeat, index_types, args.seed, args.work_dir, args.verbose
+            ).result()
+        report["results"].append(result)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print("📊 기준 결과 대비 변화:", file=sys.stderr)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"⚠️ 회귀 감지: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
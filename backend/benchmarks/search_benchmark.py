@@ -0,0 +1,113 @@
+"""웹 검색 제공자 경주 전략 비교
+
+web_search_tool을 검색 전략(sequential: 기존 순차 대체 / hedged: 시작 지연을 둔 경주 / parallel: 동시 시작)별로
+반복 호출해 검색 지연, 쓸 만한 결과를 얻은 비율, 제공자별 승률, 검색 한 번에 보낸 외부 요청 수를 비교합니다.
+OpenAI 조사, SerpAPI, DuckDuckGo 모두 로컬 스텁 서버(benchmarks.stub_llm_server)로 보내므로 API 키 없이 실행됩니다.
+flaky 프로필(오류/429/무응답 주입)에서 순차 대체와 경주의 꼬리 지연 차이가 잘 드러납니다.
+
+실행 예시 (backend 디렉토리에서):
+    python -m benchmarks.search_benchmark --repeat 30 --llm-profile flaky --output search.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks.direct_turn_benchmark import start_stub
+from benchmarks.memory_benchmark import collect_environment, latency_summary
+from search_orchestrator import STRATEGIES, SearchOrchestrator
+
+
+def stub_requests(stub_url: str) -> int:
+    stats = requests.get(f"{stub_url}/stub/stats").json()
+    return stats["requests"] + stats["search_requests"]
+
+
+def measure(chat_roundtable, strategy: str, repeat: int, deadline_s: float, stub_url: str) -> Dict:
+    orchestrator = SearchOrchestrator(strategy=strategy, deadline_s=deadline_s)
+    chat_roundtable.search_orchestrator = orchestrator
+    samples: List[float] = []
+    found = 0
+    requests_before = stub_requests(stub_url)
+    for i in range(repeat):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = chat_roundtable.web_search_tool.run(f"2024년 국내 전기차 시장 동향 ({i})")
+        samples.append(time.perf_counter() - started)
+        found += "정보를 찾기 어렵습니다" not in result
+    stats = orchestrator.get_stats()
+    return {
+        "latency": latency_summary(samples),
+        "found_rate": round(found / repeat, 4),
+        "deadline_exceeded": stats["deadline_exceeded"],
+        "external_requests_per_search": round((stub_requests(stub_url) - requests_before) / repeat, 2),
+        "providers": stats["providers"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="웹 검색 순차 대체 대비 경주(hedged/parallel) 지연 비교")
+    parser.add_argument("--repeat", type=int, default=30, help="전략별 검색 횟수")
+    parser.add_argument("--llm-profile", default="flaky", help="스텁 서버 지연 프로필")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--deadline", type=float, default=12.0, help="검색 한 번의 전체 마감 시간(초)")
+    parser.add_argument("--strategies", nargs="+", default=["sequential", "hedged", "parallel"],
+                        choices=list(STRATEGIES))
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (미지정 시 stdout)")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="roundtable_search_")
+    stub, stub_url = start_stub(args.llm_profile, args.seed, workdir)
+    try:
+        os.environ["LLM_BASE_URL"] = f"{stub_url}/v1"
+        os.environ["SERPAPI_URL"] = f"{stub_url}/serpapi/search"
+        os.environ["DUCKDUCKGO_URL"] = f"{stub_url}/duckduckgo/"
+        os.environ["SERPER_API_KEY"] = "stub"
+        os.environ.pop("OPENAI_API_KEY", None)
+
+        import chat_roundtable
+        from research_cache import research_cache
+        # 제공자 경주 자체를 재도록 결과 캐시를 끔
+        research_cache.mode = "off"
+
+        report = {
+            "benchmark": "search",
+            "environment": collect_environment(),
+            "params": vars(args),
+            "results": [],
+        }
+        for strategy in args.strategies:
+            print(f"⏱️ 측정 중: {strategy}", file=sys.stderr)
+            row = {"strategy": strategy, **measure(chat_roundtable, strategy, args.repeat, args.deadline, stub_url)}
+            print(f"  p50 {row['latency']['p50_ms']:.1f}ms, p99 {row['latency']['p99_ms']:.1f}ms, "
+                  f"결과 {row['found_rate']:.0%}, 외부 요청 {row['external_requests_per_search']}/검색",
+                  file=sys.stderr)
+            report["results"].append(row)
+    finally:
+        stub.terminate()
+        try:
+            stub.wait(timeout=10)
+        except subprocess.TimeoutExpired:  # 무응답 주입으로 멈춘 요청이 남아 있으면 바로 종료
+            stub.kill()
+            stub.wait()
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+"""로컬 OpenAI 호환 스텁 LLM 서버
+
+부하 테스트와 CI에서 실제 OpenAI 없이 토론 전체 흐름을 돌릴 수 있도록 chat.completions API
+(스트리밍 포함)를 흉내 냅니다. 응답은 시스템 프롬프트의 페르소나(진행자, 디자인팀 등)에 맞춘
+한국어 문장 중에서 고르고, 지연 프로필에 따라 첫 토큰 지연/토큰 속도/오류/타임아웃을 주입합니다.
+검색 도구용 대체 경로(SerpAPI 형식 /serpapi/search, DuckDuckGo 형식 /duckduckgo/)도 같은 프로필로
+응답합니다 (SERPAPI_URL, DUCKDUCKGO_URL 환경 변수로 연결).
+
+지연 프로필:
+  instant   : 지연 없음 (기능 테스트용)
+  fast      : 첫 토큰 ~150ms, 초당 200토큰
+  realistic : 첫 토큰 ~600ms(로그정규), 초당 60토큰, 오류 1%
+  slow      : 첫 토큰 ~2s, 초당 20토큰
+  (fast/realistic/slow/flaky는 프롬프트 길이에 비례한 처리 시간도 첫 토큰 지연에 더함)
+  flaky     : realistic + 오류 10%, 429 5%, 타임아웃 5%
+
+실행 예시 (backend 디렉토리에서):
+    python -m benchmarks.stub_llm_server --port 8199 --profile realistic
+    LLM_BASE_URL=http://127.0.0.1:8199/v1 SERPAPI_URL=http://127.0.0.1:8199/serpapi/search \\
+        DUCKDUCKGO_URL=http://127.0.0.1:8199/duckduckgo/ python main.py
+
+실행 중 프로필 변경/통계:
+    curl -X POST localhost:8199/stub/config -H 'Content-Type: application/json' -d '{"profile": "flaky"}'
+    curl localhost:8199/stub/stats
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from running_summary import count_tokens
+
+
+@dataclass
+class LatencyProfile:
+    """응답 지연/오류 분포"""
+    name: str
+    ttft_median_ms: float = 0.0      # 첫 토큰까지 지연 중앙값
+    ttft_sigma: float = 0.0          # 로그정규 분포의 sigma (0이면 항상 중앙값)
+    ttft_max_ms: float = 10000.0
+    tokens_per_s: float = 0.0        # 0이면 토큰 사이 지연 없음
+    prompt_tokens_per_s: float = 0.0  # 프롬프트 처리 속도 (첫 토큰 지연에 더함, 0이면 프롬프트 길이 무시)
+    error_rate: float = 0.0          # 500 응답 비율
+    rate_limit_rate: float = 0.0     # 429 응답 비율
+    timeout_rate: float = 0.0        # 응답하지 않고 hang_s초 동안 멈추는 비율
+    hang_s: float = 120.0
+
+    def sample_ttft(self, rng: random.Random, prompt_tokens: int = 0) -> float:
+        prefill = prompt_tokens / self.prompt_tokens_per_s if self.prompt_tokens_per_s > 0 else 0.0
+        if self.ttft_median_ms <= 0:
+            return prefill
+        if self.ttft_sigma <= 0:
+            return self.ttft_median_ms / 1000 + prefill
+        ms = rng.lognormvariate(math.log(self.ttft_median_ms), self.ttft_sigma)
+        return min(ms, self.ttft_max_ms) / 1000 + prefill
+
+    def sample_token_delay(self, rng: random.Random) -> float:
+        if self.tokens_per_s <= 0:
+            return 0.0
+        # 토큰 간격은 평균 1/tokens_per_s 근처에서 ±30% 흔들림
+        return rng.uniform(0.7, 1.3) / self.tokens_per_s
+
+
+PROFILES: Dict[str, LatencyProfile] = {
+    "instant": LatencyProfile("instant"),
+    "fast": LatencyProfile("fast", ttft_median_ms=150, ttft_sigma=0.3, tokens_per_s=200,
+                           prompt_tokens_per_s=20000),
+    "realistic": LatencyProfile("realistic", ttft_median_ms=600, ttft_sigma=0.5, tokens_per_s=60,
+                                prompt_tokens_per_s=8000, error_rate=0.01),
+    "slow": LatencyProfile("slow", ttft_median_ms=2000, ttft_sigma=0.6, tokens_per_s=20,
+                           prompt_tokens_per_s=3000),
+    "flaky": LatencyProfile("flaky", ttft_median_ms=600, ttft_sigma=0.5, tokens_per_s=60,
+                            prompt_tokens_per_s=8000, error_rate=0.1, rate_limit_rate=0.05, timeout_rate=0.05),
+}
+
+
+# 시스템 프롬프트에 들어 있는 역할 이름 → 미리 준비한 발언
+CANNED_RESPONSES: Dict[str, List[str]] = {
+    "진행자": [
+        "지금까지 나온 의견을 정리해 보면 비용과 일정이 가장 큰 쟁점입니다. 각 팀에서 우선순위를 하나씩만 말씀해 주시겠어요?",
+        "좋은 논의였습니다. 이제 실행 가능한 첫 단계를 정해 보죠. 다음 분기 안에 할 수 있는 일부터 이야기해 주세요.",
+        "의견이 두 갈래로 나뉘는 것 같습니다. 고객 관점에서 어느 쪽이 더 가치가 있는지 짚어 보면 좋겠습니다.",
+    ],
+    "디자인팀": [
+        "사용자 입장에서 보면 첫 화면에서 핵심 가치가 바로 보여야 합니다. 프로토타입으로 빠르게 검증해 보면 어떨까요?",
+        "디자인 측면에서는 일관된 경험이 중요합니다. 기존 브랜드 톤을 유지하면서 새 기능을 자연스럽게 녹여야 해요.",
+        "고객 인터뷰에서 복잡하다는 피드백이 많았습니다. 단계를 줄이고 시각적으로 단순하게 가져가는 게 좋겠습니다.",
+    ],
+    "영업팀": [
+        "현장에서 고객들이 가장 먼저 묻는 건 가격입니다. 도입 비용 대비 효과를 숫자로 보여줄 수 있어야 계약이 됩니다.",
+        "주요 거래처 세 곳이 비슷한 요구를 하고 있어요. 이번 분기 안에 시범 적용하면 매출로 바로 이어질 수 있습니다.",
+        "경쟁사가 이미 비슷한 제안을 하고 있습니다. 차별점을 한 문장으로 말할 수 있어야 합니다.",
+    ],
+    "생산팀": [
+        "현실적으로 현재 라인에서 바로 적용하기는 어렵습니다. 설비 조정에 최소 두 달은 필요해요.",
+        "품질 기준을 맞추려면 시험 생산을 먼저 해봐야 합니다. 불량률 데이터를 보고 규모를 정하죠.",
+        "원자재 수급이 불안정해서 일정에 여유를 둬야 합니다. 단계적으로 늘리는 방식이 안전합니다.",
+    ],
+    "마케팅팀": [
+        "타깃 고객층을 먼저 좁혀야 메시지가 선명해집니다. 2030 직장인을 중심으로 캠페인을 설계해 보겠습니다.",
+        "SNS 반응을 보면 친환경 키워드에 대한 관심이 높습니다. 이 부분을 전면에 내세우면 좋겠어요.",
+        "출시 전에 체험단을 운영해서 후기를 확보하면 초기 전환율을 크게 높일 수 있습니다.",
+    ],
+    "IT팀": [
+        "기술적으로는 기존 시스템과 API로 연동하면 됩니다. 보안 검토와 부하 테스트 일정만 확보해 주세요.",
+        "데이터 수집부터 자동화하면 이후 분석이 훨씬 쉬워집니다. 클라우드로 시작해서 필요하면 확장하죠.",
+        "유지보수 비용을 고려하면 직접 개발보다 검증된 솔루션을 도입하는 편이 낫습니다.",
+    ],
+}
+RESEARCH_RESPONSES = [
+    "조사 결과 해당 분야는 최근 3년간 연평균 10% 이상 성장하고 있으며, 자동화와 데이터 활용이 핵심 트렌드입니다. "
+    "국내 기업들은 파일럿 도입 후 단계적으로 확대하는 방식을 주로 택하고 있고, 초기 투자 대비 효과 측정이 성공의 관건입니다.",
+]
+GENERIC_RESPONSES = [
+    "좋은 지적입니다. 다만 실행 단계에서 예상되는 위험도 함께 검토해야 할 것 같습니다.",
+    "그 의견에 동의합니다. 작은 규모로 먼저 시도해 보고 결과를 공유하면 좋겠습니다.",
+]
+SEARCH_SNIPPETS = [
+    "업계 보고서에 따르면 관련 시장은 매년 두 자릿수 성장을 이어가고 있습니다.",
+    "주요 기업들은 데이터 기반 의사결정과 자동화에 투자를 늘리고 있습니다.",
+    "소비자 조사에서 가격 대비 가치와 사용 편의성이 가장 중요한 요소로 꼽혔습니다.",
+]
+# CrewAI 에이전트 프롬프트는 ReAct 형식("Final Answer:")의 응답을 기대함
+CREWAI_MARKER = "Final Answer:"
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+def split_tokens(text: str) -> List[str]:
+    """스트리밍 단위로 자르기 (어절 + 뒤따르는 공백)"""
+    return _TOKEN_RE.findall(text)
+
+
+def _message_text(message: Dict) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):  # [{"type": "text", "text": ...}]
+        content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+class StubLLM:
+    """요청 → (지연, 응답 텍스트) 결정과 통계"""
+
+    def __init__(self, profile: LatencyProfile, seed: Optional[int] = None):
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"requests": 0, "streams": 0, "search_requests": 0, "errors": 0, "rate_limited": 0,
+                          "timeouts": 0, "completion_tokens": 0, "by_persona": {}}
+
+    def configure(self, profile: Optional[str] = None, **overrides) -> LatencyProfile:
+        """프로필 교체 및/또는 개별 값 변경"""
+        base = self.profile
+        if profile is not None:
+            if profile not in PROFILES:
+                raise ValueError(f"알 수 없는 프로필: {profile} (가능: {', '.join(PROFILES)})")
+            base = PROFILES[profile]
+        allowed = {f.name for f in fields(LatencyProfile)} - {"name"}
+        unknown = set(overrides) - allowed
+        if unknown:
+            raise ValueError(f"알 수 없는 설정: {', '.join(sorted(unknown))}")
+        self.profile = replace(base, **{k: float(v) for k, v in overrides.items() if v is not None})
+        return self.profile
+
+    def pick_outcome(self) -> str:
+        """ok / error / rate_limit / timeout"""
+        with self._lock:
+            roll = self.rng.random()
+        p = self.profile
+        if roll < p.error_rate:
+            return "error"
+        if roll < p.error_rate + p.rate_limit_rate:
+            return "rate_limit"
+        if roll < p.error_rate + p.rate_limit_rate + p.timeout_rate:
+            return "timeout"
+        return "ok"
+
+    def compose(self, messages: List[Dict], max_tokens: Optional[int]) -> Dict:
+        """페르소나에 맞는 응답 텍스트 선택"""
+        system = " ".join(_message_text(m) for m in messages if m.get("role") == "system")
+        everything = " ".join(_message_text(m) for m in messages)
+        persona = next((name for name in CANNED_RESPONSES if name in system), None)
+        if persona is not None:
+            candidates = CANNED_RESPONSES[persona]
+        elif "조사" in system:
+            persona, candidates = "research", RESEARCH_RESPONSES
+        else:
+            persona, candidates = "generic", GENERIC_RESPONSES
+        with self._lock:
+            text = self.rng.choice(candidates)
+        if CREWAI_MARKER in everything:
+            text = f"Thought: I now can give a great answer\n{CREWAI_MARKER} {text}"
+
+        tokens = split_tokens(text)
+        finish_reason = "stop"
+        if max_tokens and len(tokens) > max_tokens:
+            tokens = tokens[:max_tokens]
+            finish_reason = "length"
+        return {"persona": persona, "tokens": tokens, "finish_reason": finish_reason,
+                "prompt_tokens": count_tokens(everything)}
+
+    def record(self, key: str, amount: int = 1, persona: Optional[str] = None):
+        with self._lock:
+            self.stats[key] += amount
+            if persona is not None:
+                self.stats["by_persona"][persona] = self.stats["by_persona"].get(persona, 0) + 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"profile": asdict(self.profile), **self.stats, "by_persona": dict(self.stats["by_persona"])}
+
+
+def _error_response(status: int, message: str, error_type: str) -> JSONResponse:
+    # OpenAI 오류 응답 형식 (클라이언트가 RateLimitError/InternalServerError로 변환)
+    return JSONResponse(status_code=status,
+                        content={"error": {"message": message, "type": error_type, "code": None}})
+
+
+def create_app(stub: StubLLM) -> FastAPI:
+    app = FastAPI(title="Stub LLM Server")
+    app.state.stub = stub
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model", "owned_by": "stub"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages") or []
+        if not messages:
+            raise HTTPException(status_code=400, detail="messages가 비어 있습니다")
+        model = body.get("model", "gpt-4o-mini")
+        stream = bool(body.get("stream"))
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+
+        profile = stub.profile
+        outcome = stub.pick_outcome()
+        stub.record("requests")
+        if outcome == "error":
+            stub.record("errors")
+            return _error_response(500, "stub: injected server error", "server_error")
+        if outcome == "rate_limit":
+            stub.record("rate_limited")
+            return _error_response(429, "stub: injected rate limit", "rate_limit_exceeded")
+
+        reply = stub.compose(messages, max_tokens)
+        stub.record("completion_tokens", len(reply["tokens"]), persona=reply["persona"])
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        usage = {"prompt_tokens": reply["prompt_tokens"], "completion_tokens": len(reply["tokens"]),
+                 "total_tokens": reply["prompt_tokens"] + len(reply["tokens"])}
+
+        if not stream:
+            if outcome == "timeout":
+                stub.record("timeouts")
+                await asyncio.sleep(profile.hang_s)
+            delay = profile.sample_ttft(stub.rng, reply["prompt_tokens"]) + sum(profile.sample_token_delay(stub.rng) for _ in reply["tokens"])
+            await asyncio.sleep(delay)
+            return {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "finish_reason": reply["finish_reason"],
+                             "message": {"role": "assistant", "content": "".join(reply["tokens"])}}],
+                "usage": usage,
+            }
+
+        def chunk(delta: Dict, finish_reason: Optional[str] = None) -> str:
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        async def events():
+            stub.record("streams")
+            # 헤더는 이미 보낸 상태에서 멈추므로 클라이언트의 읽기 타임아웃을 시험할 수 있음
+            if outcome == "timeout":
+                stub.record("timeouts")
+                await asyncio.sleep(profile.hang_s)
+            await asyncio.sleep(profile.sample_ttft(stub.rng, reply["prompt_tokens"]))
+            yield chunk({"role": "assistant", "content": ""})
+            for token in reply["tokens"]:
+                yield chunk({"content": token})
+                delay = profile.sample_token_delay(stub.rng)
+                if delay:
+                    await asyncio.sleep(delay)
+            yield chunk({}, reply["finish_reason"])
+            if include_usage:
+                payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                           "model": model, "choices": [], "usage": usage}
+                yield f"data: {json.dumps(payload)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def search_delay_or_error() -> Optional[JSONResponse]:
+        """검색 대체 경로: LLM과 같은 프로필로 오류/타임아웃을 주입하고 첫 토큰 지연만큼 기다림"""
+        stub.record("search_requests")
+        outcome = stub.pick_outcome()
+        if outcome == "error":
+            stub.record("errors")
+            return JSONResponse(status_code=500, content={"error": "stub: injected server error"})
+        if outcome == "rate_limit":
+            stub.record("rate_limited")
+            return JSONResponse(status_code=429, content={"error": "stub: injected rate limit"})
+        if outcome == "timeout":
+            stub.record("timeouts")
+            await asyncio.sleep(stub.profile.hang_s)
+        await asyncio.sleep(stub.profile.sample_ttft(stub.rng))
+        return None
+
+    @app.get("/serpapi/search")
+    async def serpapi_search(q: str = "", num: int = 5):
+        error = await search_delay_or_error()
+        if error is not None:
+            return error
+        return {"organic_results": [
+            {"title": f"{q} 관련 자료 {i + 1}", "snippet": snippet, "link": f"https://example.com/{i + 1}"}
+            for i, snippet in enumerate(SEARCH_SNIPPETS[:num])
+        ]}
+
+    @app.get("/duckduckgo/")
+    async def duckduckgo_search(q: str = ""):
+        error = await search_delay_or_error()
+        if error is not None:
+            return error
+        return {
+            "Abstract": f"{q}: {SEARCH_SNIPPETS[0]}",
+            "AbstractURL": "https://example.com/abstract",
+            "RelatedTopics": [{"Text": snippet} for snippet in SEARCH_SNIPPETS[1:]],
+        }
+
+    @app.get("/stub/config")
+    async def get_config():
+        return {"profile": asdict(stub.profile), "available_profiles": list(PROFILES)}
+
+    @app.post("/stub/config")
+    async def set_config(request: Request):
+        """{"profile": "flaky"} 또는 {"error_rate": 0.2, "tokens_per_s": 30} 형태로 변경"""
+        body = await request.json()
+        try:
+            profile = stub.configure(body.pop("profile", None), **body)
+        except (ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"profile": asdict(profile)}
+
+    @app.get("/stub/stats")
+    async def get_stats():
+        return stub.get_stats()
+
+    @app.post("/stub/reset")
+    async def reset_stats():
+        stub.reset_stats()
+        return {"status": "reset"}
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 OpenAI 호환 스텁 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8199)
+    parser.add_argument("--profile", default="realistic", choices=list(PROFILES), help="지연 프로필")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드 (재현용)")
+    parser.add_argument("--ttft-ms", type=float, default=None, help="첫 토큰 지연 중앙값 덮어쓰기")
+    parser.add_argument("--tokens-per-s", type=float, default=None, help="토큰 속도 덮어쓰기")
+    parser.add_argument("--error-rate", type=float, default=None, help="500 오류 비율 덮어쓰기")
+    parser.add_argument("--timeout-rate", type=float, default=None, help="무응답 비율 덮어쓰기")
+    parser.add_argument("--ssl-certfile", default=None, help="HTTPS로 띄울 때 인증서 (TLS 연결 비용 측정용)")
+    parser.add_argument("--ssl-keyfile", default=None, help="HTTPS로 띄울 때 개인 키")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    stub = StubLLM(PROFILES[args.profile], seed=args.seed)
+    stub.configure(ttft_median_ms=args.ttft_ms, tokens_per_s=args.tokens_per_s,
+                   error_rate=args.error_rate, timeout_rate=args.timeout_rate)
+    base = f"{'https' if args.ssl_certfile else 'http'}://{args.host}:{args.port}"
+    print(f"🧪 스텁 LLM 서버: {base}/v1 (프로필: {args.profile})", file=sys.stderr)
+    print(f"   백엔드 연결: LLM_BASE_URL={base}/v1 "
+          f"SERPAPI_URL={base}/serpapi/search "
+          f"DUCKDUCKGO_URL={base}/duckduckgo/", file=sys.stderr)
+    uvicorn.run(create_app(stub), host=args.host, port=args.port, log_level="warning",
+                ssl_certfile=args.ssl_certfile, ssl_keyfile=args.ssl_keyfile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
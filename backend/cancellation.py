@@ -0,0 +1,62 @@
+"""LLM 턴 취소 토큰
+
+asyncio 태스크를 취소해도 스레드 풀에서 돌고 있는 블로킹 LLM 호출은 멈추지 않습니다.
+턴마다 CancellationToken을 만들어 생성 코드에 넘기고, 일시정지/중지/채팅방 전환/타임아웃 때
+cancel()을 호출하면:
+  - 스트리밍 HTTP 응답은 on_cancel에 등록된 close()로 즉시 끊기고
+  - CrewAI 실행은 다음 단계(step_callback)에서 TurnCancelled로 중단되며
+  - 이미 끝난 결과는 호출 측에서 token.cancelled를 확인해 버립니다.
+"""
+import threading
+from typing import Callable, List, Optional
+
+
+class TurnCancelled(Exception):
+    """취소된 턴에서 작업을 계속하려 할 때 발생"""
+
+
+class CancellationToken:
+    """스레드 간에 공유하는 취소 신호"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled"):
+        """취소 (이미 취소된 경우 무시), 등록된 콜백을 한 번씩 호출"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"취소 콜백 오류 ({self.label}): {e}")
+
+    def on_cancel(self, callback: Callable[[], None]):
+        """취소될 때 호출할 함수 등록 (이미 취소됐으면 바로 호출)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        """등록한 콜백 해제 (빌린 자원을 돌려줄 때, 이미 호출됐거나 없으면 무시)"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TurnCancelled(f"{self.label} 취소됨: {self.reason}")
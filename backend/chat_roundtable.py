@@ -1,121 +1,138 @@
 import os
+import re
+import math
+import time
+import asyncio
 import datetime
+import threading
 import requests
-from typing import List, Dict, Optional
+from concurrent.futures import wait, FIRST_COMPLETED
+from collections import OrderedDict
+from typing import Callable, List, Dict, Optional
 from dotenv import load_dotenv
-from crewai import Agent, Task, Crew, Process
-from crewai.llm import LLM
+from crewai import Task, Crew, Process
+from llm_executor import llm_executor
+from direct_llm import complete_agent_task, get_openai_settings, stream_agent_response
+from http_clients import READ_TIMEOUT, lease_openai_client, lease_session, search_timeout
+from cancellation import CancellationToken, TurnCancelled
+from circuit_breaker import circuit_breakers
+from llm_cache import LLMCacheMiss, llm_cache
+from metrics import llm_calls, observe_llm_call, tool_calls
+from research_cache import research_cache
+from running_summary import RunningSummary
+from search_orchestrator import SearchProvider, search_orchestrator
+from agent_pool import agent_pool
+# 가벼운 모델/페르소나 정의는 discussion_models에 있음 (기존 import 경로 유지를 위해 다시 내보냄)
+from discussion_models import AGENT_ATTRIBUTES, ChatMessage, get_default_personas, new_message_id
 
 load_dotenv()
 
 # OpenAI API 키 설정
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# 기본 페르소나 정의 함수
-def get_default_personas():
-    """기본 페르소나 정의 반환"""
-    return {
-        "진행자": {
-            "role": "토론 진행자",
-            "goal": "토론을 원활하게 진행하고 각 팀의 의견을 조율하여 결론을 도출합니다.",
-            "backstory": """
-            당신은 KS의 토론 진행자로서 각 팀의 전문적 의견을 종합하여 실행 가능한 결론을 도출하는 전문가입니다.
-            채팅 형식으로 실시간 소통이 가능하며, 사용자의 질문이나 의견에 즉시 응답할 수 있습니다.
-            
-            **응답 원칙:**
-            - 모든 응답은 한국어로 작성
-            - 간결하고 명확한 답변
-            - 필요시 추가 설명 요청 가능
-            - 실시간 대화 가능
-            
-            **도구 활용:**
-            - 토론 주제와 관련된 최신 정보가 필요할 때 WebSearchTool을 활용하여 웹 검색을 수행하세요
-            - 검색 결과를 바탕으로 더욱 정확하고 최신의 정보를 제공하세요
-            """
-        },
-        "디자인팀": {
-            "role": "디자인팀 팀장 김창의",
-            "goal": "UI/UX 관점에서 사용자 중심의 혁신적인 디자인 솔루션을 제시합니다.",
-            "backstory": """
-            당신은 KS의 디자인팀을 이끄는 팀장 김창의입니다. 
-            채팅 형식으로 실시간 소통이 가능하며, 디자인 관련 질문에 즉시 답변할 수 있습니다.
-            
-            **응답 형식**: "디자인팀 김창의: [내용]" 형태로 한국어로 작성
-            **전문 분야**: UI/UX, 사용자 경험, 디자인 트렌드, 브랜딩
-            
-            **도구 활용:**
-            - 최신 디자인 트렌드나 UI/UX 동향이 필요할 때 WebSearchTool을 활용하여 웹 검색을 수행하세요
-            - 경쟁사 사례나 업계 동향을 파악해야 할 때 웹 검색을 통해 최신 정보를 수집하세요
-            """
-        },
-        "영업팀": {
-            "role": "영업팀 팀장 박매출",
-            "goal": "시장 분석과 고객 니즈를 바탕으로 실질적인 매출 전략을 제시합니다.",
-            "backstory": """
-            당신은 KS의 영업팀을 이끄는 팀장 박매출입니다.
-            채팅 형식으로 실시간 소통이 가능하며, 영업/마케팅 관련 질문에 즉시 답변할 수 있습니다.
-            
-            **응답 형식**: "영업팀 박매출: [내용]" 형태로 한국어로 작성
-            **전문 분야**: 시장 분석, 고객 관리, 매출 전략, 경쟁사 분석
-            """
-        },
-        "생산팀": {
-            "role": "생산팀 팀장 이현실",
-            "goal": "생산 효율성과 품질 관리 관점에서 실현 가능한 솔루션을 제시합니다.",
-            "backstory": """
-            당신은 KS의 생산팀을 이끄는 팀장 이현실입니다.
-            채팅 형식으로 실시간 소통이 가능하며, 생산/제조 관련 질문에 즉시 답변할 수 있습니다.
-            
-            **응답 형식**: "생산팀 이현실: [내용]" 형태로 한국어로 작성
-            **전문 분야**: 생산 계획, 품질 관리, 원가 분석, 공정 개선
-            """
-        },
-        "마케팅팀": {
-            "role": "마케팅팀 팀장 최홍보",
-            "goal": "브랜드 전략과 고객 경험 관점에서 마케팅 솔루션을 제시합니다.",
-            "backstory": """
-            당신은 KS의 마케팅팀을 이끄는 팀장 최홍보입니다.
-            채팅 형식으로 실시간 소통이 가능하며, 마케팅/브랜딩 관련 질문에 즉시 답변할 수 있습니다.
-            
-            **응답 형식**: "마케팅팀 최홍보: [내용]" 형태로 한국어로 작성
-            **전문 분야**: 브랜드 전략, 디지털 마케팅, 고객 경험, 캠페인 기획
-            """
-        },
-        "IT팀": {
-            "role": "IT팀 팀장 박테크",
-            "goal": "기술적 실현 가능성과 시스템 관점에서 IT 솔루션을 제시합니다.",
-            "backstory": """
-            당신은 KS의 IT팀을 이끄는 팀장 박테크입니다.
-            채팅 형식으로 실시간 소통이 가능하며, IT/기술 관련 질문에 즉시 답변할 수 있습니다.
-            
-            **응답 형식**: "IT팀 박테크: [내용]" 형태로 한국어로 작성
-            **전문 분야**: 시스템 아키텍처, 디지털 전환, 데이터 분석, 기술 트렌드
-            """
-        }
-    }
+# 검색 API 주소 (부하 테스트에서는 benchmarks.stub_llm_server의 대체 경로로 지정)
+SERPAPI_URL = os.getenv("SERPAPI_URL", "https://serpapi.com/search")
+DUCKDUCKGO_URL = os.getenv("DUCKDUCKGO_URL", "https://api.duckduckgo.com/")
 
 # 커스텀 웹 검색 도구 구현
 from crewai.tools import tool
 
-def openai_research_tool(query: str) -> str:
-    """OpenAI GPT를 사용한 상세한 정보 조사 (OPENAI_API_KEY 필요)"""
+# 회로가 열려 호출하지 않았을 때 돌려주는 안내 문구의 시작 (캐시에 저장하지 않고 검색 결과로 쓰지 않음)
+CIRCUIT_OPEN_PREFIX = "⛔ "
+
+
+def openai_research_ok(result: str) -> bool:
+    return bool(result) and not (result.startswith(CIRCUIT_OPEN_PREFIX) or "API 키가 설정되지 않았습니다" in result
+                                 or "오류:" in result)
+
+
+def duckduckgo_result_ok(result: str) -> bool:
+    return bool(result) and not (result.startswith(CIRCUIT_OPEN_PREFIX) or "즉시 답변을 찾을 수 없습니다" in result
+                                 or "오류가 발생했습니다" in result)
+
+
+def serper_result_ok(result: str) -> bool:
+    # 403/401/429 안내 문구에도 "(오류: ...)"가 들어 있음
+    return bool(result) and not (result.startswith(CIRCUIT_OPEN_PREFIX) or "오류가 발생했습니다" in result
+                                 or "오류:" in result or "결과를 찾을 수 없습니다" in result)
+
+
+# 회로 차단기용: 결과가 없다는 응답은 정상, 제공자 쪽 오류(인증/한도/HTTP/네트워크/시간 초과)만 실패로 셈
+def openai_research_healthy(result: str) -> bool:
+    return not result.startswith("OpenAI 조사 도구 오류")
+
+
+def duckduckgo_healthy(result: str) -> bool:
+    return not result.startswith("웹 검색 중 오류가 발생했습니다")
+
+
+def serper_healthy(result: str) -> bool:
+    return not result.startswith(("SerpAPI ", "웹 검색 HTTP 오류", "웹 검색 중 네트워크 오류", "SERPER API 검색 중"))
+
+
+def _call_with_breaker(provider: str, label: str, call: Callable[[], str], healthy: Callable[[str], bool],
+                       cancel_token: Optional[CancellationToken] = None) -> str:
+    """제공자 회로 차단기를 거쳐 호출 (회로가 열려 있으면 기다리지 않고 바로 안내 문구 반환)"""
+    breaker = circuit_breakers.get(provider)
+    if not breaker.allow():
+        tool_calls.inc(tool="web_search", provider=provider, outcome="circuit_open")
+        return (f"{CIRCUIT_OPEN_PREFIX}{label} 호출을 건너뜁니다: 최근 오류가 많아 회로가 열려 있습니다 "
+                f"({breaker.retry_in_s():.0f}초 후 다시 시도, 마지막 오류: {breaker.last_failure})")
+    result = call()
+    if cancel_token is not None and cancel_token.cancelled:
+        breaker.release()
+    elif healthy(result):
+        breaker.record_success()
+    else:
+        # 디버그 엔드포인트에 노출되므로 URL에 들어 있는 API 키는 가림
+        breaker.record_failure(re.sub(r"(api_key=)[^&\s]+", r"\1***", result))
+    return result
+
+
+def openai_research_tool(query: str, cancel_token: Optional[CancellationToken] = None,
+                         timeout: Optional[float] = None) -> str:
+    """OpenAI GPT를 사용한 상세한 정보 조사 (research_cache와 회로 차단기를 거침, 취소되면 HTTP 연결을 닫음)"""
+    def fetch(token: Optional[CancellationToken] = cancel_token) -> str:
+        return _call_with_breaker("openai", "OpenAI 조사", lambda: _openai_research(query, token, timeout),
+                                  openai_research_healthy, token)
+    return research_cache.fetch("openai", query, fetch, openai_research_ok, refresh=lambda: fetch(None))
+
+
+def duckduckgo_search(query: str, cancel_token: Optional[CancellationToken] = None,
+                      timeout: Optional[float] = None) -> str:
+    """DuckDuckGo를 통한 기본적인 검색 결과 제공 (API 키 불필요, research_cache와 회로 차단기를 거침)"""
+    def fetch(token: Optional[CancellationToken] = cancel_token) -> str:
+        return _call_with_breaker("duckduckgo", "DuckDuckGo 검색", lambda: _duckduckgo_search(query, token, timeout),
+                                  duckduckgo_healthy, token)
+    return research_cache.fetch("duckduckgo", query, fetch, duckduckgo_result_ok, refresh=lambda: fetch(None))
+
+
+def serper_search(query: str, api_key: str, cancel_token: Optional[CancellationToken] = None,
+                  timeout: Optional[float] = None) -> str:
+    """SERPER API를 사용한 웹 검색 (research_cache와 회로 차단기를 거침)"""
+    def fetch(token: Optional[CancellationToken] = cancel_token) -> str:
+        return _call_with_breaker("serpapi", "SerpAPI 검색", lambda: _serper_search(query, api_key, token, timeout),
+                                  serper_healthy, token)
+    return research_cache.fetch("serpapi", query, fetch, serper_result_ok, refresh=lambda: fetch(None))
+
+
+def _openai_research(query: str, cancel_token: Optional[CancellationToken] = None,
+                     timeout: Optional[float] = None) -> str:
+    """OpenAI GPT를 사용한 상세한 정보 조사 (OPENAI_API_KEY 필요, 취소되면 HTTP 연결을 닫음)"""
     try:
-        import openai
-        import os
-        
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+        settings = get_openai_settings()
+        if not settings["api_key"]:
             return "OpenAI API 키가 설정되지 않았습니다. OPENAI_API_KEY를 설정해주세요."
         
-        client = openai.OpenAI(api_key=api_key)
-        
-        # GPT-4를 사용하여 상세한 정보 조사
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # 비용 효율적인 모델 사용
-            messages=[
-                {
-                    "role": "system", 
-                    "content": """당신은 전문적인 정보 조사 전문가입니다. 
+        # GPT-4를 사용하여 상세한 정보 조사 (풀에서 빌린 클라이언트, 취소되면 그 클라이언트를 닫음)
+        started = time.perf_counter()
+        with lease_openai_client(settings, cancel_token) as client:
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",  # 비용 효율적인 모델 사용
+                messages=[
+                    {
+                        "role": "system", 
+                        "content": """당신은 전문적인 정보 조사 전문가입니다. 
                     
 주어진 질문에 대해 다음과 같이 답변해주세요:
 1. 핵심 내용을 정확하고 상세하게 설명
@@ -126,32 +143,41 @@ def openai_research_tool(query: str) -> str:
 
 답변은 한국어로 작성하고, 구체적이고 실용적인 정보를 제공해주세요.
 답변 길이는 200-400자 정도로 적당히 상세하게 작성해주세요."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"다음 주제에 대해 상세히 조사해주세요: {query}"
-                }
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
+                    },
+                    {
+                        "role": "user", 
+                        "content": f"다음 주제에 대해 상세히 조사해주세요: {query}"
+                    }
+                ],
+                max_tokens=1000,
+                temperature=0.7,
+                # timeout=None을 넘기면 시간 제한이 없어지므로 지정된 경우에만 (기본은 클라이언트의 LLM_REQUEST_TIMEOUT)
+                **({"timeout": timeout} if timeout is not None else {})
+            )
         
         result = response.choices[0].message.content.strip()
+        usage = getattr(response, "usage", None)
+        observe_llm_call("research", "OpenAIResearchTool", "ok", time.perf_counter() - started,
+                         getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None))
         return f"🔍 조사 주제: {query}\n\n📊 상세 정보:\n{result}"
         
     except Exception as e:
+        outcome = "cancelled" if cancel_token is not None and cancel_token.cancelled else "error"
+        llm_calls.inc(kind="research", agent="OpenAIResearchTool", outcome=outcome)
         return f"OpenAI 조사 도구 오류: {str(e)}\n\n기본 지식을 바탕으로 답변을 제공하겠습니다."
 
-def duckduckgo_search(query: str) -> str:
+def _duckduckgo_search(query: str, cancel_token: Optional[CancellationToken] = None,
+                       timeout: Optional[float] = None) -> str:
     """DuckDuckGo를 통한 기본적인 검색 결과 제공 (API 키 불필요)"""
     try:
         import urllib.parse
         
         # DuckDuckGo Instant Answer API 시도
         encoded_query = urllib.parse.quote(query)
-        instant_url = f"https://api.duckduckgo.com/?q={encoded_query}&format=json&no_html=1&skip_disambig=1"
+        instant_url = f"{DUCKDUCKGO_URL}?q={encoded_query}&format=json&no_html=1&skip_disambig=1"
         
-        response = requests.get(instant_url, timeout=10)
+        with lease_session(cancel_token) as session:
+            response = session.get(instant_url, timeout=search_timeout(timeout))
         response.raise_for_status()
         
         data = response.json()
@@ -204,11 +230,12 @@ def duckduckgo_search(query: str) -> str:
         return f"웹 검색 중 오류가 발생했습니다: {str(e)}\\n\\n기본 지식을 바탕으로 답변을 제공하겠습니다."
 
 
-def serper_search(query: str, api_key: str) -> str:
+def _serper_search(query: str, api_key: str, cancel_token: Optional[CancellationToken] = None,
+                   timeout: Optional[float] = None) -> str:
     """SERPER API를 사용한 웹 검색"""
     try:
         # SerpAPI를 사용한 웹 검색 (GET 방식)
-        url = "https://serpapi.com/search"
+        url = SERPAPI_URL
         params = {
             "engine": "google",
             "q": query,
@@ -216,7 +243,8 @@ def serper_search(query: str, api_key: str) -> str:
             "num": 5
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        with lease_session(cancel_token) as session:
+            response = session.get(url, params=params, timeout=search_timeout(timeout))
         response.raise_for_status()
         
         data = response.json()
@@ -294,41 +322,51 @@ def web_search_tool(query: str) -> str:
     
     중요: 질문에 답하기 전에 최신 정보가 필요하다면 반드시 이 도구를 먼저 사용하세요.
     """
-    # 1. OpenAI 조사 도구를 먼저 시도 (가장 정확하고 상세한 정보)
-    print(f"🤖 OpenAI로 정보 조사 시도: {query}")
-    openai_result = openai_research_tool(query)
-    
-    # OpenAI에서 유효한 결과를 얻었으면 반환
-    if openai_result and not ("API 키가 설정되지 않았습니다" in openai_result or "오류:" in openai_result):
-        print(f"✅ OpenAI 조사 성공")
-        return openai_result
-    
-    # 2. SERPER API 시도 (실제 웹 검색 결과)
+    # 우선순위: OpenAI 조사(가장 정확) → SERPER API(실제 웹 검색) → DuckDuckGo(백업)
+    # 순서대로 기다리지 않고 search_orchestrator가 시작 지연을 두고 경주시켜 먼저 온 쓸 만한 결과를 사용
+    # 진 요청은 취소 토큰으로 연결을 닫아 끊음 (SEARCH_LOSERS=drain이면 취소하지 않고 마저 받아 research_cache를 채움)
+    timeout = min(READ_TIMEOUT, search_orchestrator.deadline_s)
+    providers = []
+    if get_openai_settings()["api_key"]:
+        providers.append(SearchProvider(
+            "openai", lambda q, token: openai_research_tool(q, token, search_orchestrator.deadline_s),
+            openai_research_ok))
     serper_api_key = os.getenv("SERPER_API_KEY")
     if serper_api_key:
-        print(f"🔍 SERPER API로 검색 시도: {query}")
-        serper_result = serper_search(query, serper_api_key)
-        if serper_result and not ("오류가 발생했습니다" in serper_result):
-            print(f"✅ SERPER API 검색 성공") 
-            return serper_result
-    
-    # 3. DuckDuckGo 백업 시도
-    print(f"🦆 DuckDuckGo로 검색 시도: {query}")
-    ddg_result = duckduckgo_search(query)
-    if ddg_result and not ("즉시 답변을 찾을 수 없습니다" in ddg_result or "오류가 발생했습니다" in ddg_result):
-        print(f"✅ DuckDuckGo 검색 성공")
-        return ddg_result
+        providers.append(SearchProvider(
+            "serpapi", lambda q, token: serper_search(q, serper_api_key, token, timeout),
+            serper_result_ok))
+    providers.append(SearchProvider(
+        "duckduckgo", lambda q, token: duckduckgo_search(q, token, timeout),
+        duckduckgo_result_ok))
+    # 캐시에 결과가 있는 제공자를 먼저 시작해 시작 지연 없이 바로 응답
+    providers.sort(key=lambda provider: not research_cache.contains(provider.name, query))
+
+    print(f"🔍 웹 검색 ({', '.join(p.name for p in providers)}): {query}")
+    outcome = search_orchestrator.search(query, providers)
+    if outcome["result"] is not None:
+        print(f"✅ {outcome['provider']} 검색 성공 ({outcome['elapsed_s']:.2f}초)")
+        return outcome["result"]
     
-    # 4. 모든 방법 실패시 안내 메시지
+    # 모든 방법 실패(또는 마감 시간 초과)시 안내 메시지
     print(f"⚠️ 모든 검색 방법 실패")
+    tool_calls.inc(tool="web_search", provider="none",
+                   outcome="deadline" if outcome["deadline_exceeded"] else "exhausted")
     return f"검색어 '{query}'에 대한 상세한 정보를 찾기 어렵습니다.\\n\\n💡 더 나은 검색을 위해:\\n• OPENAI_API_KEY 설정 (가장 정확한 정보)\\n• SERPER_API_KEY 설정 (실시간 웹 검색)\\n\\n기본 지식을 바탕으로 답변을 제공하겠습니다."
 
-class ChatMessage:
-    def __init__(self, sender: str, content: str, timestamp: datetime.datetime = None, message_type: str = "message"):
-        self.sender = sender
-        self.content = content
-        self.timestamp = timestamp or datetime.datetime.now()
-        self.message_type = message_type  # "message", "system", "question", "response"
+
+# 이런 표현이 들어간 주제/질문만 답변 전에 웹 검색을 함 (나머지는 페르소나 지식으로 바로 답변)
+RESEARCH_KEYWORDS = ("최신", "최근", "동향", "트렌드", "통계", "시장 규모", "점유율", "사례", "경쟁사",
+                     "현황", "전망", "뉴스", "규제", "데이터")
+_YEAR_RE = re.compile(r"20[0-9]{2}년?")
+
+
+def needs_research(text: str) -> bool:
+    """외부 자료가 있어야 답할 수 있는 주제인지 (키워드/연도 기준 추정)"""
+    if not text:
+        return False
+    return any(keyword in text for keyword in RESEARCH_KEYWORDS) or bool(_YEAR_RE.search(text))
+
 
 class ChatRoundtable:
     def __init__(self):
@@ -343,6 +381,43 @@ class ChatRoundtable:
         self.user_intervention_pending = False  # 사용자 개입 대기 상태
         self.discussion_rounds = 0  # 토론 라운드 수
         self.used_responses = {}  # 각 에이전트가 이미 사용한 응답 추적
+        # 채팅 기록 상한: history_limit개를 넘으면 가장 오래된 history_summary_window개를 추출 요약 1개로 압축
+        # (원본은 메모리 시스템의 대화 기록/콜드 스토리지에 남아 있음)
+        self.history_limit = 80
+        self.history_summary_window = 40
+        self.archived_message_count = 0  # 요약으로 대체되어 chat_history에서 빠진 메시지 수
+        self.initial_opinion_concurrency = 4  # 초기 의견 동시 생성 에이전트 수
+        # 자동 토론 발언을 토큰 단위로 스트리밍 (OpenAI 직접 호출, 실패 시 CrewAI로 대체)
+        self.stream_responses = bool(get_openai_settings()["api_key"])
+        # 스트리밍 발언은 이미 화면에 보인 뒤라 나중에 자르지 않으므로 길이는 프롬프트와 max_tokens로 제한
+        self.turn_max_chars = 300
+        self.turn_max_tokens = 300
+        # 단일 에이전트 작업(자동 발언, 전문가 질문, 사용자 메시지 응답)은 Crew 없이 채팅 완성 한 번으로 처리
+        # (DIRECT_TURNS=0 이면 기존 Crew 경로, 직접 호출이 실패하면 Crew로 대체)
+        self.direct_turns = self.stream_responses and os.getenv("DIRECT_TURNS", "1") != "0"
+        # 조사한 질의 → 결과 (토론 동안 재사용, 최근 research_notes_max개까지, 여러 실행 풀 스레드가 함께 씀)
+        self.research_notes: Dict[str, Optional[str]] = OrderedDict()
+        self.research_notes_max = 32
+        self._research_lock = threading.Lock()
+        self._research_query_locks: Dict[str, threading.Lock] = {}  # 질의별 검색 중 잠금 (같은 질의는 한 번만 검색)
+        # 진행 중인 자동 토론 턴의 취소 토큰 (일시정지/중지/전환/타임아웃 시 cancel_current_turn으로 취소)
+        self.current_turn_token: Optional[CancellationToken] = None
+        self.cancelled_turns = 0
+        # 파이프라인 모드: 발언 N이 표시되는 동안 다음 대기 발언자의 N+1을 미리 생성
+        # (그 사이 기록이 바뀌면 — 예: 사용자 메시지 — 미리 만든 결과는 버리고 다시 생성)
+        self.pipeline_turns = os.getenv("PIPELINE_TURNS", "1") != "0"
+        self.speculative_turn: Optional[Dict] = None
+        self.speculation_stats = {"started": 0, "used": 0, "discarded": 0}
+        # 브레인스토밍 동시 실행: 에이전트별 제한 시간, 정족수 비율과 그 마감 시간(초)
+        self.brainstorm_concurrency = 4
+        self.brainstorm_agent_timeout = 90.0
+        self.brainstorm_quorum_ratio = 0.6
+        self.brainstorm_quorum_deadline = 45.0
+        # 결론/심화 질문 프롬프트: 전체 기록 대신 누적 요약 + 최근 대화를 토큰 예산 안에서 사용
+        # (요약은 새 메시지가 update_interval개 쌓일 때마다 백그라운드에서 갱신)
+        self.running_summary = RunningSummary(update_interval=6)
+        self.context_token_budget = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+        self._summary_future = None
         self.setup_agents()
     
     def setup_agents(self, custom_personas=None):
@@ -361,77 +436,107 @@ class ChatRoundtable:
                 if agent_name in default_personas:
                     default_personas[agent_name].update(persona)
         
-        # LLM 설정
-        llm = LLM(
-            model="gpt-4o-mini",
-            api_key=OPENAI_API_KEY
-        )
-        
-        # 토론 진행자
-        moderator_persona = default_personas["진행자"]
-        self.moderator = Agent(
-            role=moderator_persona["role"],
-            goal=moderator_persona["goal"],
-            backstory=moderator_persona["backstory"],
-            verbose=True,
-            tools=[openai_research_crewai_tool, web_search_tool],
-            llm=llm
-        )
-        
-        # 디자인팀 에이전트
-        design_persona = default_personas["디자인팀"]
-        self.design_agent = Agent(
-            role=design_persona["role"],
-            goal=design_persona["goal"],
-            backstory=design_persona["backstory"],
-            verbose=True,
-            tools=[openai_research_crewai_tool, web_search_tool],
-            llm=llm
-        )
+        # 에이전트는 페르소나 내용 해시로 풀에서 받아옴 (페르소나가 바뀐 에이전트만 새로 생성)
+        # 토론 진행자, 디자인팀, 영업팀, 생산팀, 마케팅팀, IT팀
+        agents = agent_pool.get_many({name: default_personas[name] for name in AGENT_ATTRIBUTES})
+        for name, attribute in AGENT_ATTRIBUTES.items():
+            old_agent = getattr(self, attribute, None)
+            setattr(self, attribute, agents[name])
+            if old_agent is not None:
+                self._swap_agent(old_agent, agents[name])
+    
+    def _swap_agent(self, old_agent, new_agent):
+        """진행 중인 토론의 참여자/발언 대기열에서 에이전트 교체"""
+        if old_agent is new_agent:
+            return
+        self.active_agents = [new_agent if a is old_agent else a for a in self.active_agents]
+        self.next_speaker_queue = [new_agent if a is old_agent else a for a in self.next_speaker_queue]
+        if self.current_speaker is old_agent:
+            self.current_speaker = new_agent
+        if self.speculative_turn is not None and self.speculative_turn["speaker"] is old_agent:
+            self.discard_speculative_turn("persona changed")
+    
+    def update_agent_persona(self, agent_name: str, persona: Dict) -> bool:
+        """한 에이전트의 페르소나 변경 (풀의 에이전트는 공유되므로 직접 수정하지 않고 교체)"""
+        attribute = AGENT_ATTRIBUTES.get(agent_name)
+        if attribute is None:
+            return False
+        old_agent = getattr(self, attribute)
+        new_agent = agent_pool.get(persona)
+        setattr(self, attribute, new_agent)
+        self._swap_agent(old_agent, new_agent)
+        return True
+    
+    def _kickoff(self, crew, bypass_cache: bool = False) -> str:
+        """crew.kickoff()를 응답 캐시를 거쳐 실행 (같은 모델/페르소나/작업이면 저장된 응답 재사용)
 
-        # 영업팀 에이전트  
-        sales_persona = default_personas["영업팀"]
-        self.sales_agent = Agent(
-            role=sales_persona["role"],
-            goal=sales_persona["goal"],
-            backstory=sales_persona["backstory"],
-            verbose=True,
-            tools=[openai_research_crewai_tool, web_search_tool],
-            llm=llm
-        )
+        풀의 Agent는 공유되므로 같은 Agent를 쓰는 다른 Crew 실행(미리 생성 턴과 전문가 질문 등)과는 차례로 실행
+        """
+        with agent_pool.exclusive(crew.agents):
+            return llm_cache.kickoff(crew, bypass=bypass_cache)
+    
+    def _research_for(self, query: str) -> Optional[str]:
+        """조사가 필요한 질의면 웹 검색 결과를 반환 (같은 질의는 한 번만 검색)"""
+        if not needs_research(query):
+            return None
+        with self._research_lock:
+            if query in self.research_notes:
+                self.research_notes.move_to_end(query)
+                return self.research_notes[query]
+            query_lock = self._research_query_locks.setdefault(query, threading.Lock())
+        
+        # 동시에 같은 질의를 조사하려는 턴은 먼저 시작한 검색 결과를 기다림
+        with query_lock:
+            with self._research_lock:
+                if query in self.research_notes:
+                    return self.research_notes[query]
+            try:
+                result = web_search_tool.run(query)
+            except Exception:
+                with self._research_lock:
+                    self._research_query_locks.pop(query, None)
+                raise
+            failed = not result or "정보를 찾기 어렵습니다" in result
+            note = None if failed else result[:1500]
+            # 결과 저장과 잠금 해제를 한 번에 해서 그 사이 도착한 턴이 다시 검색하지 않도록 함
+            with self._research_lock:
+                self.research_notes[query] = note
+                while len(self.research_notes) > self.research_notes_max:
+                    self.research_notes.popitem(last=False)
+                self._research_query_locks.pop(query, None)
+            return note
 
-        # 생산팀 에이전트
-        production_persona = default_personas["생산팀"]
-        self.production_agent = Agent(
-            role=production_persona["role"],
-            goal=production_persona["goal"],
-            backstory=production_persona["backstory"],
-            verbose=True,
-            tools=[openai_research_crewai_tool, web_search_tool],
-            llm=llm
-        )
+    def _run_agent_task(self, agent, description: str, expected_output: str,
+                        cancel_token: CancellationToken = None, research_query: str = None) -> str:
+        """에이전트 하나 + 작업 하나 실행
 
-        # 마케팅팀 에이전트
-        marketing_persona = default_personas["마케팅팀"]
-        self.marketing_agent = Agent(
-            role=marketing_persona["role"],
-            goal=marketing_persona["goal"],
-            backstory=marketing_persona["backstory"],
-            verbose=True,
-            tools=[openai_research_crewai_tool, web_search_tool],
-            llm=llm
-        )
+        direct_turns면 페르소나와 작업을 채팅 완성 한 번으로 보내고(research_query가 조사가 필요한 주제면
+        먼저 웹 검색 결과를 붙임), 꺼져 있거나 실패하면 Crew(kickoff)로 실행합니다.
+        """
+        if self.direct_turns:
+            try:
+                research = self._research_for(research_query) if research_query else None
+                result = complete_agent_task(agent, description, expected_output, research=research,
+                                             cancel_token=cancel_token)
+                if result["content"]:
+                    return result["content"]
+            except TurnCancelled:
+                raise
+            except Exception as e:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                print(f"⚠️ 직접 호출 실패 ({agent.role}), CrewAI로 대체: {e}")
 
-        # IT팀 에이전트
-        it_persona = default_personas["IT팀"]
-        self.it_agent = Agent(
-            role=it_persona["role"],
-            goal=it_persona["goal"],
-            backstory=it_persona["backstory"],
-            verbose=True,
-            tools=[openai_research_crewai_tool, web_search_tool],
-            llm=llm
+        task = Task(description=description, expected_output=expected_output, agent=agent)
+        # Crew를 통해 실행 (단계마다 취소 여부 확인)
+        crew = Crew(
+            agents=[agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=False,
+            step_callback=(lambda _step: cancel_token.raise_if_cancelled()) if cancel_token else None
         )
+        return self._kickoff(crew)
 
     def get_agent_by_name(self, name: str):
         """이름으로 에이전트 찾기"""
@@ -520,76 +625,75 @@ class ChatRoundtable:
             traceback.print_exc()
             raise e
 
-    def get_initial_opinions(self):
-        """각 팀의 초기 입장 수집"""
-        try:
-            # context가 제대로 설정되었는지 확인
-            if not hasattr(self, 'context') or not self.context:
-                print("경고: context가 설정되지 않았습니다. 기본값을 사용합니다.")
-                self.context = {}
-            
-            # context가 dict가 아닌 경우 처리
-            if not isinstance(self.context, dict):
-                print(f"경고: context가 dict가 아닙니다. 타입: {type(self.context)}")
-                self.context = {}
-            
-            context_info = f"""
+    def _get_initial_context_info(self) -> str:
+        """초기 의견 프롬프트에 들어갈 회사 상황 (context가 없거나 잘못되면 기본값으로 초기화)"""
+        # context가 제대로 설정되었는지 확인
+        if not hasattr(self, 'context') or not self.context:
+            print("경고: context가 설정되지 않았습니다. 기본값을 사용합니다.")
+            self.context = {}
+        
+        # context가 dict가 아닌 경우 처리
+        if not isinstance(self.context, dict):
+            print(f"경고: context가 dict가 아닙니다. 타입: {type(self.context)}")
+            self.context = {}
+        
+        return f"""
             **회사 상황:**
             - 회사 규모: {self.context.get('company_size', '정보 없음')}
             - 사업 분야: {self.context.get('industry', '정보 없음')}
             - 연 매출: {self.context.get('revenue', '정보 없음')}
             - 해결 과제: {self.context.get('current_challenge', '정보 없음')}
             """
+    
+    def _generate_initial_opinion(self, agent, context_info: str, position: int) -> ChatMessage:
+        """에이전트 한 명의 초기 의견 생성 (실패하면 기본 메시지, chat_history에는 추가하지 않음)"""
+        try:
+            print(f"에이전트 {position} 초기 의견 생성 중: {agent.role}")
+            
+            task = Task(
+                description=f"""
+                토론 주제: {self.current_topic}
+                
+                {context_info}
+                
+                귀하의 전문 분야 관점에서 이 주제에 대한 초기 입장을 간결하게 제시해주세요.
+                채팅 형식으로 2-3문장 정도의 핵심 의견만 말씀해주세요.
+                """,
+                expected_output="전문가 관점의 간결한 초기 입장 (한국어)",
+                agent=agent
+            )
+            
+            crew = Crew(
+                agents=[agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=False
+            )
+            
+            result = self._kickoff(crew)
+            print(f"에이전트 {position} 초기 의견 생성 완료: {agent.role}")
+            return ChatMessage(sender=agent.role, content=str(result))
             
+        except Exception as e:
+            print(f"에이전트 {position} 초기 의견 생성 실패: {agent.role} - {str(e)}")
+            # 기본 메시지 생성
+            return ChatMessage(
+                sender=agent.role,
+                content=f"{agent.role}의 초기 의견을 생성하는 중 오류가 발생했습니다."
+            )
+    
+    def get_initial_opinions(self):
+        """각 팀의 초기 입장 수집"""
+        try:
+            context_info = self._get_initial_context_info()
             print(f"컨텍스트 정보: {context_info}")
             print(f"활성 에이전트 수: {len(self.active_agents)}")
             
             initial_opinions = []
-            
             for i, agent in enumerate(self.active_agents):
-                try:
-                    print(f"에이전트 {i+1} 초기 의견 생성 중: {agent.role}")
-                    
-                    task = Task(
-                        description=f"""
-                        토론 주제: {self.current_topic}
-                        
-                        {context_info}
-                        
-                        귀하의 전문 분야 관점에서 이 주제에 대한 초기 입장을 간결하게 제시해주세요.
-                        채팅 형식으로 2-3문장 정도의 핵심 의견만 말씀해주세요.
-                        """,
-                        expected_output="전문가 관점의 간결한 초기 입장 (한국어)",
-                        agent=agent
-                    )
-                    
-                    crew = Crew(
-                        agents=[agent],
-                        tasks=[task],
-                        process=Process.sequential,
-                        verbose=False
-                    )
-                    
-                    result = crew.kickoff()
-                    
-                    msg = ChatMessage(
-                        sender=agent.role,
-                        content=str(result)
-                    )
-                    self.chat_history.append(msg)
-                    initial_opinions.append(msg)
-                    
-                    print(f"에이전트 {i+1} 초기 의견 생성 완료: {agent.role}")
-                    
-                except Exception as e:
-                    print(f"에이전트 {i+1} 초기 의견 생성 실패: {agent.role} - {str(e)}")
-                    # 기본 메시지 생성
-                    default_msg = ChatMessage(
-                        sender=agent.role,
-                        content=f"{agent.role}의 초기 의견을 생성하는 중 오류가 발생했습니다."
-                    )
-                    self.chat_history.append(default_msg)
-                    initial_opinions.append(default_msg)
+                msg = self._generate_initial_opinion(agent, context_info, i + 1)
+                self.chat_history.append(msg)
+                initial_opinions.append(msg)
             
             return initial_opinions
             
@@ -599,6 +703,38 @@ class ChatRoundtable:
             traceback.print_exc()
             # 빈 리스트 반환
             return []
+    
+    async def get_initial_opinions_async(self, callback=None, max_concurrency: int = None):
+        """각 팀의 초기 입장을 동시에 수집
+        
+        에이전트별 Crew 실행을 LLM 전용 스레드 풀에서 최대 max_concurrency개까지 동시에 돌리고,
+        의견이 완성되는 대로 callback("message", msg)로 바로 전달합니다.
+        chat_history와 반환 목록은 완료 순서와 상관없이 active_agents 순서를 따릅니다.
+        """
+        try:
+            context_info = self._get_initial_context_info()
+            print(f"활성 에이전트 수: {len(self.active_agents)} (동시 생성)")
+            
+            semaphore = asyncio.Semaphore(max_concurrency or self.initial_opinion_concurrency)
+            
+            async def generate(position: int, agent) -> ChatMessage:
+                async with semaphore:
+                    msg = await llm_executor.run(self._generate_initial_opinion, agent, context_info, position)
+                if callback:
+                    await callback("message", msg)
+                return msg
+            
+            initial_opinions = await asyncio.gather(
+                *(generate(i + 1, agent) for i, agent in enumerate(self.active_agents))
+            )
+            self.chat_history.extend(initial_opinions)
+            return list(initial_opinions)
+            
+        except Exception as e:
+            print(f"get_initial_opinions_async 전체 오류: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return []
 
     def ask_specific_person(self, person: str, question: str, context: str = ""):
         """특정 전문가에게 질문"""
@@ -616,8 +752,9 @@ class ChatRoundtable:
             recent_messages = self.chat_history[-5:]  # 최근 5개 메시지
             recent_context = "\n".join([f"{msg.sender}: {msg.content}" for msg in recent_messages])
         
-        task = Task(
-            description=f"""
+        result = self._run_agent_task(
+            agent,
+            f"""
             토론 주제: {self.current_topic}
             
             최근 대화 내용:
@@ -631,19 +768,10 @@ class ChatRoundtable:
             위 질문에 대해 귀하의 전문 분야 관점에서 답변해주세요.
             채팅 형식으로 자연스럽게 답변해주세요.
             """,
-            expected_output="전문가 관점의 구체적 답변 (한국어)",
-            agent=agent
+            "전문가 관점의 구체적 답변 (한국어)",
+            research_query=question
         )
         
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False
-        )
-        
-        result = crew.kickoff()
-        
         response_msg = ChatMessage(
             sender=agent.role,
             content=str(result)
@@ -667,8 +795,9 @@ class ChatRoundtable:
             recent_messages = self.chat_history[-10:]  # 최근 10개 메시지
             recent_context = "\n".join([f"{msg.sender}: {msg.content}" for msg in recent_messages])
         
-        task = Task(
-            description=f"""
+        result = self._run_agent_task(
+            self.moderator,
+            f"""
             토론 주제: {self.current_topic}
             
             최근 대화 내용:
@@ -679,19 +808,10 @@ class ChatRoundtable:
             토론 진행자로서 이에 적절히 응답하고, 필요하다면 다른 전문가들의 추가 의견을 요청하거나
             토론을 더 발전시킬 수 있는 방향을 제시해주세요.
             """,
-            expected_output="토론 진행자의 적절한 응답 (한국어)",
-            agent=self.moderator
-        )
-        
-        crew = Crew(
-            agents=[self.moderator],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False
+            "토론 진행자의 적절한 응답 (한국어)",
+            research_query=user_input
         )
         
-        result = crew.kickoff()
-        
         moderator_msg = ChatMessage(
             sender="토론 진행자",
             content=str(result)
@@ -710,8 +830,8 @@ class ChatRoundtable:
         )
         self.chat_history.append(user_msg)
         
-        # 전체 토론 컨텍스트
-        full_context = "\n".join([f"{msg.sender}: {msg.content}" for msg in self.chat_history])
+        # 토론 컨텍스트 (누적 요약 + 최근 대화)
+        full_context = self.get_discussion_context()
         
         if focus_area == "전체" or focus_area == "종합":
             # 진행자가 종합적으로 답변
@@ -719,7 +839,7 @@ class ChatRoundtable:
                 description=f"""
                 토론 주제: {self.current_topic}
                 
-                전체 토론 내용:
+                토론 내용 (요약 + 최근 대화):
                 {full_context}
                 
                 사용자가 "{question}"에 대해 심화 질문을 했습니다.
@@ -743,7 +863,7 @@ class ChatRoundtable:
                 verbose=False
             )
             
-            result = crew.kickoff()
+            result = self._kickoff(crew)
             
             response_msg = ChatMessage(
                 sender="토론 진행자",
@@ -765,7 +885,7 @@ class ChatRoundtable:
                 description=f"""
                 토론 주제: {self.current_topic}
                 
-                전체 토론 내용:
+                토론 내용 (요약 + 최근 대화):
                 {full_context}
                 
                 사용자가 "{question}"에 대해 귀하의 전문 분야와 관련된 심화 질문을 했습니다.
@@ -788,7 +908,7 @@ class ChatRoundtable:
                 verbose=False
             )
             
-            result = crew.kickoff()
+            result = self._kickoff(crew)
             
             response_msg = ChatMessage(
                 sender=agent.role,
@@ -799,6 +919,123 @@ class ChatRoundtable:
         self.chat_history.append(response_msg)
         return response_msg
 
+    def _generate_brainstorm_idea(self, agent, problem: str) -> ChatMessage:
+        """에이전트 한 명의 브레인스토밍 아이디어 생성"""
+        task = Task(
+            description=f"""
+            토론 주제: {self.current_topic}
+            브레인스토밍 문제: {problem}
+            
+            귀하의 전문 분야 관점에서 이 문제에 대한 창의적이고 실용적인 해결 아이디어를 제시해주세요.
+            
+            다음 형식으로 답변해주세요:
+            1. 핵심 아이디어 (1줄 요약)
+            2. 구체적 실행 방법
+            3. 예상 효과
+            4. 필요 자원
+            
+            짧고 명확하게 작성해주세요.
+            """,
+            expected_output="창의적 해결 아이디어 (한국어)",
+            agent=agent
+        )
+        
+        crew = Crew(
+            agents=[agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=False
+        )
+        
+        result = self._kickoff(crew)
+        
+        return ChatMessage(
+            sender=agent.role,
+            content=str(result)
+        )
+    
+    def _collect_brainstorm_ideas(self, problem: str):
+        """활성 에이전트 아이디어를 LLM 실행 풀에서 동시에 생성 (한 번에 최대 brainstorm_concurrency개 제출)
+        
+        - 에이전트마다 실제 실행을 시작한 시점부터 brainstorm_agent_timeout초가 지나면 제외
+        - 풀이 가득 차 제출 후 brainstorm_agent_timeout초 동안 시작하지 못한 작업도 취소하고 제외
+          (이 메서드 자체가 같은 풀에서 실행되므로 풀이 밀려도 무한정 기다리지 않게 함)
+        - 시작 후 brainstorm_quorum_deadline초가 지났고 정족수(brainstorm_quorum_ratio)만큼
+          모였으면 남은 에이전트를 기다리지 않음
+        반환: (active_agents 순서의 아이디어 목록, 시간 내 응답하지 않은 역할 목록, 오류로 실패한 역할 목록)
+        """
+        agents = list(self.active_agents)
+        if not agents:
+            return [], [], []
+        
+        quorum = max(1, math.ceil(len(agents) * self.brainstorm_quorum_ratio))
+        started_at = {}
+        submitted_at = {}
+        
+        def run(position: int, agent):
+            started_at[position] = time.monotonic()
+            return self._generate_brainstorm_idea(agent, problem)
+        
+        queued = list(enumerate(agents))
+        futures = {}
+        pending = set()
+        ideas = {}
+        skipped = []
+        failed = []
+        quorum_deadline = time.monotonic() + self.brainstorm_quorum_deadline
+        
+        while queued or pending:
+            # 공유 풀을 한 브레인스토밍이 독차지하지 않도록 진행 중인 작업이 brainstorm_concurrency개 미만일 때만 제출
+            while queued and len(pending) < self.brainstorm_concurrency:
+                position, agent = queued.pop(0)
+                future = llm_executor.submit(run, position, agent)
+                futures[future] = position
+                submitted_at[position] = time.monotonic()
+                pending.add(future)
+            
+            now = time.monotonic()
+            
+            # 실행 시간이 에이전트별 제한을 넘긴 작업 제외 (스레드는 끝까지 돌지만 결과는 버림),
+            # 아직 시작하지 못한 작업은 제출 시점 기준으로 판단하고 취소
+            for future in list(pending):
+                position = futures[future]
+                began = started_at.get(position, submitted_at[position])
+                if now - began >= self.brainstorm_agent_timeout:
+                    if position not in started_at:
+                        future.cancel()
+                    pending.discard(future)
+                    skipped.append(position)
+                    print(f"⏱️ 브레인스토밍 시간 초과: {agents[position].role}")
+            if not pending:
+                continue
+            
+            if now >= quorum_deadline and len(ideas) >= quorum:
+                for future in pending:
+                    future.cancel()
+                    skipped.append(futures[future])
+                skipped.extend(position for position, _ in queued)
+                print(f"⏩ 정족수 {len(ideas)}/{len(agents)} 도달, 남은 아이디어 없이 종합 시작")
+                break
+            
+            # 다음으로 확인할 시점: 가장 이른 에이전트 제한 시각 또는 정족수 마감 (작업 시작 확인용으로 최대 0.5초)
+            deadlines = [started_at.get(futures[f], submitted_at[futures[f]]) + self.brainstorm_agent_timeout
+                         for f in pending]
+            if now < quorum_deadline:
+                deadlines.append(quorum_deadline)
+            timeout = min(min(deadlines, default=now + 0.5), now + 0.5) - now
+            
+            done, pending = wait(pending, timeout=max(timeout, 0.0), return_when=FIRST_COMPLETED)
+            for future in done:
+                position = futures[future]
+                try:
+                    ideas[position] = future.result()
+                except Exception as e:
+                    print(f"브레인스토밍 아이디어 생성 실패: {agents[position].role} - {str(e)}")
+                    failed.append(position)
+        
+        return ([ideas[i] for i in sorted(ideas)], [agents[i].role for i in sorted(skipped)],
+                [agents[i].role for i in sorted(failed)])
+    
     def brainstorm_solutions(self, problem: str):
         """특정 문제에 대한 브레인스토밍"""
         user_msg = ChatMessage(
@@ -808,44 +1045,9 @@ class ChatRoundtable:
         )
         self.chat_history.append(user_msg)
         
-        # 모든 활성 에이전트가 아이디어 제시
-        brainstorm_responses = []
-        
-        for agent in self.active_agents:
-            task = Task(
-                description=f"""
-                토론 주제: {self.current_topic}
-                브레인스토밍 문제: {problem}
-                
-                귀하의 전문 분야 관점에서 이 문제에 대한 창의적이고 실용적인 해결 아이디어를 제시해주세요.
-                
-                다음 형식으로 답변해주세요:
-                1. 핵심 아이디어 (1줄 요약)
-                2. 구체적 실행 방법
-                3. 예상 효과
-                4. 필요 자원
-                
-                짧고 명확하게 작성해주세요.
-                """,
-                expected_output="창의적 해결 아이디어 (한국어)",
-                agent=agent
-            )
-            
-            crew = Crew(
-                agents=[agent],
-                tasks=[task],
-                process=Process.sequential,
-                verbose=False
-            )
-            
-            result = crew.kickoff()
-            
-            response_msg = ChatMessage(
-                sender=agent.role,
-                content=str(result)
-            )
-            brainstorm_responses.append(response_msg)
-            self.chat_history.append(response_msg)
+        # 모든 활성 에이전트가 동시에 아이디어 제시
+        brainstorm_responses, skipped_roles, failed_roles = self._collect_brainstorm_ideas(problem)
+        self.chat_history.extend(brainstorm_responses)
         
         # 진행자가 아이디어들을 종합
         all_ideas = "\n\n".join([f"{msg.sender}: {msg.content}" for msg in brainstorm_responses])
@@ -874,11 +1076,16 @@ class ChatRoundtable:
             verbose=False
         )
         
-        synthesis_result = synthesis_crew.kickoff()
+        synthesis_result = self._kickoff(synthesis_crew)
         
+        content = f"🧠 브레인스토밍 종합 결과:\n\n{synthesis_result}"
+        if skipped_roles:
+            content += f"\n\n(시간 내 응답하지 않아 제외: {', '.join(skipped_roles)})"
+        if failed_roles:
+            content += f"\n\n(오류로 아이디어를 생성하지 못해 제외: {', '.join(failed_roles)})"
         synthesis_msg = ChatMessage(
             sender="토론 진행자",
-            content=f"🧠 브레인스토밍 종합 결과:\n\n{synthesis_result}",
+            content=content,
             message_type="conclusion"
         )
         self.chat_history.append(synthesis_msg)
@@ -927,7 +1134,7 @@ class ChatRoundtable:
             verbose=False
         )
         
-        result = crew.kickoff()
+        result = self._kickoff(crew)
         
         plan_msg = ChatMessage(
             sender="토론 진행자",
@@ -938,15 +1145,15 @@ class ChatRoundtable:
         
         return plan_msg
 
-    def get_conclusion(self):
-        """현재까지의 토론 내용을 바탕으로 중간 결론 도출"""
-        discussion_content = "\n".join([f"{msg.sender}: {msg.content}" for msg in self.chat_history])
+    def get_conclusion(self, bypass_cache: bool = False):
+        """현재까지의 토론 내용을 바탕으로 중간 결론 도출 (작업 내용이 같으면 응답 캐시 재사용, bypass_cache면 새로 생성)"""
+        discussion_content = self.get_discussion_context()
         
         task = Task(
             description=f"""
             토론 주제: {self.current_topic}
             
-            지금까지의 토론 내용:
+            지금까지의 토론 내용 (요약 + 최근 대화):
             {discussion_content}
             
             현재까지의 토론 내용을 바탕으로 중간 결론을 정리해주세요:
@@ -966,7 +1173,7 @@ class ChatRoundtable:
             verbose=False
         )
         
-        result = crew.kickoff()
+        result = self._kickoff(crew, bypass_cache=bypass_cache)
         
         conclusion_msg = ChatMessage(
             sender="토론 진행자",
@@ -989,10 +1196,91 @@ class ChatRoundtable:
             message_type="system"
         )
     
+    def cancel_current_turn(self, reason: str = "cancelled") -> bool:
+        """진행 중인 턴을 취소 (진행 중인 LLM 호출은 중단되고 늦게 온 결과는 버려짐)"""
+        self.discard_speculative_turn(reason)
+        token = self.current_turn_token
+        if token is None or token.cancelled:
+            return False
+        token.cancel(reason)
+        print(f"🛑 진행 중인 턴 취소 ({token.label}): {reason}")
+        return True
+    
+    def _history_fingerprint(self):
+        """발언 생성에 쓰이는 기록의 식별값 (메시지가 추가되거나 압축되면 바뀜)"""
+        last_id = self.chat_history[-1].message_id if self.chat_history else None
+        return (len(self.chat_history), self.archived_message_count, last_id)
+    
+    def _generate_turn_content(self, agent, token: CancellationToken) -> str:
+        """발언 내용만 생성 (블로킹, 미리 생성용 - 화면에 보낼 조각이 없으므로 스트리밍 콜백은 무시)"""
+        if self.stream_responses:
+            try:
+                result = stream_agent_response(agent, self._build_turn_prompt(agent), lambda delta: None,
+                                               max_tokens=self.turn_max_tokens, cancel_token=token)
+                content = self._clean_response(result["content"], truncate=False)
+                if content:
+                    return content
+            except TurnCancelled:
+                raise
+            except Exception as e:
+                token.raise_if_cancelled()
+                print(f"⚠️ 미리 생성 스트리밍 실패 ({agent.role}), CrewAI로 대체: {e}")
+        return self._generate_crewai_response(agent, token)
+    
+    def start_speculative_turn(self) -> bool:
+        """다음 대기 발언자의 발언을 현재 기록 기준으로 미리 생성 시작 (이벤트 루프에서 호출)"""
+        if not self.pipeline_turns or not self.auto_discussion_enabled or self.speculative_turn is not None:
+            return False
+        if not self.next_speaker_queue:
+            self._initialize_speaker_queue()
+        if not self.next_speaker_queue:
+            return False
+        
+        speaker = self.next_speaker_queue[0]
+        token = CancellationToken(f"speculative:{speaker.role}")
+        task = asyncio.ensure_future(llm_executor.run(self._generate_turn_content, speaker, token))
+        # 폐기되어 아무도 기다리지 않는 경우에도 예외(TurnCancelled)는 회수
+        task.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.speculative_turn = {
+            "speaker": speaker,
+            "fingerprint": self._history_fingerprint(),
+            "token": token,
+            "task": task
+        }
+        self.speculation_stats["started"] += 1
+        print(f"🔮 다음 발언 미리 생성 시작: {speaker.role}")
+        return True
+    
+    def discard_speculative_turn(self, reason: str = "discarded") -> bool:
+        """미리 생성 중인 발언 폐기 (진행 중인 LLM 호출도 취소)"""
+        speculative = self.speculative_turn
+        if speculative is None:
+            return False
+        self.speculative_turn = None
+        speculative["token"].cancel(reason)
+        self.speculation_stats["discarded"] += 1
+        print(f"🗑️ 미리 생성한 발언 폐기 ({speculative['speaker'].role}): {reason}")
+        return True
+    
+    def _take_speculative_turn(self, speaker) -> Optional[Dict]:
+        """이번 발언자와 기록이 예측과 같으면 미리 생성한 발언을 넘겨받음 (다르면 폐기)"""
+        speculative = self.speculative_turn
+        if speculative is None:
+            return None
+        if speculative["speaker"] is not speaker:
+            self.discard_speculative_turn("speaker changed")
+            return None
+        if speculative["token"].cancelled or speculative["fingerprint"] != self._history_fingerprint():
+            self.discard_speculative_turn("history changed")
+            return None
+        self.speculative_turn = None
+        return speculative
+    
     def pause_auto_discussion(self):
         """자동 토론 일시정지"""
         self.auto_discussion_enabled = False
         self.discussion_state = "paused"
+        self.cancel_current_turn("paused")
         
         return ChatMessage(
             sender="시스템",
@@ -1082,8 +1370,13 @@ class ChatRoundtable:
                 "status": "대기"
             }
     
-    async def generate_auto_response_async(self, callback=None):
-        """비동기적으로 자동 응답 생성 - 실시간 스트리밍 지원"""
+    async def generate_auto_response_async(self, callback=None, cancel_token: CancellationToken = None):
+        """비동기적으로 자동 응답 생성 - 실시간 스트리밍 지원
+        
+        턴마다 취소 토큰을 두고, 취소되면(이 코루틴이 취소된 경우 포함) 진행 중인 LLM 호출을 멈추고
+        결과가 늦게 도착해도 chat_history에 넣거나 전송하지 않습니다.
+        start_speculative_turn()으로 미리 생성해 둔 발언이 그대로 유효하면 그것을 사용합니다.
+        """
         if not self.auto_discussion_enabled:
             print("❌ 자동 토론이 비활성화됨")
             return None
@@ -1097,36 +1390,190 @@ class ChatRoundtable:
         
         print(f"🎤 다음 발언자: {next_speaker.role}")
         
+        speculative = self._take_speculative_turn(next_speaker)
+        if speculative is not None:
+            token = speculative["token"]
+            if cancel_token is not None:
+                cancel_token.on_cancel(lambda: token.cancel(cancel_token.reason))
+        else:
+            token = cancel_token or CancellationToken(f"turn:{next_speaker.role}")
+        self.current_turn_token = token
+        
         # 즉시 타이핑 시작 알림
         if callback:
             await callback("typing_start", {"speaker": next_speaker.role})
         
         try:
-            # CrewAI 에이전트를 사용한 실제 AI 응답 생성
-            response_content = self._generate_crewai_response(next_speaker)
+            message_id = new_message_id(next_speaker.role)
+            ttft_s = None
+            response_content = None
+            
+            if speculative is not None:
+                # 미리 생성한 발언 사용 (아직 생성 중이면 끝날 때까지만 대기)
+                try:
+                    response_content = await speculative["task"]
+                    self.speculation_stats["used"] += 1
+                    print(f"🔮 미리 생성한 발언 사용: {next_speaker.role}")
+                except TurnCancelled:
+                    raise
+                except Exception as e:
+                    token.raise_if_cancelled()
+                    print(f"⚠️ 미리 생성 실패 ({next_speaker.role}), 다시 생성: {e}")
+            
+            if not response_content and self.stream_responses and callback:
+                try:
+                    result = await self._stream_turn(next_speaker, message_id, callback, token)
+                    response_content = self._clean_response(result["content"], truncate=False)
+                    ttft_s = result["ttft_s"]
+                except TurnCancelled:
+                    raise
+                except Exception as e:
+                    if token.cancelled:
+                        raise TurnCancelled(token.reason)
+                    print(f"⚠️ 스트리밍 응답 실패 ({next_speaker.role}), CrewAI로 대체: {e}")
+            
+            if not response_content:
+                # CrewAI 에이전트를 사용한 실제 AI 응답 생성
+                # 블로킹 kickoff()는 LLM 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않음
+                response_content = await llm_executor.run(self._generate_crewai_response, next_speaker, token)
+            
+            # 기다리는 동안 취소됐으면 결과를 버림
+            token.raise_if_cancelled()
             
             response_msg = ChatMessage(
                 sender=next_speaker.role,
-                content=response_content
+                content=response_content,
+                message_id=message_id
             )
+            if ttft_s is not None:
+                response_msg.ttft_ms = round(ttft_s * 1000, 1)
             
             self.chat_history.append(response_msg)
             self.discussion_rounds += 1
+            self._compact_chat_history()
+            self._schedule_summary_update()
             
             print(f"✅ 응답 생성 완료: {next_speaker.role}")
             
             if callback:
                 await callback("typing_stop", {})
-                await callback("message", response_msg)
+                # 스트리밍 중 보낸 조각은 최종 내용(후처리 포함)으로 교체됨
+                await callback("message_complete", response_msg)
             
             return response_msg
-                
+        
+        except asyncio.CancelledError:
+            # wait_for 타임아웃이나 태스크 취소: 스레드에서 돌고 있는 호출도 멈추도록 토큰 취소
+            token.cancel("task cancelled")
+            self.cancelled_turns += 1
+            raise
+        except TurnCancelled:
+            self.cancelled_turns += 1
+            print(f"🗑️ 취소된 턴의 결과 폐기 ({next_speaker.role}): {token.reason}")
+            if callback:
+                await callback("typing_stop", {})
+            return None
         except Exception as e:
             print(f"자동 응답 생성 오류: {e}")
             if callback:
                 await callback("typing_stop", {})
             return None
+        finally:
+            if self.current_turn_token is token:
+                self.current_turn_token = None
     
+    async def _stream_turn(self, agent, message_id: str, callback, token: CancellationToken) -> Dict:
+        """발언을 스트리밍으로 생성하면서 도착한 토큰을 message_delta로 전달
+        
+        생성은 LLM 실행 풀 스레드에서 돌고, 토큰은 이벤트 루프 큐로 넘겨받아
+        그 사이 쌓인 조각을 한 번에 묶어 보냅니다.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        def on_token(delta: str):
+            loop.call_soon_threadsafe(queue.put_nowait, delta)
+        
+        generation = asyncio.ensure_future(
+            llm_executor.run(stream_agent_response, agent, self._build_turn_prompt(agent), on_token,
+                             max_tokens=self.turn_max_tokens, cancel_token=token)
+        )
+        # 턴이 먼저 취소되어 아무도 기다리지 않게 되어도 스레드 쪽 예외(TurnCancelled)는 회수
+        generation.add_done_callback(lambda f: f.cancelled() or f.exception())
+        
+        first = True
+        while True:
+            next_delta = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({next_delta, generation}, return_when=asyncio.FIRST_COMPLETED)
+            if next_delta not in done:
+                next_delta.cancel()
+                break
+            
+            parts = [next_delta.result()]
+            while not queue.empty():
+                parts.append(queue.get_nowait())
+            if token.cancelled:
+                continue
+            if first:
+                await callback("typing_stop", {})
+                first = False
+            await callback("message_delta", {"id": message_id, "sender": agent.role, "delta": "".join(parts)})
+        
+        # 생성 완료 직전에 들어온 조각까지 전달
+        if not queue.empty() and not token.cancelled:
+            parts = []
+            while not queue.empty():
+                parts.append(queue.get_nowait())
+            await callback("message_delta", {"id": message_id, "sender": agent.role, "delta": "".join(parts)})
+        
+        return generation.result()
+    
+    def _compact_chat_history(self):
+        """채팅 기록이 상한을 넘으면 오래된 구간을 LLM 없이 추출 요약으로 대체"""
+        from summarizer import extractive_summary, format_summary
+        
+        while len(self.chat_history) > self.history_limit:
+            window = self.chat_history[:self.history_summary_window]
+            selected = extractive_summary([
+                {"sender": msg.sender, "content": msg.content, "sentences": getattr(msg, "sentences", None)}
+                for msg in window
+            ])
+            period = f"{window[0].timestamp.strftime('%H:%M')} ~ {window[-1].timestamp.strftime('%H:%M')}"
+            covered = sum(getattr(msg, "covered_count", 1) for msg in window)
+            summary_msg = ChatMessage(
+                sender="요약",
+                content=format_summary(selected, covered, period),
+                timestamp=window[-1].timestamp,
+                message_type="summary"
+            )
+            summary_msg.covered_count = covered
+            summary_msg.sentences = selected
+            
+            self.chat_history = [summary_msg] + self.chat_history[self.history_summary_window:]
+            self.archived_message_count += len([m for m in window if m.message_type != "summary"])
+            print(f"🗜️ 채팅 기록 압축: {len(window)}개 메시지 → 요약 1개")
+    
+    def _schedule_summary_update(self):
+        """새 메시지가 충분히 쌓였으면 누적 요약 갱신을 LLM 실행 풀에 맡김 (한 번에 하나만)"""
+        if self._summary_future is not None and not self._summary_future.done():
+            return
+        if self.running_summary.pending_count(self.chat_history) < self.running_summary.update_interval:
+            return
+        self._summary_future = llm_executor.submit(self.running_summary.update, list(self.chat_history))
+    
+    def get_discussion_context(self, token_budget: int = None) -> str:
+        """결론/심화 질문용 토론 컨텍스트: 누적 요약 + 최근 대화 (토큰 예산 이내)
+        
+        요약에 아직 반영되지 않은 메시지(최대 update_interval개 남짓)만 여기서 반영하므로 비용은 새 메시지 수에 비례합니다.
+        """
+        self.running_summary.update(self.chat_history, force=True)
+        return self.running_summary.build_context(self.chat_history, token_budget or self.context_token_budget)
+    
+    def get_total_message_count(self) -> int:
+        """요약으로 압축된 메시지를 포함한 전체 메시지 수"""
+        live = len([m for m in self.chat_history if m.message_type != "summary"])
+        return live + self.archived_message_count
+
     def _get_quick_responses(self, speaker):
         """발언자별 빠른 응답 템플릿"""
         responses = {
@@ -1290,10 +1737,8 @@ class ChatRoundtable:
         
         return base_response
     
-    def _generate_crewai_response(self, agent):
-        """CrewAI 에이전트를 사용하여 실제 AI 응답 생성"""
-        from crewai import Task, Crew
-        
+    def _build_turn_prompt(self, agent) -> str:
+        """자동 토론 발언 프롬프트 (최근 대화와 회사 정보 포함)"""
         # 현재 토론 상황 컨텍스트 구성
         topic = getattr(self, 'current_topic', '새로운 프로젝트')
         
@@ -1318,7 +1763,7 @@ class ChatRoundtable:
         
         # 간단하고 명확한 프롬프트로 수정
         task_description = f"""
-{agent.role}의 전문성을 바탕으로 다음 주제에 대한 의견을 2-3문장으로 간단히 제시하세요:
+{agent.role}의 전문성을 바탕으로 다음 주제에 대한 의견을 2-3문장({self.turn_max_chars}자 이내)으로 간단히 제시하세요:
 
 주제: {topic}
 {company_context}
@@ -1327,23 +1772,40 @@ class ChatRoundtable:
 
 {agent.role}의 관점에서 구체적이고 실무적인 의견을 제시해주세요.
 """
+        return task_description
+    
+    def _clean_response(self, response: str, truncate: bool = True) -> str:
+        """LLM 응답 후처리 ("Final Answer:" 제거, truncate면 turn_max_chars 초과 시 3문장으로 자름)
+
+        스트리밍한 응답은 사용자가 이미 읽은 내용이 message_complete에서 사라지지 않도록 truncate=False
+        """
+        # "Final Answer:" 부분 제거
+        if "Final Answer:" in response:
+            response = response.split("Final Answer:")[-1].strip()
+        
+        # 너무 긴 응답은 자르기
+        if truncate and len(response) > self.turn_max_chars:
+            sentences = response.split('.')
+            response = '. '.join(sentences[:3]) + '.'
+        
+        return response.strip()
+    
+    def _generate_crewai_response(self, agent, cancel_token: CancellationToken = None):
+        """스트리밍 없이 자동 토론 발언 생성 (직접 호출, 실패 시 CrewAI)
+        
+        cancel_token이 취소되면 직접 호출은 HTTP 연결을 닫고, CrewAI는 다음 단계에서 중단하며
+        TurnCancelled를 발생시킵니다.
+        """
+        task_description = self._build_turn_prompt(agent)
 
         try:
-            # Task 생성
-            task = Task(
-                description=task_description,
-                agent=agent,
-                expected_output="전문가 관점의 간결한 의견 (2-3문장)"
-            )
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
             
-            # Crew를 통해 실행
-            crew = Crew(
-                agents=[agent],
-                tasks=[task],
-                verbose=False
-            )
-            
-            result = crew.kickoff()
+            result = self._run_agent_task(agent, task_description, "전문가 관점의 간결한 의견 (2-3문장)",
+                                          cancel_token, research_query=self.current_topic)
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
             
             # 결과 처리
             if hasattr(result, 'raw'):
@@ -1353,22 +1815,18 @@ class ChatRoundtable:
             else:
                 response = str(result)
             
-            # "Final Answer:" 부분 제거
-            if "Final Answer:" in response:
-                response = response.split("Final Answer:")[-1].strip()
-            
-            # 너무 긴 응답은 자르기
-            if len(response) > 300:
-                sentences = response.split('.')
-                response = '. '.join(sentences[:3]) + '.'
-            
-            response = response.strip()
+            response = self._clean_response(response)
             if not response:
                 raise ValueError("빈 응답")
                 
             return response
                 
+        except LLMCacheMiss:
+            # replay 모드에서 녹화되지 않은 요청은 템플릿 응답으로 가리지 않고 실패로 드러냄
+            raise
         except Exception as e:
+            if cancel_token is not None and cancel_token.cancelled:
+                raise TurnCancelled(cancel_token.reason)
             print(f"⚠️ CrewAI 응답 생성 실패 ({agent.role}): {e}")
             # 폴백으로 기존 템플릿 응답 사용
             return self._generate_role_specific_response(agent)
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""외부 제공자(LLM, 검색 API) 회로 차단기
+
+SerpAPI가 401/403/429를 돌려주거나 DuckDuckGo가 시간 초과되어도 매 호출마다 다시 시도해 그때마다
+시간 제한만큼 기다렸습니다. 제공자마다 최근 호출 결과를 보고 실패율이 높으면 회로를 열어 한동안
+호출하지 않고 바로 실패로 돌려줍니다 (검색은 다음 제공자로, LLM 직접 호출은 대체 경로로 즉시 넘어감).
+
+상태:
+  closed    : 정상 호출, 최근 window번 중 min_calls번 이상 호출했고 실패율이 failure_rate 이상이면 open
+  open      : 호출하지 않고 거절, open_seconds가 지나면 half_open
+  half_open : 시험 호출 하나만 허용, 성공하면 closed(기록 초기화) / 실패하면 다시 open
+              (연속으로 실패할수록 open 시간을 두 배씩, max_open_seconds까지 늘림)
+
+환경 변수 (모든 제공자 공통 기본값):
+  CIRCUIT_FAILURE_RATE     : 회로를 여는 실패율 (기본 0.5)
+  CIRCUIT_WINDOW           : 실패율을 계산할 최근 호출 수 (기본 20)
+  CIRCUIT_MIN_CALLS        : 실패율을 판단하기 위한 최소 호출 수 (기본 5)
+  CIRCUIT_OPEN_SECONDS     : 처음 연 뒤 시험 호출까지 대기(초, 기본 30)
+  CIRCUIT_MAX_OPEN_SECONDS : 시험 호출 실패가 이어질 때 최대 대기(초, 기본 600)
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+STATES = ("closed", "open", "half_open")
+
+
+class CircuitOpenError(RuntimeError):
+    """회로가 열려 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """제공자 하나의 회로 차단기 (스레드 안전)"""
+
+    def __init__(self, name: str, failure_rate: float = 0.5, window: int = 20, min_calls: int = 5,
+                 open_seconds: float = 30.0, max_open_seconds: float = 600.0):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # True = 성공
+        self._state = "closed"
+        self._opened_at: Optional[float] = None
+        self._current_open_seconds = open_seconds
+        self._probe_in_flight = False
+        self.last_failure: Optional[str] = None
+        self.last_failure_at: Optional[float] = None
+        self.opened = 0
+        self.rejected = 0
+        self.successes = 0
+        self.failures = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """호출해도 되는지 (open이면 거절, 대기가 끝났으면 half_open으로 바꾸고 시험 호출 하나 허용)"""
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self._current_open_seconds:
+                self._state = "half_open"
+                self._probe_in_flight = False
+            if self._state == "closed":
+                return True
+            if self._state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in_s(self) -> float:
+        """다음 시험 호출까지 남은 시간(초, 열려 있지 않으면 0)"""
+        with self._lock:
+            if self._state != "open":
+                return 0.0
+            return max(0.0, self._current_open_seconds - (time.monotonic() - self._opened_at))
+
+    def _open(self):
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.opened += 1
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            if self._state == "half_open":
+                self._state = "closed"
+                self._outcomes.clear()
+                self._current_open_seconds = self.open_seconds
+                self._probe_in_flight = False
+            self._outcomes.append(True)
+
+    def record_failure(self, reason: str = ""):
+        with self._lock:
+            self.failures += 1
+            self.last_failure = reason[:200] if reason else None
+            self.last_failure_at = time.time()
+            if self._state == "half_open":
+                self._current_open_seconds = min(self._current_open_seconds * 2, self.max_open_seconds)
+                self._open()
+                return
+            if self._state == "open":
+                return  # 열리기 전에 시작한 호출이 늦게 실패한 경우
+            self._outcomes.append(False)
+            calls = len(self._outcomes)
+            failed = calls - sum(self._outcomes)
+            if calls >= self.min_calls and failed / calls >= self.failure_rate:
+                self._open()
+
+    def release(self):
+        """결과를 알 수 없는 호출(취소됨)이 끝남: 시험 호출이었으면 다음 호출이 다시 시험하도록 자리만 비움"""
+        with self._lock:
+            if self._state == "half_open":
+                self._probe_in_flight = False
+
+    def reset(self):
+        with self._lock:
+            self._state = "closed"
+            self._outcomes.clear()
+            self._current_open_seconds = self.open_seconds
+            self._probe_in_flight = False
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            calls = len(self._outcomes)
+            retry_in = 0.0
+            if self._state == "open":
+                retry_in = max(0.0, self._current_open_seconds - (time.monotonic() - self._opened_at))
+            return {
+                "state": self._state,
+                "window_calls": calls,
+                "window_failure_rate": round((calls - sum(self._outcomes)) / calls, 4) if calls else 0.0,
+                "retry_in_s": round(retry_in, 1),
+                "open_seconds": self._current_open_seconds,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "successes": self.successes,
+                "failures": self.failures,
+                "last_failure": self.last_failure,
+                "last_failure_at": self.last_failure_at,
+            }
+
+
+class CircuitBreakerRegistry:
+    """제공자 이름별 회로 차단기 (처음 쓸 때 환경 변수 기본값으로 생성)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(
+                    name,
+                    failure_rate=float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5")),
+                    window=int(os.getenv("CIRCUIT_WINDOW", "20")),
+                    min_calls=int(os.getenv("CIRCUIT_MIN_CALLS", "5")),
+                    open_seconds=float(os.getenv("CIRCUIT_OPEN_SECONDS", "30")),
+                    max_open_seconds=float(os.getenv("CIRCUIT_MAX_OPEN_SECONDS", "600")),
+                )
+            return breaker
+
+    def all(self) -> Dict[str, CircuitBreaker]:
+        with self._lock:
+            return dict(self._breakers)
+
+    def reset(self, name: Optional[str] = None):
+        for breaker_name, breaker in self.all().items():
+            if name is None or breaker_name == name:
+                breaker.reset()
+
+    def get_stats(self) -> Dict:
+        return {name: breaker.get_stats() for name, breaker in sorted(self.all().items())}
+
+
+# 전역 인스턴스
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,281 @@
+"""CrewAI를 거치지 않는 OpenAI 직접 호출
+
+자동 토론 발언처럼 도구 호출이 필요 없는 짧은 응답은 에이전트 페르소나(role/goal/backstory)를
+시스템 프롬프트로 만들어 chat.completions를 stream=True로 직접 호출하고, 토큰이 올 때마다
+콜백으로 넘깁니다. 첫 토큰까지 걸린 시간(TTFT)은 streaming_stats에 기록됩니다.
+같은 페르소나/프롬프트의 완성된 응답은 llm_cache에 저장되어 한 번에 재생됩니다.
+
+complete_agent_task는 에이전트 하나 + 작업 하나짜리 Crew(kickoff) 대신 작업 설명과 기대 결과를
+채팅 완성 한 번으로 보냅니다 (CrewAI의 ReAct 프롬프트/도구 루프로 인한 추가 왕복이 없음).
+
+LLM 호출이 연달아 실패하면 "llm" 회로 차단기가 열려 한동안 호출하지 않고 CircuitOpenError를 냅니다
+(호출 측은 기다리지 않고 바로 CrewAI 경로로 대체).
+
+LLM_BASE_URL을 지정하면 OpenAI 대신 그 주소의 OpenAI 호환 서버(예: benchmarks.stub_llm_server)로
+보냅니다. 이 경우 OPENAI_API_KEY가 없어도 임시 키로 호출합니다.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from circuit_breaker import CircuitOpenError, circuit_breakers
+from http_clients import lease_openai_client
+from llm_cache import cache_model_name, llm_cache, make_cache_key
+from metrics import llm_ttft_seconds, observe_llm_call, percentile
+from running_summary import count_tokens
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+def get_openai_settings() -> Dict:
+    """OpenAI 클라이언트/CrewAI LLM 공통 설정 {"api_key", "base_url"} (호출 시점의 환경 변수 기준)"""
+    base_url = os.getenv("LLM_BASE_URL") or None
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key and base_url:
+        api_key = "local-stub"  # 로컬 호환 서버는 키를 검사하지 않음
+    return {"api_key": api_key, "base_url": base_url}
+
+
+class StreamingStats:
+    """스트리밍 응답의 TTFT/전체 시간/청크 수 기록"""
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self.ttft = deque(maxlen=window)
+        self.durations = deque(maxlen=window)
+        self.streams = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.chunks = 0
+
+    def record(self, ttft_s: Optional[float], duration_s: float, chunks: int):
+        with self._lock:
+            self.streams += 1
+            self.chunks += chunks
+            if ttft_s is not None:
+                self.ttft.append(ttft_s)
+            self.durations.append(duration_s)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def record_cancelled(self):
+        with self._lock:
+            self.cancelled += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            ttft = list(self.ttft)
+            durations = list(self.durations)
+            return {
+                "streams": self.streams,
+                "failures": self.failures,
+                "cancelled": self.cancelled,
+                "chunks": self.chunks,
+                "ttft_p50_ms": round(percentile(ttft, 50) * 1000, 1) if ttft else None,
+                "ttft_p99_ms": round(percentile(ttft, 99) * 1000, 1) if ttft else None,
+                "duration_p50_ms": round(percentile(durations, 50) * 1000, 1) if durations else None
+            }
+
+
+streaming_stats = StreamingStats()
+
+
+def build_persona_prompt(agent) -> str:
+    """CrewAI Agent의 페르소나를 시스템 프롬프트로 변환"""
+    return (
+        f"당신은 {agent.role}입니다.\n"
+        f"목표: {agent.goal}\n"
+        f"배경: {agent.backstory}\n"
+        "항상 한국어로, 채팅 메시지처럼 자연스럽게 답하세요."
+    )
+
+
+def _acquire_llm_circuit():
+    """LLM 회로 차단기 확인 (열려 있으면 HTTP 요청 없이 바로 CircuitOpenError)"""
+    breaker = circuit_breakers.get("llm")
+    if not breaker.allow():
+        raise CircuitOpenError(f"LLM 회로가 열려 있습니다 ({breaker.retry_in_s():.0f}초 후 다시 시도, "
+                               f"마지막 오류: {breaker.last_failure})")
+    return breaker
+
+
+def _is_provider_failure(error: Exception) -> bool:
+    """회로 차단기에 실패로 셀 오류인지 (429, 5xx, 시간 초과, 연결 오류)
+
+    컨텍스트 길이 초과나 잘못된 요청(400) 같은 요청별 오류는 제공자 상태와 무관하므로 세지 않음
+    """
+    import httpx
+    import openai
+
+    # APITimeoutError는 APIConnectionError의 하위, 스트림을 읽는 도중의 오류는 httpx 예외 그대로 올라옴
+    if isinstance(error, (openai.APIConnectionError, openai.RateLimitError, httpx.TransportError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def stream_agent_response(agent, prompt: str, on_token: Callable[[str], None],
+                          model: str = DEFAULT_MODEL, max_tokens: int = 400, cancel_token=None,
+                          bypass_cache: bool = False) -> Dict:
+    """에이전트 응답을 스트리밍으로 생성 (블로킹, LLM 실행 풀에서 호출)
+
+    on_token: 새 텍스트 조각마다 호출
+    cancel_token: 취소되면 스트림(HTTP 응답)을 바로 닫고 TurnCancelled 발생
+    반환: {"content": 전체 텍스트, "ttft_s": 첫 토큰까지 시간, "duration_s": 전체 시간, "cached": bool}
+    """
+    started = time.perf_counter()
+    settings = get_openai_settings()
+    cache_key = make_cache_key(cache_model_name(model, settings["base_url"]), agent.role, agent.goal, agent.backstory, prompt, "stream")
+    cached = llm_cache.lookup(cache_key, bypass_cache)
+    if cached is not None:
+        on_token(cached)
+        elapsed = time.perf_counter() - started
+        observe_llm_call("stream", agent.role, "cached", elapsed)
+        return {"content": cached, "ttft_s": elapsed, "duration_s": elapsed, "cached": True}
+
+    if not settings["api_key"]:
+        raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
+
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+    ttft = None
+    chunks = 0
+    parts = []
+    usage = None
+    system_prompt = build_persona_prompt(agent)
+    breaker = _acquire_llm_circuit()
+
+    # 풀에서 keep-alive 연결을 가진 클라이언트를 빌려 씀 (취소되면 그 클라이언트를 닫아 응답을 끊음)
+    with lease_openai_client(settings, cancel_token) as client:
+        try:
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=0.7,
+                stream=True,
+                # 마지막 청크(choices 없음)에 토큰 사용량을 받음
+                stream_options={"include_usage": True}
+            )
+            if cancel_token is not None:
+                cancel_token.on_cancel(stream.close)
+            for chunk in stream:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                chunks += 1
+                parts.append(delta)
+                on_token(delta)
+        except Exception as e:
+            if cancel_token is not None and cancel_token.cancelled:
+                breaker.release()
+                streaming_stats.record_cancelled()
+                observe_llm_call("stream", agent.role, "cancelled", time.perf_counter() - started)
+                cancel_token.raise_if_cancelled()
+            if _is_provider_failure(e):
+                breaker.record_failure(str(e))
+            else:
+                breaker.release()
+            streaming_stats.record_failure()
+            observe_llm_call("stream", agent.role, "error", time.perf_counter() - started)
+            raise
+
+    breaker.record_success()
+    duration = time.perf_counter() - started
+    streaming_stats.record(ttft, duration, chunks)
+    content = "".join(parts)
+    if ttft is not None:
+        llm_ttft_seconds.observe(ttft, agent=agent.role)
+    if usage is not None:
+        prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+    else:
+        prompt_tokens, completion_tokens = count_tokens(system_prompt) + count_tokens(prompt), count_tokens(content)
+    observe_llm_call("stream", agent.role, "ok", duration, prompt_tokens, completion_tokens)
+    if content:
+        llm_cache.put(cache_key, content, {"agent": agent.role})
+    return {"content": content, "ttft_s": ttft, "duration_s": duration, "cached": False}
+
+
+def complete_agent_task(agent, description: str, expected_output: str, research: Optional[str] = None,
+                        model: str = DEFAULT_MODEL, max_tokens: int = 600, cancel_token=None,
+                        bypass_cache: bool = False) -> Dict:
+    """단일 에이전트 작업을 채팅 완성 한 번으로 실행 (블로킹, LLM 실행 풀에서 호출)
+
+    research: 미리 조사한 자료 (있으면 프롬프트에 참고 자료로 붙임)
+    반환: {"content", "duration_s", "prompt_tokens", "completion_tokens", "cached"}
+    """
+    started = time.perf_counter()
+    settings = get_openai_settings()
+    user_prompt = description.strip()
+    if research:
+        user_prompt += f"\n\n[참고 자료]\n{research}"
+    user_prompt += f"\n\n기대하는 답변: {expected_output}"
+
+    # Crew 경로와 프롬프트 형식이 달라 캐시 키를 구분
+    cache_key = make_cache_key(cache_model_name(model, settings["base_url"]), agent.role, agent.goal,
+                               agent.backstory, user_prompt, "direct")
+    cached = llm_cache.lookup(cache_key, bypass_cache)
+    if cached is not None:
+        elapsed = time.perf_counter() - started
+        observe_llm_call("direct", agent.role, "cached", elapsed)
+        return {"content": cached, "duration_s": elapsed, "prompt_tokens": 0, "completion_tokens": 0,
+                "cached": True}
+
+    if not settings["api_key"]:
+        raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+    system_prompt = build_persona_prompt(agent)
+    breaker = _acquire_llm_circuit()
+    # 취소되면 빌린 클라이언트의 HTTP 연결을 닫아 기다리던 응답을 바로 끊음
+    with lease_openai_client(settings, cancel_token) as client:
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=0.7
+            )
+        except Exception as e:
+            outcome = "cancelled" if cancel_token is not None and cancel_token.cancelled else "error"
+            if outcome == "error" and _is_provider_failure(e):
+                breaker.record_failure(str(e))
+            else:
+                breaker.release()
+            observe_llm_call("direct", agent.role, outcome, time.perf_counter() - started)
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            raise
+
+    breaker.record_success()
+    duration = time.perf_counter() - started
+    content = (response.choices[0].message.content or "").strip() if response.choices else ""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+    else:
+        prompt_tokens, completion_tokens = count_tokens(system_prompt) + count_tokens(user_prompt), count_tokens(content)
+    observe_llm_call("direct", agent.role, "ok", duration, prompt_tokens, completion_tokens)
+    if content:
+        llm_cache.put(cache_key, content, {"agent": agent.role})
+    return {"content": content, "duration_s": duration, "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens, "cached": False}
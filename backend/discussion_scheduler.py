@@ -0,0 +1,257 @@
+"""자동 토론 스케줄러
+
+0.5초마다 상태 플래그를 확인하던 폴링 루프 대신 asyncio 이벤트로 진행을 제어합니다.
+  - 토론마다 태스크 하나를 두고, 일시정지/사용자 개입/클라이언트 없음 상태에서는 이벤트를 기다리며 멈춰 있어
+    유휴 토론은 CPU를 쓰지 않습니다.
+  - pause()/stop()은 발언 사이 대기와 진행 중인 턴을 즉시 중단시킵니다.
+  - 발언 간격은 페이싱 정책으로 정합니다 (DISCUSSION_PACING 환경 변수, 기본 "fixed"):
+      fixed    : 고정 간격 (기본 5초)
+      adaptive : 직전 발언을 읽는 데 걸리는 시간에 맞춤
+      none     : 대기 없음 (벤치마크용)
+"""
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class PacingPolicy:
+    """발언 사이 대기 시간(초)을 정하는 정책"""
+    name = "base"
+
+    def delay(self, last_message) -> float:
+        raise NotImplementedError
+
+    def describe(self) -> Dict:
+        return {"name": self.name}
+
+
+class FixedPacing(PacingPolicy):
+    name = "fixed"
+
+    def __init__(self, seconds: float = 5.0):
+        self.seconds = seconds
+
+    def delay(self, last_message) -> float:
+        return self.seconds
+
+    def describe(self) -> Dict:
+        return {"name": self.name, "seconds": self.seconds}
+
+
+class ReadingTimePacing(PacingPolicy):
+    """직전 발언 길이로 읽는 시간을 추정 (공백/문장부호 포함 초당 글자 수 기준)"""
+    name = "adaptive"
+
+    def __init__(self, chars_per_second: float = 12.0, min_delay: float = 2.0, max_delay: float = 15.0):
+        self.chars_per_second = chars_per_second
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+    def delay(self, last_message) -> float:
+        if last_message is None:
+            return self.min_delay
+        reading = len(last_message.content) / self.chars_per_second
+        return min(self.max_delay, max(self.min_delay, reading))
+
+    def describe(self) -> Dict:
+        return {"name": self.name, "chars_per_second": self.chars_per_second,
+                "min_delay": self.min_delay, "max_delay": self.max_delay}
+
+
+class NoDelayPacing(PacingPolicy):
+    """대기 없이 바로 다음 발언 생성 (벤치마크/부하 테스트용)"""
+    name = "none"
+
+    def delay(self, last_message) -> float:
+        return 0.0
+
+
+PACING_POLICIES = {
+    "fixed": FixedPacing,
+    "adaptive": ReadingTimePacing,
+    "none": NoDelayPacing,
+}
+
+
+def make_pacing(name: Optional[str] = None) -> PacingPolicy:
+    """이름으로 페이싱 정책 생성 (미지정 시 DISCUSSION_PACING 환경 변수, 기본 fixed)"""
+    name = name or os.getenv("DISCUSSION_PACING", "fixed")
+    if name not in PACING_POLICIES:
+        raise ValueError(f"지원하지 않는 페이싱 정책: {name} (가능: {', '.join(PACING_POLICIES)})")
+    return PACING_POLICIES[name]()
+
+
+class DiscussionScheduler:
+    """토론 하나의 자동 발언 진행을 담당하는 태스크
+
+    chat_system: ChatRoundtable (generate_auto_response_async로 턴 생성)
+    callback: 턴 이벤트(typing_start, message_delta, message_complete 등)를 받는 async 함수
+    clients_connected: 연결된 클라이언트가 있을 때 set되는 이벤트 (없으면 생길 때까지 대기)
+    """
+
+    def __init__(self, chat_system, callback: Callable[[str, object], Awaitable[None]],
+                 pacing: Optional[PacingPolicy] = None, clients_connected: Optional[asyncio.Event] = None,
+                 turn_timeout: float = 30.0):
+        self.chat_system = chat_system
+        self.callback = callback
+        self.pacing = pacing or make_pacing()
+        self.clients_connected = clients_connected
+        self.turn_timeout = turn_timeout
+
+        self.state = "idle"  # idle, running, paused, stopped
+        self.pause_reason: Optional[str] = None
+        self.last_message = None
+        self._running = asyncio.Event()
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.turns = 0
+        self.timeouts = 0
+        self.interrupted_turns = 0
+        self.started_at: Optional[float] = None
+
+    # ---- 제어 ----
+
+    def start(self):
+        """태스크를 만들고(없으면) 진행 시작"""
+        if self.state == "stopped":
+            return
+        if self._task is None or self._task.done():
+            self.started_at = time.time()
+            self._task = asyncio.create_task(self._run())
+        self.resume()
+
+    def pause(self, reason: str = "paused"):
+        """즉시 일시정지 (대기 중이면 대기를, 턴 생성 중이면 그 턴을 중단)"""
+        if self.state == "stopped":
+            return
+        self.pause_reason = reason
+        if self.state == "paused":
+            return
+        self.state = "paused"
+        self._running.clear()
+        self._changed.set()
+
+    def resume(self):
+        """진행 재개 (이미 진행 중이면 아무것도 하지 않음: _changed를 알리면 진행 중인 턴이 중단됨)"""
+        if self.state in ("stopped", "running"):
+            return
+        self.state = "running"
+        self.pause_reason = None
+        self._running.set()
+        self._changed.set()
+
+    async def stop(self, timeout: float = 2.0):
+        """진행을 끝내고 태스크가 종료될 때까지 대기 (timeout 초과 시 강제 취소)"""
+        self.state = "stopped"
+        self._running.set()
+        self._changed.set()
+        task = self._task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+        except asyncio.TimeoutError:
+            task.cancel()
+        except Exception as e:
+            print(f"토론 스케줄러 종료 중 오류: {e}")
+
+    @property
+    def is_active(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ---- 진행 ----
+
+    async def _race(self, aw: Awaitable, timeout: Optional[float] = None) -> Optional[asyncio.Future]:
+        """aw가 먼저 끝나면 그 태스크를, 상태 변경이나 시간 초과로 중단되면 None을 반환 (aw는 취소)"""
+        task = asyncio.ensure_future(aw)
+        changed = asyncio.ensure_future(self._changed.wait())
+        try:
+            done, _ = await asyncio.wait({task, changed}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            changed.cancel()
+            if not task.done():
+                task.cancel()
+        if task in done:
+            return task
+        # 취소된 턴이 정리(취소 토큰, typing_stop)를 마칠 때까지 기다림
+        await asyncio.gather(task, return_exceptions=True)
+        return None
+
+    async def _run(self):
+        print(f"🔄 토론 스케줄러 시작 (페이싱: {self.pacing.name})")
+        try:
+            while True:
+                # 일시정지/사용자 개입 중에는 여기서 깨어날 때까지 멈춤
+                await self._running.wait()
+                if self.state == "stopped":
+                    break
+                self._changed.clear()
+
+                if self.clients_connected is not None and not self.clients_connected.is_set():
+                    print("⏸️ 연결된 WebSocket 클라이언트가 없어 연결될 때까지 대기")
+                    await self._race(self.clients_connected.wait())
+                    continue
+
+                # 파이프라인 모드: 직전 발언이 표시되는 대기 시간 동안 다음 발언을 미리 생성
+                self.chat_system.start_speculative_turn()
+
+                delay = self.pacing.delay(self.last_message)
+                if delay > 0 and await self._race(asyncio.sleep(delay)) is None:
+                    continue
+
+                turn = await self._race(
+                    self.chat_system.generate_auto_response_async(self.callback),
+                    timeout=self.turn_timeout
+                )
+                if turn is None:
+                    if self._changed.is_set():
+                        self.interrupted_turns += 1
+                        print("🛑 진행 중인 턴 중단 (상태 변경)")
+                    else:
+                        # 턴 태스크가 취소되면 턴의 취소 토큰도 취소되어 진행 중인 LLM 호출이 멈춤
+                        self.timeouts += 1
+                        print(f"⏰ 자동 응답 생성 타임아웃 ({self.turn_timeout}초), 진행 중인 호출 취소")
+                    continue
+
+                try:
+                    message = turn.result()
+                except Exception as e:
+                    print(f"❌ 자동 응답 생성 오류: {e}")
+                    continue
+                if message is None:
+                    if not self.chat_system.auto_discussion_enabled:
+                        # 다른 경로로 자동 토론이 꺼졌으면 다시 켜질 때까지 멈춤 (빈 턴 반복 방지)
+                        self.pause("disabled")
+                    continue
+
+                self.turns += 1
+                self.last_message = message
+                print(f"✅ AI 응답 생성 완료: {message.sender}")
+
+                if self.chat_system.user_intervention_pending:
+                    await self.callback("user_intervention_requested", {})
+                    self.pause("user_intervention")
+        except asyncio.CancelledError:
+            print("🛑 토론 스케줄러 태스크가 취소되었습니다")
+        except Exception as e:
+            print(f"❌ 토론 스케줄러 오류: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self.state = "stopped"
+            print("🏁 토론 스케줄러 종료됨")
+
+    def get_stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "pause_reason": self.pause_reason,
+            "task_active": self.is_active,
+            "pacing": self.pacing.describe(),
+            "turn_timeout": self.turn_timeout,
+            "turns": self.turns,
+            "timeouts": self.timeouts,
+            "interrupted_turns": self.interrupted_turns,
+            "uptime_s": round(time.time() - self.started_at, 1) if self.started_at else None
+        }
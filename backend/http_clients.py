@@ -0,0 +1,254 @@
+"""외부 HTTP/OpenAI 클라이언트 재사용
+
+조사 도구와 직접 LLM 호출은 매번 openai.OpenAI(...)를 새로 만들고, 검색 도구는 requests.get으로
+호출마다 TCP(+TLS) 연결을 새로 맺었습니다. 여기서는 keep-alive 연결을 가진 클라이언트를 풀에 두고
+빌려 씁니다.
+
+동기 호출 (스레드 풀에서 실행되는 도구/LLM 호출):
+  lease_openai_client(settings, cancel_token) / lease_session(cancel_token)
+  - 호출 하나가 클라이언트 하나를 빌려 쓰고 끝나면 풀에 돌려줌 (다음 호출은 열린 연결을 그대로 사용)
+  - 빌린 동안 턴이 취소되면 그 클라이언트만 닫아 기다리던 응답을 끊고 풀에 돌려주지 않음
+    (공유 클라이언트 하나를 닫으면 다른 호출까지 끊기므로 클라이언트 단위로 빌려줌)
+
+비동기 호출 (이벤트 루프에서 직접 await):
+  async_openai_client(settings) / async_http_client()
+  - 이벤트 루프마다 클라이언트 하나를 공유 (asyncio 태스크를 취소하면 그 요청만 중단됨)
+
+환경 변수:
+  HTTP_POOL_SIZE        : 풀에 보관할 유휴 클라이언트 수 / 비동기 클라이언트 최대 연결 수 (기본 16)
+  HTTP_CONNECT_TIMEOUT  : 연결 시간 제한(초, 기본 5)
+  HTTP_READ_TIMEOUT     : 검색 요청 응답 시간 제한(초, 기본 10)
+  LLM_REQUEST_TIMEOUT   : OpenAI 요청 시간 제한(초, 기본 120, SDK 기본값은 600)
+
+서버 시작 시간을 늘리지 않도록 requests/httpx/openai는 처음 클라이언트를 만들 때 불러옵니다.
+"""
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+from cancellation import CancellationToken
+
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+
+
+class ClientPool:
+    """빌려 쓰는 클라이언트 풀 (유휴 클라이언트를 재사용, 취소된 호출의 클라이언트는 닫고 버림)"""
+
+    def __init__(self, name: str, factory: Callable[[], object], max_idle: int = POOL_SIZE):
+        self.name = name
+        self.factory = factory
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self.created = 0
+        self.leases = 0
+        self.reused = 0
+        self.discarded = 0
+        self.in_use = 0
+
+    def _take(self):
+        with self._lock:
+            self.leases += 1
+            self.in_use += 1
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            self.created += 1
+        try:
+            return self.factory()
+        except Exception:
+            # 만들지 못한 클라이언트는 사용 중/생성 수에서 빼서 통계가 어긋나지 않게 함
+            with self._lock:
+                self.in_use -= 1
+                self.created -= 1
+            raise
+
+    def _give_back(self, client):
+        with self._lock:
+            self.in_use -= 1
+            if len(self._idle) < self.max_idle:
+                self._idle.append(client)
+                return
+        client.close()
+
+    @contextmanager
+    def lease(self, cancel_token: Optional[CancellationToken] = None):
+        client = self._take()
+        state = {"active": True, "discarded": False}
+
+        def discard():
+            # 반납 뒤에 늦게 호출되면 다른 호출이 빌려 간 클라이언트를 닫지 않도록 무시
+            with self._lock:
+                if not state["active"]:
+                    return
+                state["discarded"] = True
+                self.discarded += 1
+            client.close()
+
+        if cancel_token is not None:
+            cancel_token.on_cancel(discard)
+        try:
+            yield client
+        finally:
+            if cancel_token is not None:
+                cancel_token.remove_callback(discard)
+            with self._lock:
+                state["active"] = False
+                discarded = state["discarded"]
+                if discarded:
+                    self.in_use -= 1
+            if not discarded:
+                self._give_back(client)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for client in idle:
+            client.close()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "created": self.created,
+                "leases": self.leases,
+                "reused": self.reused,
+                "discarded": self.discarded,
+                "in_use": self.in_use,
+                "idle": len(self._idle),
+                "reuse_rate": round(self.reused / self.leases, 4) if self.leases else 0.0,
+            }
+
+
+def _new_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # 재시도는 검색 제공자 경주/대체가 맡으므로 연결 재사용만
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=2, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _new_openai_client(settings: Dict):
+    import httpx
+    import openai
+
+    http_client = httpx.Client(
+        timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+    )
+    return openai.OpenAI(**settings, http_client=http_client)
+
+
+_lock = threading.Lock()
+session_pool = ClientPool("requests", _new_session)
+_openai_pools: Dict[Tuple, ClientPool] = {}
+# 이벤트 루프별 비동기 클라이언트 {(종류, 설정, id(loop)): (loop, client)}
+_async_clients: Dict[Tuple, Tuple[asyncio.AbstractEventLoop, object]] = {}
+
+
+def search_timeout(read_timeout: Optional[float] = None) -> Tuple[float, float]:
+    """requests용 (연결, 응답) 시간 제한"""
+    return (CONNECT_TIMEOUT, read_timeout if read_timeout is not None else READ_TIMEOUT)
+
+
+def lease_session(cancel_token: Optional[CancellationToken] = None):
+    """keep-alive requests.Session 빌리기 (with 블록, 취소되면 그 세션을 닫음)"""
+    return session_pool.lease(cancel_token)
+
+
+def openai_pool(settings: Dict) -> ClientPool:
+    # LLM_BASE_URL/키가 실행 중 바뀔 수 있어(벤치마크) 설정별로 풀을 둠
+    key = (settings.get("api_key"), settings.get("base_url"))
+    with _lock:
+        pool = _openai_pools.get(key)
+        if pool is None:
+            pool = _openai_pools[key] = ClientPool(
+                f"openai@{settings.get('base_url') or 'api.openai.com'}", lambda: _new_openai_client(settings))
+        return pool
+
+
+def lease_openai_client(settings: Dict, cancel_token: Optional[CancellationToken] = None):
+    """keep-alive openai.OpenAI 클라이언트 빌리기 (settings: direct_llm.get_openai_settings())"""
+    return openai_pool(settings).lease(cancel_token)
+
+
+def _async_client(kind: str, settings_key: Tuple, factory: Callable[[], object]):
+    loop = asyncio.get_running_loop()
+    key = (kind, settings_key, id(loop))
+    with _lock:
+        entry = _async_clients.get(key)
+        if entry is not None and entry[0] is loop:
+            return entry[1]
+        # 닫힌 이벤트 루프(벤치마크/테스트의 asyncio.run 등)의 클라이언트는 더 쓸 수 없으므로 목록에서 제거
+        for stale in [k for k, (owner, _) in _async_clients.items() if owner.is_closed()]:
+            del _async_clients[stale]
+        client = factory()
+        _async_clients[key] = (loop, client)
+        return client
+
+
+def async_http_client():
+    """현재 이벤트 루프에서 공유하는 httpx.AsyncClient (검색 등 일반 HTTP 요청용)"""
+    import httpx
+
+    return _async_client("http", (), lambda: httpx.AsyncClient(
+        timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+    ))
+
+
+def async_openai_client(settings: Dict):
+    """현재 이벤트 루프에서 공유하는 openai.AsyncOpenAI 클라이언트"""
+    import httpx
+    import openai
+
+    def factory():
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+        )
+        return openai.AsyncOpenAI(**settings, http_client=http_client)
+
+    return _async_client("openai", (settings.get("api_key"), settings.get("base_url")), factory)
+
+
+async def aclose_async_clients():
+    """현재 이벤트 루프의 비동기 클라이언트 닫기 (서버 종료 시)"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        keys = [key for key, (owner, _) in _async_clients.items() if owner is loop]
+        clients = [_async_clients.pop(key)[1] for key in keys]
+    for client in clients:
+        if hasattr(client, "aclose"):  # httpx.AsyncClient
+            await client.aclose()
+        else:  # openai.AsyncOpenAI
+            await client.close()
+
+
+def close_all():
+    """풀에 있는 유휴 동기 클라이언트 닫기"""
+    session_pool.close()
+    with _lock:
+        pools = list(_openai_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+def get_stats() -> Dict:
+    with _lock:
+        pools = [session_pool] + list(_openai_pools.values())
+        async_clients = len(_async_clients)
+    return {
+        "pool_size": POOL_SIZE,
+        "timeouts_s": {"connect": CONNECT_TIMEOUT, "read": READ_TIMEOUT, "llm": LLM_REQUEST_TIMEOUT},
+        "pools": {pool.name: pool.get_stats() for pool in pools},
+        "async_clients": async_clients,
+    }
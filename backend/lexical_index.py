@@ -0,0 +1,87 @@
+import math
+from array import array
+from typing import Dict, List, Tuple
+
+from summarizer import char_ngrams
+
+# tf 저장 상한 (array 'H' = 16비트)
+MAX_TERM_FREQUENCY = 65535
+
+
+class LexicalIndex:
+    """문자 bigram/trigram 기반 BM25 역색인
+
+    문서 ID는 MemoryIndex 메타데이터의 위치(0, 1, 2, ...)와 같고 항상 증가하는 순서로 추가됩니다.
+    포스팅 리스트는 용어별로 array 두 개(문서 ID 간격, tf)로 저장해 dict/list보다 메모리를 덜 씁니다.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, ngram_sizes: Tuple[int, ...] = (2, 3)):
+        self.k1 = k1
+        self.b = b
+        self.ngram_sizes = ngram_sizes
+        self.postings: Dict[str, Tuple[array, array]] = {}  # 용어 → (문서 ID 간격, tf)
+        self._last_doc: Dict[str, int] = {}  # 용어별 마지막 문서 ID (간격 인코딩용)
+        self.doc_lengths = array('I')
+        self.total_length = 0
+
+    @property
+    def doc_count(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: int, text: str):
+        """문서 추가 (doc_id는 지금까지의 문서 수와 같아야 함)"""
+        if doc_id != self.doc_count:
+            raise ValueError(f"문서 ID는 순서대로 추가되어야 합니다: 기대값={self.doc_count}, 입력={doc_id}")
+
+        grams = char_ngrams(text, self.ngram_sizes)
+        length = sum(grams.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+
+        for term, tf in grams.items():
+            if term not in self.postings:
+                self.postings[term] = (array('I'), array('H'))
+                gap = doc_id
+            else:
+                gap = doc_id - self._last_doc[term]
+            gaps, tfs = self.postings[term]
+            gaps.append(gap)
+            tfs.append(min(tf, MAX_TERM_FREQUENCY))
+            self._last_doc[term] = doc_id
+
+    def _iter_postings(self, term: str):
+        """간격 인코딩된 포스팅 리스트를 (문서 ID, tf)로 복원"""
+        gaps, tfs = self.postings[term]
+        doc_id = 0
+        for gap, tf in zip(gaps, tfs):
+            doc_id += gap
+            yield doc_id, tf
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """BM25 점수 상위 문서 (문서 ID, 점수) 목록"""
+        if self.doc_count == 0:
+            return []
+
+        avg_length = self.total_length / self.doc_count if self.total_length else 1.0
+        scores: Dict[int, float] = {}
+        for term, query_tf in char_ngrams(query, self.ngram_sizes).items():
+            if term not in self.postings:
+                continue
+            df = len(self.postings[term][0])
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            for doc_id, tf in self._iter_postings(term):
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    def get_stats(self) -> Dict:
+        """역색인 크기 정보"""
+        postings = sum(len(gaps) for gaps, _ in self.postings.values())
+        return {
+            "documents": self.doc_count,
+            "terms": len(self.postings),
+            "postings": postings,
+            "posting_bytes": sum(gaps.itemsize * len(gaps) + tfs.itemsize * len(tfs)
+                                 for gaps, tfs in self.postings.values())
+        }
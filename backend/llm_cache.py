@@ -0,0 +1,204 @@
+"""CrewAI/LLM 응답 캐시
+
+(모델, 에이전트 페르소나, 작업 설명, expected_output)의 해시를 키로 응답 텍스트를 저장합니다.
+메모리 LRU → 디스크(JSON 파일) 순으로 조회하고, TTL이 지난 항목은 버립니다.
+
+모드 (LLM_CACHE_MODE 환경 변수):
+  - "off"    : 항상 새로 생성, 저장도 안 함 (기본)
+  - "on"     : 캐시 사용 (같은 주제/질문/맥락이면 TTL 동안 같은 응답이 반복되므로 개발/테스트용)
+  - "replay" : 캐시된 응답만 사용, 없으면 LLMCacheMiss (성능 테스트를 오프라인으로 재현할 때)
+
+호출마다 bypass=True를 주면 조회를 건너뛰고 새로 생성한 결과로 캐시를 갱신합니다.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from metrics import observe_llm_call
+
+CACHE_MODES = ("on", "off", "replay")
+
+
+class LLMCacheMiss(Exception):
+    """replay 모드에서 캐시에 없는 요청"""
+
+
+def cache_model_name(model: str, base_url: Optional[str] = None) -> str:
+    """캐시 키용 모델 이름 (LLM_BASE_URL로 다른 서버를 쓸 때 응답이 섞이지 않도록 주소 포함)"""
+    return f"{model}@{base_url}" if base_url else model
+
+
+def _agent_model(agent) -> str:
+    llm = getattr(agent, "llm", None)
+    return cache_model_name(str(getattr(llm, "model", llm) or ""), getattr(llm, "base_url", None))
+
+
+def make_cache_key(model: str, role: str, goal: str, backstory: str, description: str,
+                   expected_output: str) -> str:
+    payload = json.dumps([model, role, goal, backstory, description, expected_output], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def crew_cache_key(crew) -> str:
+    """Crew의 작업들(담당 에이전트 페르소나 포함)로 캐시 키 계산"""
+    parts = []
+    for task in crew.tasks:
+        agent = task.agent or crew.agents[0]
+        parts.append(make_cache_key(
+            _agent_model(agent), agent.role, agent.goal, agent.backstory,
+            task.description, task.expected_output
+        ))
+    return parts[0] if len(parts) == 1 else hashlib.sha256("".join(parts).encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """메모리 LRU + 디스크 저장소 + TTL"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 1024,
+                 ttl_seconds: Optional[float] = None, mode: Optional[str] = None):
+        self.cache_dir = cache_dir or os.getenv("LLM_CACHE_DIR", "llm_cache")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("LLM_CACHE_TTL", "86400"))
+        self.mode = mode or os.getenv("LLM_CACHE_MODE", "off")
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"지원하지 않는 캐시 모드: {self.mode} (가능: {', '.join(CACHE_MODES)})")
+
+        self._entries = OrderedDict()  # 키 → {"response", "created_at"}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.bypassed = 0
+        self.expired = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        # replay 모드에서는 녹화해 둔 응답을 오래돼도 그대로 사용
+        return self.mode == "replay" or time.time() - entry["created_at"] <= self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_fresh(entry):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry["response"]
+                del self._entries[key]
+                self.expired += 1
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if not self._is_fresh(entry):
+            with self._lock:
+                self.expired += 1
+                self.misses += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        with self._lock:
+            self._remember(key, entry)
+            self.disk_hits += 1
+        return entry["response"]
+
+    def _remember(self, key: str, entry: Dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, key: str, response: str, meta: Optional[Dict] = None):
+        if self.mode == "off":
+            return
+        entry = {"response": response, "created_at": time.time(), **(meta or {})}
+        with self._lock:
+            self._remember(key, entry)
+            self.stores += 1
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def lookup(self, key: str, bypass: bool = False) -> Optional[str]:
+        """모드/우회 플래그를 반영한 조회 (replay 모드에서 없으면 LLMCacheMiss)"""
+        if self.mode == "off":
+            return None
+        if bypass and self.mode != "replay":
+            with self._lock:
+                self.bypassed += 1
+            return None
+        cached = self.get(key)
+        if cached is None and self.mode == "replay":
+            raise LLMCacheMiss(f"replay 모드: 캐시에 없는 요청 ({key[:12]})")
+        return cached
+
+    def kickoff(self, crew, bypass: bool = False) -> str:
+        """crew.kickoff()를 캐시를 거쳐 실행하고 응답 텍스트를 반환"""
+        agent = crew.tasks[0].agent or crew.agents[0]
+        started = time.perf_counter()
+        key = crew_cache_key(crew)
+        cached = self.lookup(key, bypass)
+        if cached is not None:
+            observe_llm_call("kickoff", agent.role, "cached", time.perf_counter() - started)
+            return cached
+
+        try:
+            result = crew.kickoff()
+        except Exception:
+            observe_llm_call("kickoff", agent.role, "error", time.perf_counter() - started)
+            raise
+        response = result.raw if hasattr(result, "raw") else str(result)
+        # CrewOutput.token_usage: 이 crew 실행에서 LLM이 보고한 토큰 사용량
+        usage = getattr(result, "token_usage", None)
+        observe_llm_call("kickoff", agent.role, "ok", time.perf_counter() - started,
+                         getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None))
+        self.put(key, response, {"agent": agent.role})
+        return response
+
+    def clear(self, disk: bool = False):
+        with self._lock:
+            self._entries.clear()
+        if disk and os.path.exists(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "mode": self.mode,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "bypassed": self.bypassed,
+                "expired": self.expired,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
+
+
+# 전역 인스턴스
+llm_cache = LLMResponseCache()
@@ -0,0 +1,131 @@
+"""CrewAI 실행 전용 스레드 풀과 이벤트 루프 지연 측정
+
+crew.kickoff()는 수 초씩 블로킹되므로 async 엔드포인트에서 직접 부르면 서버 전체
+(WebSocket ping, /api/status 포함)가 멈춥니다. 모든 LLM 호출은 llm_executor.run()으로
+전용 스레드 풀에서 실행하고, loop_lag_monitor로 이벤트 루프가 얼마나 밀리는지 확인합니다.
+
+풀 크기는 LLM_EXECUTOR_WORKERS 환경 변수로 설정합니다 (기본 8).
+"""
+import asyncio
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from metrics import percentile
+
+
+class LLMExecutor:
+    """블로킹 LLM 호출을 실행하는 관리형 스레드 풀 + async 래퍼
+
+    CrewAI Agent/Crew 객체와 ChatRoundtable 상태는 프로세스 간에 넘길 수 없어 스레드 풀을 사용합니다.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("LLM_EXECUTOR_WORKERS", "8"))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_run_s = 0.0
+        self.max_queue_wait_s = 0.0
+
+    def _call(self, submitted_at: float, fn: Callable, *args, **kwargs):
+        started = time.perf_counter()
+        with self._lock:
+            self.max_queue_wait_s = max(self.max_queue_wait_s, started - submitted_at)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.total_run_s += time.perf_counter() - started
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        """동기 코드에서 풀에 작업 제출 (concurrent.futures.Future 반환)"""
+        with self._lock:
+            self.in_flight += 1
+        return self._executor.submit(self._call, time.perf_counter(), fn, *args, **kwargs)
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """블로킹 함수를 풀에서 실행하고 결과를 기다림 (이벤트 루프는 계속 동작)"""
+        with self._lock:
+            self.in_flight += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._call, time.perf_counter(), fn, *args, **kwargs)
+        )
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "mean_run_ms": round(self.total_run_s / finished * 1000, 1) if finished else None,
+                "max_queue_wait_ms": round(self.max_queue_wait_s * 1000, 1)
+            }
+
+
+class EventLoopLagMonitor:
+    """interval초마다 깨어나 예정 시각보다 얼마나 늦었는지 기록 (블로킹 호출이 있으면 크게 늘어남)"""
+
+    def __init__(self, interval: float = 0.1, window: int = 600):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self.max_lag_s = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.samples.append(lag)
+            self.max_lag_s = max(self.max_lag_s, lag)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def reset(self):
+        self.samples.clear()
+        self.max_lag_s = 0.0
+
+    def get_stats(self) -> Dict:
+        samples = list(self.samples)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_ms": self.interval * 1000,
+            "samples": len(samples),
+            "p50_ms": round(percentile(samples, 50) * 1000, 2) if samples else None,
+            "p99_ms": round(percentile(samples, 99) * 1000, 2) if samples else None,
+            "max_ms": round(self.max_lag_s * 1000, 2)
+        }
+
+
+# 전역 인스턴스
+llm_executor = LLMExecutor()
+loop_lag_monitor = EventLoopLagMonitor()
@@ -1,14 +1,46 @@
+# 시작 시간 측정 기준점을 잡기 위해 가장 먼저 import
+from startup_profile import startup_profile, measure_import_time, PROCESS_T0
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, TYPE_CHECKING
 import datetime
 import json
 import asyncio
 import os
-from chat_roundtable import ChatRoundtable, ChatMessage, get_default_personas
+import sys
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# crewai(chat_roundtable)와 faiss(memory_system)는 무거워서 시작 시 바로 불러오지 않음:
+# 메모리 시스템은 startup 훅에서, 토론 모듈은 백그라운드 예열 또는 첫 토론 때 불러옴
+from discussion_models import ChatMessage, get_default_personas
 from personas_storage import persona_storage
-from memory_system import FAISSMemorySystem
+from llm_executor import llm_executor, loop_lag_monitor
+from direct_llm import streaming_stats
+import http_clients
+from circuit_breaker import STATES as CIRCUIT_STATES, circuit_breakers
+from llm_cache import llm_cache
+from research_cache import research_cache
+from discussion_scheduler import DiscussionScheduler, make_pacing
+from agent_pool import agent_pool
+from search_orchestrator import search_orchestrator
+import metrics
+
+if TYPE_CHECKING:
+    from chat_roundtable import ChatRoundtable
+    from memory_system import FAISSMemorySystem
+
+startup_profile.record("main_imports", PROCESS_T0)
+
+# 시작 방식 (STARTUP_MODE):
+#   background : 바로 요청을 받고, 메모리 시스템 초기화와 토론 모듈 예열은 백그라운드에서 (기본)
+#   eager      : 둘 다 끝난 뒤 요청을 받음
+#   lazy       : 메모리 시스템만 백그라운드에서 초기화, 토론 모듈은 첫 토론 때 import
+STARTUP_MODE = os.getenv("STARTUP_MODE", "background")
 
 app = FastAPI()
 
@@ -21,19 +53,121 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def start_loop_lag_monitor():
+    loop_lag_monitor.start()
+
+def _init_memory_system():
+    with startup_profile.phase("memory_system"):
+        memory_module = startup_profile.import_module("memory_system")
+        return memory_module.FAISSMemorySystem()
+
+def _preload_discussion_modules():
+    with startup_profile.phase("discussion_modules"):
+        startup_profile.import_module("chat_roundtable")
+    # 저장된 페르소나로 에이전트를 미리 만들어 첫 토론 시작을 빠르게 함
+    with startup_profile.phase("agent_pool_warm"):
+        agent_pool.warm(persona_storage.load_personas())
+
+async def initialize_memory_system():
+    global memory_system
+    try:
+        memory_system = await llm_executor.run(_init_memory_system)
+        print("✅ 메모리 시스템 초기화 완료 (FAISS 전용, sentence-transformers 없이)")
+    except Exception as e:
+        print(f"⚠️ 메모리 시스템 초기화 실패: {e}")
+        memory_system = None
+
+async def preload_discussion_modules():
+    try:
+        await llm_executor.run(_preload_discussion_modules)
+        print("✅ 토론 모듈/에이전트 풀 준비 완료")
+    except Exception as e:
+        print(f"⚠️ 토론 모듈 예열 실패: {e}")
+
+@app.on_event("startup")
+async def start_background_initialization():
+    global memory_init_task, preload_task
+    memory_init_task = asyncio.create_task(initialize_memory_system())
+    if STARTUP_MODE != "lazy":
+        preload_task = asyncio.create_task(preload_discussion_modules())
+    if STARTUP_MODE == "eager":
+        await asyncio.gather(*(task for task in (memory_init_task, preload_task) if task))
+    startup_profile.mark_ready()
+
+@app.middleware("http")
+async def wait_for_memory_system(request, call_next):
+    # 메모리 시스템 초기화가 끝나기 전에 들어온 API 요청은 초기화가 끝날 때까지 대기 (디버그 엔드포인트 제외)
+    if memory_init_task is not None and not memory_init_task.done() \
+            and request.url.path.startswith("/api/") and not request.url.path.startswith("/api/debug/"):
+        await asyncio.shield(memory_init_task)
+    return await call_next(request)
+
+@app.middleware("http")
+async def record_http_metrics(request, call_next):
+    # 경로 대신 라우트 템플릿(/api/memory/chatroom/{room_id}/...)을 라벨로 써서 라벨 수가 늘지 않게 함
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", None) or "unmatched"
+        metrics.http_requests.inc(endpoint=endpoint, method=request.method, status=status)
+        metrics.http_request_seconds.observe(time.perf_counter() - started, endpoint=endpoint, method=request.method)
+
+async def load_chat_roundtable():
+    """chat_roundtable(crewai) 모듈을 LLM 실행 풀에서 import (첫 호출만 느림, 이벤트 루프는 막지 않음)"""
+    module = sys.modules.get("chat_roundtable")
+    if module is not None and not getattr(module.__spec__, "_initializing", False):
+        return module
+    # 백그라운드 예열이 import하는 중이면 실행 풀에서 끝날 때까지 기다림 (초기화가 덜 된 모듈을 쓰지 않도록)
+    return await llm_executor.run(startup_profile.import_module, "chat_roundtable")
+
+@app.on_event("shutdown")
+async def stop_llm_executor():
+    loop_lag_monitor.stop()
+    llm_executor.shutdown(wait=False)
+    if memory_system:
+        # 모아 둔 전역 대화 인덱스 추가분 저장
+        memory_system.flush_global_memory()
+    await http_clients.aclose_async_clients()
+    http_clients.close_all()
+
 # 연결된 웹소켓 클라이언트들
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self._clients_event: Optional[asyncio.Event] = None
+
+    @property
+    def clients_connected(self) -> asyncio.Event:
+        """연결된 클라이언트가 있으면 set되는 이벤트 (이벤트 루프 안에서 처음 접근할 때 생성)"""
+        if self._clients_event is None:
+            self._clients_event = asyncio.Event()
+            self._sync_clients_event()
+        return self._clients_event
+
+    def _sync_clients_event(self):
+        if self._clients_event is None:
+            return
+        if self.active_connections:
+            self._clients_event.set()
+        else:
+            self._clients_event.clear()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self._sync_clients_event()
         print(f"WebSocket 클라이언트 연결됨. 총 연결 수: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+            self._sync_clients_event()
             print(f"WebSocket 클라이언트 연결 해제됨. 총 연결 수: {len(self.active_connections)}")
 
     def has_connected_clients(self) -> bool:
@@ -51,6 +185,7 @@ class ConnectionManager:
         
         # 실제 활성 연결 목록 업데이트
         self.active_connections = active_connections
+        self._sync_clients_event()
         return len(self.active_connections) > 0
 
     def get_connection_count(self) -> int:
@@ -63,12 +198,16 @@ class ConnectionManager:
             print("연결된 클라이언트가 없어 브로드캐스트를 건너뜁니다.")
             return False
         
+        started = time.perf_counter()
+        message_type = message.get("type", "unknown")
         disconnected = []
         successful_sends = 0
+        # 한 번만 직렬화하고, 클라이언트가 전달 지연을 잴 수 있도록 서버 송신 시각(epoch 초)을 붙임
+        payload = json.dumps({**message, "server_ts": time.time()})
         
         for connection in self.active_connections:
             try:
-                await connection.send_text(json.dumps(message))
+                await connection.send_text(payload)
                 successful_sends += 1
             except Exception as e:
                 print(f"브로드캐스트 오류: {e}")
@@ -78,21 +217,23 @@ class ConnectionManager:
         for connection in disconnected:
             if connection in self.active_connections:
                 self.active_connections.remove(connection)
+        self._sync_clients_event()
+        metrics.broadcasts.inc(type=message_type, room=current_room_id or "")
+        metrics.broadcast_seconds.observe(time.perf_counter() - started, type=message_type)
+        if disconnected:
+            metrics.broadcast_send_failures.inc(len(disconnected))
         
         print(f"브로드캐스트 완료: {successful_sends}명에게 전송, {len(disconnected)}개 연결 제거")
         return successful_sends > 0
 
 manager = ConnectionManager()
 
-# 토론 시스템 및 메모리 시스템 인스턴스
-chat_system: Optional[ChatRoundtable] = None
-auto_discussion_task: Optional[asyncio.Task] = None
-try:
-    memory_system = FAISSMemorySystem()
-    print("✅ 메모리 시스템 초기화 완료 (FAISS 전용, sentence-transformers 없이)")
-except Exception as e:
-    print(f"⚠️ 메모리 시스템 초기화 실패: {e}")
-    memory_system = None
+# 토론 시스템 및 메모리 시스템 인스턴스 (메모리 시스템은 startup 훅에서 초기화)
+chat_system: Optional["ChatRoundtable"] = None
+discussion_scheduler: Optional[DiscussionScheduler] = None
+memory_system: Optional["FAISSMemorySystem"] = None
+memory_init_task: Optional[asyncio.Task] = None
+preload_task: Optional[asyncio.Task] = None
 current_room_id: Optional[str] = None
 
 # 요청/응답 모델
@@ -125,6 +266,18 @@ class SearchContextRequest(BaseModel):
     agent_name: Optional[str] = None  # None이면 공통 맥락 검색
     room_id: Optional[str] = None  # 채팅방 검색
     top_k: int = 5
+    include_archive: bool = False  # 요약되어 콜드 스토리지로 옮겨진 원본 메시지까지 검색
+    mode: str = "vector"  # vector(임베딩) / lexical(n-gram BM25) / hybrid(두 점수 결합)
+    alpha: float = 0.5  # hybrid 모드에서 벡터 점수 가중치
+
+class SearchAllChatroomsRequest(BaseModel):
+    query: str
+    top_k: int = 5
+    room_ids: Optional[List[str]] = None  # None이면 모든 채팅방
+    since: Optional[str] = None  # ISO 8601 날짜/시각 (이후 메시지만)
+    until: Optional[str] = None  # ISO 8601 날짜/시각 (이전 메시지만, 포함)
+    mode: str = "vector"
+    alpha: float = 0.5
 
 class SwitchChatroomRequest(BaseModel):
     room_id: str
@@ -167,21 +320,21 @@ def check_websocket_connection():
 
 # 메시지를 dict로 변환하는 헬퍼 함수
 def message_to_dict(msg: ChatMessage) -> dict:
-    import hashlib
-    # 메시지 내용으로 고유 ID 생성
-    content_hash = hashlib.md5(f"{msg.sender}_{msg.content}_{msg.timestamp.isoformat()}".encode()).hexdigest()[:8]
-    return {
-        "id": f"{msg.timestamp.isoformat()}_{msg.sender}_{content_hash}",
+    data = {
+        "id": msg.message_id,
         "sender": msg.sender,
         "content": msg.content,
         "timestamp": msg.timestamp.isoformat(),
         "message_type": msg.message_type
     }
+    if getattr(msg, "ttft_ms", None) is not None:
+        data["ttft_ms"] = msg.ttft_ms
+    return data
 
 # API 엔드포인트
 @app.post("/api/start_discussion")
 async def start_discussion(request: StartDiscussionRequest):
-    global chat_system, auto_discussion_task, current_room_id
+    global chat_system, current_room_id
     
     print(f"=== start_discussion API 호출 시작 ===")
     print(f"요청 데이터: topic={request.topic}, participants={request.participants}")
@@ -202,9 +355,9 @@ async def start_discussion(request: StartDiscussionRequest):
     try:
         print("1. 기존 자동 토론 중지 시도...")
         # 기존 자동 토론 중지
-        if auto_discussion_task and not auto_discussion_task.done():
-            auto_discussion_task.cancel()
-            print("기존 자동 토론 태스크 취소됨")
+        if chat_system:
+            chat_system.cancel_current_turn("new discussion")
+        await stop_discussion_scheduler()
         
         print("2. 새 채팅방 생성...")
         # 새 채팅방 생성
@@ -219,7 +372,8 @@ async def start_discussion(request: StartDiscussionRequest):
         print("3. 새 토론 시스템 초기화...")
         # 새 토론 시스템 초기화
         try:
-            chat_system = ChatRoundtable()
+            chat_roundtable = await load_chat_roundtable()
+            chat_system = chat_roundtable.ChatRoundtable()
             print("ChatRoundtable 인스턴스 생성됨")
         except Exception as e:
             import traceback
@@ -252,10 +406,11 @@ async def start_discussion(request: StartDiscussionRequest):
         print("5. 시작 메시지를 메모리에 저장...")
         # 시작 메시지를 메모리에 저장
         if memory_system:
-            memory_system.add_message_to_chatroom(
-                current_room_id, 
-                start_msg.sender, 
-                start_msg.content, 
+            await llm_executor.run(
+                memory_system.add_message_to_chatroom,
+                current_room_id,
+                start_msg.sender,
+                start_msg.content,
                 start_msg.timestamp.isoformat()
             )
             print("시작 메시지 메모리 저장 완료")
@@ -263,15 +418,29 @@ async def start_discussion(request: StartDiscussionRequest):
             print("⚠️ memory_system이 None이므로 메모리 저장 건너뜀")
         
         print("6. 초기 의견 수집...")
-        # 초기 의견 수집
-        initial_opinions = chat_system.get_initial_opinions()
+        # 시작 메시지를 먼저 보내고, 초기 의견은 동시에 생성하면서 완성되는 대로 전송
+        # (클라이언트는 id로 중복을 걸러내므로 마지막 discussion_started와 겹쳐도 됨)
+        await manager.broadcast({
+            "type": "message",
+            "data": message_to_dict(start_msg)
+        })
+        
+        async def opinion_callback(event_type, data):
+            if event_type == "message":
+                await manager.broadcast({
+                    "type": "message",
+                    "data": message_to_dict(data)
+                })
+        
+        initial_opinions = await chat_system.get_initial_opinions_async(opinion_callback)
         print(f"초기 의견 {len(initial_opinions)}개 수집됨")
         
         print("7. 초기 의견들을 메모리에 저장...")
         # 초기 의견들도 메모리에 저장
         if memory_system:
             for i, opinion in enumerate(initial_opinions):
-                memory_system.add_message_to_chatroom(
+                await llm_executor.run(
+                    memory_system.add_message_to_chatroom,
                     current_room_id,
                     opinion.sender,
                     opinion.content,
@@ -340,9 +509,7 @@ async def start_discussion(request: StartDiscussionRequest):
         return {"success": False, "error": str(e)}
 
 @app.post("/api/start_auto_discussion")
-async def start_auto_discussion():
-    global auto_discussion_task
-    
+async def start_auto_discussion(pacing: Optional[str] = None):
     print("🔄 자동 토론 시작 요청 받음")
     
     # WebSocket 연결 상태 확인
@@ -369,22 +536,21 @@ async def start_auto_discussion():
         ]
         print(f"✅ 기본 에이전트 설정 완료: {len(chat_system.active_agents)}명")
     
+    try:
+        pacing_policy = make_pacing(pacing)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    
+    # 기존 스케줄러가 있으면 종료 (토론마다 태스크 하나)
+    chat_system.cancel_current_turn("auto discussion restarted")
+    await stop_discussion_scheduler()
+    
     # 자동 토론 시작
     start_msg = chat_system.start_auto_discussion()
     print(f"✅ 자동 토론 시작됨: {start_msg.content}")
     
-    # 기존 자동 토론 태스크가 있으면 취소
-    if auto_discussion_task and not auto_discussion_task.done():
-        print("🛑 기존 자동 토론 태스크 취소 중...")
-        auto_discussion_task.cancel()
-        try:
-            await auto_discussion_task
-        except asyncio.CancelledError:
-            pass
-    
-    # 자동 토론 태스크 시작
-    auto_discussion_task = asyncio.create_task(auto_discussion_loop())
-    print("🚀 자동 토론 루프 시작됨")
+    ensure_discussion_scheduler(pacing_policy.name)
+    print(f"🚀 자동 토론 스케줄러 시작됨 (페이싱: {pacing_policy.name})")
     
     await manager.broadcast({
         "type": "message",
@@ -395,34 +561,16 @@ async def start_auto_discussion():
 
 @app.post("/api/pause_auto_discussion")
 async def pause_auto_discussion():
-    global auto_discussion_task
-    
     if not chat_system:
         return {"success": False, "error": "토론이 시작되지 않았습니다."}
     
     print("=== 자동 토론 일시정지 요청 ===")
     
-    # 즉시 상태 변경 (다른 프로세스에서 확인할 수 있도록)
-    chat_system.auto_discussion_enabled = False
-    chat_system.discussion_state = "paused"
-    print(f"상태 변경 완료: enabled={chat_system.auto_discussion_enabled}, state={chat_system.discussion_state}")
-    
-    # 자동 토론 태스크 강제 취소
-    if auto_discussion_task and not auto_discussion_task.done():
-        print("자동 토론 태스크 취소 중...")
-        auto_discussion_task.cancel()
-        try:
-            await asyncio.wait_for(auto_discussion_task, timeout=2.0)
-        except (asyncio.CancelledError, asyncio.TimeoutError):
-            print("자동 토론 태스크 취소됨")
-        except Exception as e:
-            print(f"태스크 취소 중 오류: {e}")
-    
-    # 태스크 참조 초기화
-    auto_discussion_task = None
-    print("자동 토론 일시정지 완료")
-    
+    # 스케줄러는 대기/진행 중인 턴을 즉시 중단하고 재개될 때까지 멈춤 (태스크는 유지)
+    if discussion_scheduler:
+        discussion_scheduler.pause("paused")
     pause_msg = chat_system.pause_auto_discussion()
+    print(f"상태 변경 완료: enabled={chat_system.auto_discussion_enabled}, state={chat_system.discussion_state}")
     
     await manager.broadcast({
         "type": "message",
@@ -433,29 +581,16 @@ async def pause_auto_discussion():
 
 @app.post("/api/resume_auto_discussion")
 async def resume_auto_discussion():
-    global auto_discussion_task
-    
     if not chat_system:
         return {"success": False, "error": "토론이 시작되지 않았습니다."}
     
     print("=== 자동 토론 재개 요청 ===")
     
-    # 기존 태스크가 있다면 정리
-    if auto_discussion_task and not auto_discussion_task.done():
-        print("기존 태스크 정리 중...")
-        auto_discussion_task.cancel()
-        try:
-            await asyncio.wait_for(auto_discussion_task, timeout=1.0)
-        except (asyncio.CancelledError, asyncio.TimeoutError):
-            pass
-    
     # 자동 토론 재개
     resume_msg = chat_system.resume_auto_discussion()
     print(f"상태 변경 완료: enabled={chat_system.auto_discussion_enabled}, state={chat_system.discussion_state}")
     
-    # 새로운 자동 토론 태스크 시작
-    auto_discussion_task = asyncio.create_task(auto_discussion_loop())
-    print("새로운 자동 토론 태스크 시작")
+    ensure_discussion_scheduler()
     
     await manager.broadcast({
         "type": "message",
@@ -466,8 +601,6 @@ async def resume_auto_discussion():
 
 @app.post("/api/stop_auto_discussion")
 async def stop_auto_discussion():
-    global auto_discussion_task
-    
     if not chat_system:
         return {"success": False, "error": "토론이 시작되지 않았습니다."}
     
@@ -477,21 +610,11 @@ async def stop_auto_discussion():
     chat_system.auto_discussion_enabled = False
     chat_system.discussion_state = "ready"
     chat_system.user_intervention_pending = False
+    chat_system.cancel_current_turn("stopped")
     print(f"상태 변경 완료: enabled={chat_system.auto_discussion_enabled}")
     
-    # 자동 토론 태스크 강제 취소
-    if auto_discussion_task and not auto_discussion_task.done():
-        print("자동 토론 태스크 취소 중...")
-        auto_discussion_task.cancel()
-        try:
-            await asyncio.wait_for(auto_discussion_task, timeout=2.0)
-        except (asyncio.CancelledError, asyncio.TimeoutError):
-            print("자동 토론 태스크 취소됨")
-        except Exception as e:
-            print(f"태스크 취소 중 오류: {e}")
-    
-    # 태스크 참조 초기화
-    auto_discussion_task = None
+    # 스케줄러 태스크 종료
+    await stop_discussion_scheduler()
     print("자동 토론 완전 중지 완료")
     
     stop_msg = ChatMessage(
@@ -513,8 +636,10 @@ async def request_intervention():
     if not chat_system:
         return {"success": False, "error": "토론이 시작되지 않았습니다."}
     
-    # 사용자 개입 요청
+    # 사용자 개입 요청 (사용자 메시지가 들어올 때까지 스케줄러 정지)
     intervention_msg = chat_system.request_user_intervention()
+    if discussion_scheduler:
+        discussion_scheduler.pause("user_intervention")
     
     await manager.broadcast({
         "type": "message",
@@ -548,6 +673,9 @@ async def send_message(request: UserMessageRequest):
         return {"success": False, "error": "토론이 시작되지 않았습니다."}
     
     try:
+        # 사용자 메시지가 들어오면 예측한 기록이 틀리므로 미리 생성 중인 발언은 버림
+        chat_system.discard_speculative_turn("user message")
+        
         # 사용자 메시지 처리
         if chat_system.user_intervention_pending:
             print("사용자 개입 후 토론 재개 모드")
@@ -558,7 +686,8 @@ async def send_message(request: UserMessageRequest):
             
             # 사용자 메시지를 메모리에 저장
             if current_room_id and memory_system:
-                memory_system.add_message_to_chatroom(
+                await llm_executor.run(
+                    memory_system.add_message_to_chatroom,
                     current_room_id,
                     user_msg.sender,
                     user_msg.content,
@@ -571,7 +700,8 @@ async def send_message(request: UserMessageRequest):
             
             # 응답 메시지도 메모리에 저장
             if current_room_id and memory_system:
-                memory_system.add_message_to_chatroom(
+                await llm_executor.run(
+                    memory_system.add_message_to_chatroom,
                     current_room_id,
                     continue_msg.sender,
                     continue_msg.content,
@@ -595,20 +725,20 @@ async def send_message(request: UserMessageRequest):
             print(f"토론 재개 메시지 브로드캐스트 결과: {continue_broadcast_result}")
             
             # 자동 토론 재개
-            global auto_discussion_task
-            auto_discussion_task = asyncio.create_task(auto_discussion_loop())
-            print("자동 토론 태스크 재시작")
+            ensure_discussion_scheduler()
+            print("자동 토론 스케줄러 재개")
             
             return {"success": True, "messages": [message_to_dict(user_msg), message_to_dict(continue_msg)]}
         else:
             print("일반 토론 진행 모드")
             # 일반 토론 진행
-            response = chat_system.continue_discussion(request.content)
+            response = await llm_executor.run(chat_system.continue_discussion, request.content)
             print(f"토론 응답 생성: {response.sender} - {response.content}")
             
             # 응답을 메모리에 저장
             if current_room_id and memory_system:
-                memory_system.add_message_to_chatroom(
+                await llm_executor.run(
+                    memory_system.add_message_to_chatroom,
                     current_room_id,
                     response.sender,
                     response.content,
@@ -653,7 +783,7 @@ async def ask_expert(request: ExpertQuestionRequest):
         return {"success": False, "error": "토론이 시작되지 않았습니다."}
     
     try:
-        response = chat_system.ask_specific_person(request.expert, request.question)
+        response = await llm_executor.run(chat_system.ask_specific_person, request.expert, request.question)
         print(f"전문가 응답 생성: {response.sender} - {response.content}")
         
         print("전문가 응답 브로드캐스트 시작...")
@@ -681,7 +811,7 @@ async def deep_dive(request: DeepDiveRequest):
         return {"success": False, "error": "토론이 시작되지 않았습니다."}
     
     try:
-        response = chat_system.deep_dive_question(request.question, request.focus_area)
+        response = await llm_executor.run(chat_system.deep_dive_question, request.question, request.focus_area)
         
         await manager.broadcast({
             "type": "message",
@@ -694,12 +824,12 @@ async def deep_dive(request: DeepDiveRequest):
         return {"success": False, "error": str(e)}
 
 @app.post("/api/get_conclusion")
-async def get_conclusion():
+async def get_conclusion(bypass_cache: bool = False):
     if not chat_system:
         return {"success": False, "error": "토론이 시작되지 않았습니다."}
     
     try:
-        conclusion = chat_system.get_conclusion()
+        conclusion = await llm_executor.run(chat_system.get_conclusion, bypass_cache)
         
         await manager.broadcast({
             "type": "message",
@@ -779,7 +909,7 @@ async def get_status():
         "discussion_state": chat_system.discussion_state,
         "discussion_rounds": chat_system.discussion_rounds,
         "current_speaker": speaker_info,
-        "total_messages": len(chat_system.chat_history),
+        "total_messages": chat_system.get_total_message_count(),
         "current_room_id": current_room_id,
         "websocket_connected": has_connections,
         "connection_count": connection_count,
@@ -819,21 +949,49 @@ async def search_context(request: SearchContextRequest):
     try:
         if request.room_id:
             # 채팅방 검색
-            results = memory_system.search_chatroom_context(request.room_id, request.query, request.top_k)
+            results = memory_system.search_chatroom_context(
+                request.room_id, request.query, request.top_k, include_archive=request.include_archive,
+                mode=request.mode, alpha=request.alpha
+            )
         elif request.agent_name:
             # 에이전트별 맥락 검색
-            results = memory_system.search_agent_context(request.agent_name, request.query, request.top_k)
+            results = memory_system.search_agent_context(
+                request.agent_name, request.query, request.top_k, mode=request.mode, alpha=request.alpha
+            )
         else:
             # 공통 맥락 검색
-            results = memory_system.search_common_context(request.query, request.top_k)
+            results = memory_system.search_common_context(
+                request.query, request.top_k, mode=request.mode, alpha=request.alpha
+            )
         
         return {"success": True, "results": results}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@app.post("/api/memory/search_all")
+async def search_all_chatrooms(request: SearchAllChatroomsRequest):
+    try:
+        results = await llm_executor.run(
+            memory_system.search_all_chatrooms,
+            request.query, request.top_k, room_ids=request.room_ids, since=request.since,
+            until=request.until, mode=request.mode, alpha=request.alpha
+        )
+        return {"success": True, "results": results}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@app.post("/api/memory/rebuild_global")
+async def rebuild_global_index():
+    try:
+        count = await llm_executor.run(memory_system.rebuild_global_index)
+        return {"success": True, "message_count": count}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 @app.get("/api/memory/stats")
 async def get_memory_stats():
     try:
+        await llm_executor.run(memory_system.flush_global_memory)
         stats = {
             "common_memory": memory_system.get_common_memory().get_stats(),
             "agent_memories": {
@@ -844,7 +1002,9 @@ async def get_memory_stats():
                 room_id: memory.get_stats() 
                 for room_id, memory in memory_system.chatroom_memories.items()
             },
-            "total_chatrooms": len(memory_system.get_chatroom_list())
+            "global_memory": memory_system.get_global_memory().get_stats(),
+            "total_chatrooms": len(memory_system.get_chatroom_list()),
+            "search_cache": memory_system.search_cache.get_stats()
         }
         return {"success": True, "stats": stats}
     except Exception as e:
@@ -866,7 +1026,7 @@ async def get_chatroom_conversation(room_id: str):
 
 @app.post("/api/switch_chatroom")
 async def switch_chatroom(request: SwitchChatroomRequest):
-    global current_room_id, chat_system, auto_discussion_task
+    global current_room_id, chat_system
     
     try:
         # 채팅방 존재 확인
@@ -876,9 +1036,10 @@ async def switch_chatroom(request: SwitchChatroomRequest):
         if not room_exists:
             return {"success": False, "error": "채팅방을 찾을 수 없습니다."}
         
-        # 기존 자동 토론 중지
-        if auto_discussion_task and not auto_discussion_task.done():
-            auto_discussion_task.cancel()
+        # 기존 자동 토론 중지 (진행 중인 LLM 호출도 취소)
+        if chat_system:
+            chat_system.cancel_current_turn("chatroom switched")
+        await stop_discussion_scheduler()
         
         # 채팅방 전환
         old_room_id = current_room_id
@@ -974,25 +1135,9 @@ async def update_persona(request: UpdatePersonaRequest):
         if not persona_storage.save_personas(current_personas):
             return {"success": False, "error": "페르소나 저장에 실패했습니다."}
         
-        # 현재 토론이 진행 중이면 해당 에이전트도 업데이트
+        # 현재 토론이 진행 중이면 해당 에이전트도 교체 (풀의 에이전트는 다른 토론과 공유되므로 직접 수정하지 않음)
         if chat_system:
-            agent_map = {
-                "디자인팀": chat_system.design_agent,
-                "영업팀": chat_system.sales_agent,
-                "생산팀": chat_system.production_agent,
-                "마케팅팀": chat_system.marketing_agent,
-                "IT팀": chat_system.it_agent,
-                "진행자": chat_system.moderator
-            }
-            
-            if request.agent_name in agent_map:
-                agent = agent_map[request.agent_name]
-                if request.role is not None:
-                    agent.role = request.role
-                if request.goal is not None:
-                    agent.goal = request.goal
-                if request.backstory is not None:
-                    agent.backstory = request.backstory
+            chat_system.update_agent_persona(request.agent_name, current_personas[request.agent_name])
         
         # 업데이트된 페르소나 정보 브로드캐스트
         await manager.broadcast({
@@ -1051,125 +1196,75 @@ async def reset_personas():
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-# 자동 토론 루프
-async def auto_discussion_loop():
-    print("🔄 자동 토론 루프 시작")
-    try:
-        loop_count = 0
-        while chat_system and chat_system.auto_discussion_enabled:
-            loop_count += 1
-            
-            # CrewAI 응답 생성을 위한 충분한 간격 제공 (5초)
-            for i in range(10):  # 5초 총 대기를 위해 0.5초씩 10번
-                await asyncio.sleep(0.5)
-                if not chat_system or not chat_system.auto_discussion_enabled:
-                    print(f"🛑 자동 토론 중지 신호 감지됨 (대기 중 {i+1}/10)")
-                    return
-            
-            if not chat_system.auto_discussion_enabled:
-                print("🛑 자동 토론이 비활성화됨")
-                break
-            
-            # WebSocket 연결 상태 확인
-            if not manager.has_connected_clients():
-                print("⚠️ 자동 토론 중단: WebSocket 클라이언트가 연결되지 않음")
-                # 자동 토론 일시정지
-                if chat_system:
-                    chat_system.auto_discussion_enabled = False
-                break
-            
-            print(f"✅ WebSocket 클라이언트 연결됨: {len(manager.active_connections)}개")
-            
-            # 콜백 함수 정의
-            async def broadcast_callback(event_type, data):
-                # 브로드캐스트 전에 연결 상태 확인
-                if not manager.has_connected_clients():
-                    print(f"브로드캐스트 건너뜀 ({event_type}): 연결된 클라이언트 없음")
-                    return
-                
-                if event_type == "typing_start":
-                    success = await manager.broadcast({
-                        "type": "typing_start",
-                        "data": data
-                    })
-                    if not success:
-                        print("typing_start 브로드캐스트 실패")
-                elif event_type == "typing_stop":
-                    success = await manager.broadcast({
-                        "type": "typing_stop",
-                        "data": {}
-                    })
-                    if not success:
-                        print("typing_stop 브로드캐스트 실패")
-                elif event_type == "message":
-                    # 메시지를 메모리에 저장
-                    if current_room_id and hasattr(data, 'sender') and memory_system:
-                        memory_system.add_message_to_chatroom(
-                            current_room_id,
-                            data.sender,
-                            data.content,
-                            data.timestamp.isoformat()
-                        )
-                    
-                    success = await manager.broadcast({
-                        "type": "message",
-                        "data": message_to_dict(data)
-                    })
-                    if not success:
-                        print("message 브로드캐스트 실패")
-            
-            # 중지 신호 재확인
-            if not chat_system or not chat_system.auto_discussion_enabled:
-                print("🛑 자동 토론 중지됨 - 응답 생성 전")
-                break
-            
-            
-            # 비동기 응답 생성 (실시간 스트리밍) - 취소 가능하게 함
-            try:
-                response_task = asyncio.create_task(
-                    chat_system.generate_auto_response_async(broadcast_callback)
-                )
-                response = await asyncio.wait_for(response_task, timeout=30.0)
-                
-                if response:
-                    print(f"✅ AI 응답 생성 완료: {response.sender if hasattr(response, 'sender') else 'Unknown'}")
-                else:
-                    print("⚠️ AI 응답이 None입니다")
-                
-                if not chat_system.auto_discussion_enabled:
-                    print("🛑 자동 토론 중지됨 - 응답 생성 후")
-                    break
-                    
-            except asyncio.TimeoutError:
-                print("⏰ 자동 응답 생성 타임아웃 (30초)")
-                continue
-            except asyncio.CancelledError:
-                print("🛑 자동 응답 생성 취소됨")
-                break
-            except Exception as e:
-                print(f"❌ 자동 응답 생성 오류: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-            
-            if response:
-                # 사용자 개입이 요청된 경우
-                if chat_system.user_intervention_pending:
-                    await manager.broadcast({
-                        "type": "user_intervention_requested",
-                        "data": {}
-                    })
-                    break
-                    
-    except asyncio.CancelledError:
-        print("🛑 자동 토론 루프가 취소되었습니다")
-        pass
-    except Exception as e:
-        print(f"❌ 자동 토론 루프 오류: {e}")
-        import traceback
-        traceback.print_exc()
-    finally:
-        print("🏁 자동 토론 루프 종료됨")
+# 자동 토론 턴 이벤트 전달 (스케줄러가 턴마다 호출)
+async def auto_discussion_callback(event_type, data):
+    if event_type == "typing_start":
+        success = await manager.broadcast({
+            "type": "typing_start",
+            "data": data
+        })
+        if not success:
+            print("typing_start 브로드캐스트 실패")
+    elif event_type == "typing_stop":
+        success = await manager.broadcast({
+            "type": "typing_stop",
+            "data": {}
+        })
+        if not success:
+            print("typing_stop 브로드캐스트 실패")
+    elif event_type == "message_delta":
+        # 스트리밍 중인 발언 조각 (저장은 message_complete 때 한 번만)
+        await manager.broadcast({
+            "type": "message_delta",
+            "data": data
+        })
+    elif event_type in ("message", "message_complete"):
+        # 메시지를 메모리에 저장
+        if current_room_id and hasattr(data, 'sender') and memory_system:
+            await llm_executor.run(
+                memory_system.add_message_to_chatroom,
+                current_room_id,
+                data.sender,
+                data.content,
+                data.timestamp.isoformat()
+            )
+        
+        success = await manager.broadcast({
+            "type": event_type,
+            "data": message_to_dict(data)
+        })
+        if not success:
+            print(f"{event_type} 브로드캐스트 실패")
+    elif event_type == "user_intervention_requested":
+        await manager.broadcast({
+            "type": "user_intervention_requested",
+            "data": {}
+        })
+
+def ensure_discussion_scheduler(pacing: Optional[str] = None) -> DiscussionScheduler:
+    """현재 토론의 스케줄러를 (없거나 끝났으면 새로 만들어) 진행 상태로 전환"""
+    global discussion_scheduler
+    
+    if discussion_scheduler is None or discussion_scheduler.state == "stopped" \
+            or discussion_scheduler.chat_system is not chat_system:
+        discussion_scheduler = DiscussionScheduler(
+            chat_system,
+            auto_discussion_callback,
+            pacing=make_pacing(pacing),
+            clients_connected=manager.clients_connected
+        )
+    elif pacing:
+        discussion_scheduler.pacing = make_pacing(pacing)
+    discussion_scheduler.start()
+    return discussion_scheduler
+
+async def stop_discussion_scheduler():
+    """진행 중인 스케줄러를 끝내고 태스크 종료까지 대기"""
+    global discussion_scheduler
+    
+    if discussion_scheduler:
+        await discussion_scheduler.stop()
+    discussion_scheduler = None
 
 @app.get("/api/websocket/status")
 async def get_websocket_status():
@@ -1187,17 +1282,19 @@ async def get_websocket_status():
 @app.get("/api/debug/auto_discussion")
 async def debug_auto_discussion():
     """자동 토론 상태 디버깅 엔드포인트"""
-    global auto_discussion_task
-    
     debug_info = {
         "chat_system_exists": chat_system is not None,
         "auto_discussion_enabled": chat_system.auto_discussion_enabled if chat_system else False,
         "active_agents_count": len(chat_system.active_agents) if chat_system and hasattr(chat_system, 'active_agents') else 0,
         "active_agents_roles": [agent.role for agent in chat_system.active_agents] if chat_system and hasattr(chat_system, 'active_agents') else [],
-        "auto_discussion_task_exists": auto_discussion_task is not None,
-        "auto_discussion_task_done": auto_discussion_task.done() if auto_discussion_task else None,
+        "scheduler": discussion_scheduler.get_stats() if discussion_scheduler else None,
         "websocket_connections": len(manager.active_connections),
-        "has_websocket_connections": manager.has_connected_clients()
+        "has_websocket_connections": manager.has_connected_clients(),
+        "turn_in_progress": chat_system.current_turn_token is not None if chat_system else False,
+        "cancelled_turns": chat_system.cancelled_turns if chat_system else 0,
+        "pipeline_turns": chat_system.pipeline_turns if chat_system else False,
+        "speculative_speaker": chat_system.speculative_turn["speaker"].role if chat_system and chat_system.speculative_turn else None,
+        "speculation": dict(chat_system.speculation_stats) if chat_system else {}
     }
     
     if chat_system:
@@ -1210,6 +1307,124 @@ async def debug_auto_discussion():
     
     return debug_info
 
+@app.get("/api/debug/event_loop")
+async def debug_event_loop(reset: bool = False):
+    """이벤트 루프 지연, LLM 실행 풀, 스트리밍 TTFT 상태 (reset=true면 지연 샘플 초기화)"""
+    stats = {
+        "event_loop_lag": loop_lag_monitor.get_stats(),
+        "llm_executor": llm_executor.get_stats(),
+        "streaming": streaming_stats.get_stats()
+    }
+    if reset:
+        loop_lag_monitor.reset()
+    return stats
+
+@app.get("/api/debug/startup")
+async def debug_startup(importtime: bool = False):
+    """시작 시간 보고서: 단계별/지연 import 소요 시간 (importtime=true면 새 프로세스에서 `import main` 측정)"""
+    report = {
+        "startup_mode": STARTUP_MODE,
+        **startup_profile.get_report(),
+        "memory_system_ready": memory_system is not None,
+        "discussion_modules_loaded": "chat_roundtable" in sys.modules
+    }
+    if importtime:
+        report["import_time"] = await llm_executor.run(measure_import_time, "main")
+    return report
+
+def _register_metric_callbacks():
+    """다른 모듈이 이미 세고 있는 값은 /metrics 수집 시점에 읽어서 내보냄"""
+    registry = metrics.registry
+    registry.register_callback(
+        "roundtable_websocket_connections", "연결된 WebSocket 클라이언트 수", "gauge",
+        lambda: [({}, len(manager.active_connections))])
+    registry.register_callback(
+        "roundtable_llm_cache_lookups_total", "LLM 응답 캐시 조회 수 (result: hit/disk_hit/miss/bypassed)", "counter",
+        lambda: [({"result": result}, llm_cache.get_stats()[field]) for result, field in
+                 (("hit", "hits"), ("disk_hit", "disk_hits"), ("miss", "misses"), ("bypassed", "bypassed"))])
+    registry.register_callback(
+        "roundtable_research_cache_lookups_total", "검색/조사 결과 캐시 조회 수 (result: hit/stale_hit/miss)", "counter",
+        lambda: [({"result": result}, research_cache.get_stats()[field]) for result, field in
+                 (("hit", "hits"), ("stale_hit", "stale_hits"), ("miss", "misses"))])
+    registry.register_callback(
+        "roundtable_http_client_leases_total", "외부 HTTP/OpenAI 클라이언트 대여 수 (result: reused/created/discarded)",
+        "counter",
+        lambda: [({"pool": name, "result": result}, stats[result])
+                 for name, stats in http_clients.get_stats()["pools"].items()
+                 for result in ("reused", "created", "discarded")])
+    registry.register_callback(
+        "roundtable_circuit_state", "제공자별 회로 차단기 상태 (0: closed, 1: open, 2: half_open)", "gauge",
+        lambda: [({"provider": name}, CIRCUIT_STATES.index(stats["state"]))
+                 for name, stats in circuit_breakers.get_stats().items()])
+    registry.register_callback(
+        "roundtable_circuit_events_total", "제공자별 회로 차단기 이벤트 수 (event: opened/rejected)", "counter",
+        lambda: [({"provider": name, "event": event}, stats[event])
+                 for name, stats in circuit_breakers.get_stats().items() for event in ("opened", "rejected")])
+    registry.register_callback(
+        "roundtable_llm_executor_in_flight", "LLM 실행 풀에서 실행/대기 중인 작업 수", "gauge",
+        lambda: [({}, llm_executor.get_stats()["in_flight"])])
+    registry.register_callback(
+        "roundtable_event_loop_lag_p99_seconds", "이벤트 루프 지연 p99 (최근 구간)", "gauge",
+        lambda: [({}, (loop_lag_monitor.get_stats()["p99_ms"] or 0) / 1000)])
+    registry.register_callback(
+        "roundtable_agent_pool_events_total", "에이전트 풀 재사용/생성 수 (event: hit/build)", "counter",
+        lambda: [({"event": "hit"}, agent_pool.hits), ({"event": "build"}, agent_pool.builds)])
+
+_register_metric_callbacks()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus 텍스트 형식 지표 (LLM/도구/메모리/브로드캐스트/HTTP)"""
+    return PlainTextResponse(metrics.render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/api/debug/agent_pool")
+async def debug_agent_pool():
+    """에이전트 풀 상태 (재사용/생성 횟수)"""
+    return agent_pool.get_stats()
+
+@app.get("/api/debug/llm_cache")
+async def debug_llm_cache():
+    """LLM 응답 캐시 상태 (모드, 적중률, 항목 수)"""
+    return llm_cache.get_stats()
+
+@app.post("/api/debug/llm_cache/clear")
+async def clear_llm_cache(disk: bool = False):
+    """LLM 응답 캐시 비우기 (disk=true면 디스크 저장소까지)"""
+    llm_cache.clear(disk=disk)
+    return {"success": True, "stats": llm_cache.get_stats()}
+
+@app.get("/api/debug/research_cache")
+async def debug_research_cache():
+    """검색/조사 결과 캐시 상태 (제공자별 TTL, 적중/stale 적중률, 백그라운드 갱신 수)"""
+    return research_cache.get_stats()
+
+@app.post("/api/debug/research_cache/clear")
+async def clear_research_cache(disk: bool = False):
+    """검색/조사 결과 캐시 비우기 (disk=true면 디스크 저장소까지)"""
+    research_cache.clear(disk=disk)
+    return {"success": True, "stats": research_cache.get_stats()}
+
+@app.get("/api/debug/http_clients")
+async def debug_http_clients():
+    """외부 HTTP/OpenAI 클라이언트 풀 상태 (재사용률, 시간 제한)"""
+    return http_clients.get_stats()
+
+@app.get("/api/debug/circuit_breakers")
+async def debug_circuit_breakers():
+    """제공자별 회로 차단기 상태 (상태, 최근 실패율, 다음 시험 호출까지 남은 시간, 마지막 오류)"""
+    return circuit_breakers.get_stats()
+
+@app.post("/api/debug/circuit_breakers/reset")
+async def reset_circuit_breakers(provider: Optional[str] = None):
+    """회로 차단기 닫기 (provider를 지정하지 않으면 전부)"""
+    circuit_breakers.reset(provider)
+    return {"success": True, "stats": circuit_breakers.get_stats()}
+
+@app.get("/api/debug/search")
+async def debug_search():
+    """웹 검색 제공자 경주 통계 (전략, 제공자별 승률/지연/취소 수)"""
+    return search_orchestrator.get_stats()
+
 # WebSocket 엔드포인트
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
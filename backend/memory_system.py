@@ -2,55 +2,167 @@ import faiss
 import numpy as np
 import json
 import os
+import re
+import contextlib
+import copy
 import hashlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 import uuid
+from summarizer import extractive_summary, format_summary
+from lexical_index import LexicalIndex
+from metrics import timed_memory_operation
+
+# 모든 MemoryIndex가 공유하는 단조 증가 세대 번호 (인덱스 객체가 새로 만들어져도 이전 값과 겹치지 않음)
+_generation_counter = itertools.count(1)
+
+# 검색 모드: 해시 벡터 / 문자 n-gram BM25 / 두 점수 가중 결합
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+
+# 임베딩 방식 식별자 (바뀌면 rebuild_indexes.py가 기존 인덱스를 다시 만듦)
+EMBEDDER_VERSION = "md5-hash-v1"
+
+# 대화 기록 MD 파일의 메시지 헤더: "## 발신자 (YYYY-MM-DD HH:MM:SS)"
+TRANSCRIPT_HEADER_PATTERN = re.compile(r'^## (.+) \((\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\)$')
+
+
+def create_simple_embedding(text: str, embedding_dim: int) -> np.ndarray:
+    """간단한 해시 기반 임베딩 생성 (프로세스 풀에서 쓸 수 있도록 모듈 함수로 분리)"""
+    # 텍스트를 해시하고 고정 크기 벡터로 변환
+    text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
+    
+    # 해시를 숫자로 변환하여 임베딩 벡터 생성
+    embedding = np.array([
+        int(text_hash[i:i+2], 16) / 255.0  # 0-1 범위로 정규화
+        for i in range(0, min(len(text_hash), embedding_dim * 2), 2)
+    ])
+    
+    # 부족한 차원은 0으로 채움
+    if len(embedding) < embedding_dim:
+        embedding = np.pad(embedding, (0, embedding_dim - len(embedding)))
+    else:
+        embedding = embedding[:embedding_dim]
+        
+    # L2 정규화
+    norm = np.linalg.norm(embedding)
+    if norm > 0:
+        embedding = embedding / norm
+        
+    return embedding.reshape(1, -1).astype('float32')
+
+
+def embed_texts(texts: List[str], embedding_dim: int) -> np.ndarray:
+    """여러 텍스트를 한 번에 임베딩 (N x embedding_dim)"""
+    if not texts:
+        return np.zeros((0, embedding_dim), dtype='float32')
+    return np.vstack([create_simple_embedding(text, embedding_dim) for text in texts])
+
+
+def write_index_atomic(index, index_path: str, metadata: Dict, metadata_path: str):
+    """임시 파일에 쓴 뒤 os.replace로 교체해 중간에 죽어도 반쯤 쓰인 파일이 남지 않게 저장"""
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    
+    index_tmp = f"{index_path}.tmp"
+    faiss.write_index(index, index_tmp)
+    
+    metadata_tmp = f"{metadata_path}.tmp"
+    with open(metadata_tmp, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    
+    os.replace(index_tmp, index_path)
+    os.replace(metadata_tmp, metadata_path)
+
+
+def iter_transcript_messages(md_path: str):
+    """_save_message_to_md가 기록한 대화 기록 파일을 한 줄씩 읽어 메시지 단위로 반환"""
+    sender, timestamp, lines = None, None, []
+    
+    def finish():
+        body = "\n".join(lines).strip()
+        # 메시지 사이 구분선 제거
+        if body.endswith("---"):
+            body = body[:-3].rstrip()
+        return {
+            "sender": sender,
+            "content": body,
+            "timestamp": datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S').isoformat()
+        }
+    
+    with open(md_path, 'r', encoding='utf-8') as f:
+        for raw_line in f:
+            line = raw_line.rstrip("\n")
+            match = TRANSCRIPT_HEADER_PATTERN.match(line)
+            if match:
+                if sender is not None:
+                    yield finish()
+                sender, timestamp, lines = match.group(1), match.group(2), []
+            elif sender is not None:
+                lines.append(line)
+    
+    if sender is not None:
+        yield finish()
 
 
 class FAISSMemorySystem:
     """FAISS를 활용한 메모리 시스템"""
     
-    def __init__(self, memory_dir: str = "memory_storage"):
+    def __init__(self, memory_dir: str = "memory_storage",
+                 summary_threshold: int = 200, summary_window: int = 50, summary_keep_recent: int = 50,
+                 global_flush_batch: int = None, global_flush_seconds: float = None):
         self.memory_dir = memory_dir
         self.embedding_dim = 128  # 간단한 해시 기반 임베딩 차원
         
+        # 롤링 요약 설정: 채팅방 핫 인덱스가 summary_threshold를 넘으면
+        # 최근 summary_keep_recent개를 제외한 원본 메시지를 summary_window개씩 요약
+        self.summary_threshold = summary_threshold
+        self.summary_window = summary_window
+        self.summary_keep_recent = summary_keep_recent
+        
+        # 전역 대화 인덱스는 요약하지 않아 계속 커지므로 메시지마다 전체를 다시 쓰지 않고 모아서 추가:
+        # global_flush_batch개가 쌓이거나 가장 오래된 대기 메시지가 global_flush_seconds를 넘기면 한 번에 저장
+        # (전역 검색/재구성/통계 조회/서버 종료 전에도 비움)
+        if global_flush_batch is None:
+            global_flush_batch = int(os.getenv("MEMORY_GLOBAL_FLUSH_BATCH", "64"))
+        if global_flush_seconds is None:
+            global_flush_seconds = float(os.getenv("MEMORY_GLOBAL_FLUSH_SECONDS", "30"))
+        self.global_flush_batch = max(1, global_flush_batch)
+        self.global_flush_seconds = global_flush_seconds
+        self._global_pending: List[Tuple[str, Dict]] = []
+        self._global_pending_since: Optional[float] = None
+        # 전역 인덱스 생성/추가/재구성 잠금 (flush_global_memory가 get_global_memory를 다시 부르므로 RLock)
+        self._global_lock = threading.RLock()
+        # 채팅방별 쓰기 잠금: 메시지 추가와 요약(핫 인덱스 재구성)이 실행 풀 스레드에서 겹치지 않도록 함
+        # 여러 잠금을 잡을 때는 항상 채팅방(room_id 순) → 전역 순서
+        self._rooms_lock = threading.Lock()
+        self._room_locks: Dict[str, threading.RLock] = {}
+        
         # 메모리 디렉토리 생성
         os.makedirs(memory_dir, exist_ok=True)
         os.makedirs(f"{memory_dir}/agents", exist_ok=True)
         os.makedirs(f"{memory_dir}/common", exist_ok=True)
         os.makedirs(f"{memory_dir}/chatrooms", exist_ok=True)
+        os.makedirs(f"{memory_dir}/archive", exist_ok=True)
+        os.makedirs(f"{memory_dir}/global", exist_ok=True)
         
         # 각 메모리 타입별 인덱스 초기화
         self.agent_memories = {}  # 에이전트별 메모리
         self.common_memory = None  # 공통 메모리
         self.chatroom_memories = {}  # 채팅방별 메모리
+        self.archive_memories = {}  # 채팅방별 콜드 스토리지 (요약된 원본 메시지, 필요할 때 로드)
+        self.global_memory = None  # 모든 채팅방 원본 메시지를 담는 전역 대화 인덱스 (필요할 때 로드)
+        
+        # 검색 결과 캐시 (인덱스 세대가 바뀌면 키가 달라져 자동 무효화)
+        self.search_cache = SearchResultCache(max_entries=512)
         
         self._initialize_memories()
     
     def _create_simple_embedding(self, text: str) -> np.ndarray:
         """간단한 해시 기반 임베딩 생성"""
-        # 텍스트를 해시하고 고정 크기 벡터로 변환
-        text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-        
-        # 해시를 숫자로 변환하여 임베딩 벡터 생성
-        embedding = np.array([
-            int(text_hash[i:i+2], 16) / 255.0  # 0-1 범위로 정규화
-            for i in range(0, min(len(text_hash), self.embedding_dim * 2), 2)
-        ])
-        
-        # 부족한 차원은 0으로 채움
-        if len(embedding) < self.embedding_dim:
-            embedding = np.pad(embedding, (0, self.embedding_dim - len(embedding)))
-        else:
-            embedding = embedding[:self.embedding_dim]
-            
-        # L2 정규화
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            embedding = embedding / norm
-            
-        return embedding.reshape(1, -1).astype('float32')
+        return create_simple_embedding(text, self.embedding_dim)
     
     def _initialize_memories(self):
         """메모리 인덱스들을 초기화"""
@@ -89,14 +201,63 @@ class FAISSMemorySystem:
         """공통 메모리 인덱스 가져오기"""
         return self.common_memory
     
+    def _room_lock(self, room_id: str) -> threading.RLock:
+        with self._rooms_lock:
+            lock = self._room_locks.get(room_id)
+            if lock is None:
+                lock = self._room_locks[room_id] = threading.RLock()
+            return lock
+    
     def get_chatroom_memory(self, room_id: str) -> 'MemoryIndex':
         """채팅방별 메모리 인덱스 가져오기"""
         if room_id not in self.chatroom_memories:
-            self.chatroom_memories[room_id] = MemoryIndex(
-                f"chatrooms/{room_id}", self.memory_dir, self.embedding_dim
-            )
+            with self._room_lock(room_id):
+                if room_id not in self.chatroom_memories:
+                    self.chatroom_memories[room_id] = MemoryIndex(
+                        f"chatrooms/{room_id}", self.memory_dir, self.embedding_dim
+                    )
         return self.chatroom_memories[room_id]
     
+    def get_chatroom_archive(self, room_id: str) -> 'MemoryIndex':
+        """채팅방 콜드 스토리지 인덱스 가져오기 (요약으로 대체된 원본 메시지)"""
+        if room_id not in self.archive_memories:
+            with self._room_lock(room_id):
+                if room_id not in self.archive_memories:
+                    self.archive_memories[room_id] = MemoryIndex(
+                        f"archive/{room_id}", self.memory_dir, self.embedding_dim
+                    )
+        return self.archive_memories[room_id]
+    
+    def get_global_memory(self) -> 'MemoryIndex':
+        """전역 대화 인덱스 가져오기 (모든 채팅방 메시지, room_id로 필터링)"""
+        if self.global_memory is None:
+            # 실행 풀 스레드(flush)와 이벤트 루프(검색)가 동시에 처음 불러도 인덱스는 하나만 만듦
+            with self._global_lock:
+                if self.global_memory is None:
+                    self.global_memory = MemoryIndex("global/conversations", self.memory_dir, self.embedding_dim)
+        return self.global_memory
+    
+    def _queue_global_message(self, text: str, data: Dict):
+        """전역 인덱스에 넣을 메시지를 모아 두고, 배치가 차거나 오래 기다렸으면 저장"""
+        with self._global_lock:
+            if not self._global_pending:
+                self._global_pending_since = time.monotonic()
+            self._global_pending.append((text, data))
+            due = (len(self._global_pending) >= self.global_flush_batch
+                   or time.monotonic() - self._global_pending_since >= self.global_flush_seconds)
+        if due:
+            self.flush_global_memory()
+    
+    def flush_global_memory(self) -> int:
+        """대기 중인 메시지를 전역 인덱스에 한 번에 추가하고 저장, 추가한 수 반환"""
+        with self._global_lock:
+            pending, self._global_pending = self._global_pending, []
+            self._global_pending_since = None
+            if pending:
+                self.get_global_memory().add_memories([t for t, _ in pending], [d for _, d in pending])
+        return len(pending)
+    
+    @timed_memory_operation("create_chatroom")
     def create_chatroom(self, room_name: str, topic: str = None) -> str:
         """새로운 채팅방 생성"""
         room_id = str(uuid.uuid4())
@@ -139,34 +300,12 @@ class FAISSMemorySystem:
             with open(metadata_path, 'w', encoding='utf-8') as f:
                 json.dump(metadata, f, ensure_ascii=False, indent=2)
     
+    @timed_memory_operation("add_message", room_arg=0)
     def add_message_to_chatroom(self, room_id: str, sender: str, content: str, timestamp: str = None):
-        """채팅방에 메시지 추가"""
+        """채팅방에 메시지 추가 (블로킹, 임계치를 넘으면 요약까지 하므로 이벤트 루프가 아닌 실행 풀에서 호출)"""
         try:
-            if timestamp is None:
-                timestamp = datetime.now().isoformat()
-            
-            # 채팅방 메타데이터 파일이 없으면 생성
-            self._ensure_chatroom_metadata_exists(room_id)
-            
-            chatroom_memory = self.get_chatroom_memory(room_id)
-            
-            # 메시지 데이터 구성
-            message_data = {
-                "sender": sender,
-                "content": content,
-                "timestamp": timestamp,
-                "room_id": room_id
-            }
-            
-            # 메모리에 추가
-            chatroom_memory.add_memory(content, message_data)
-            
-            # 메타데이터 업데이트
-            self._update_chatroom_metadata(room_id, sender)
-            
-            # MD 파일로도 저장
-            self._save_message_to_md(room_id, message_data)
-            
+            with self._room_lock(room_id):
+                self._add_message_locked(room_id, sender, content, timestamp)
         except Exception as e:
             print(f"add_message_to_chatroom 오류: {str(e)}")
             import traceback
@@ -174,6 +313,37 @@ class FAISSMemorySystem:
             # 오류가 발생해도 계속 진행
             pass
     
+    def _add_message_locked(self, room_id: str, sender: str, content: str, timestamp: Optional[str]):
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+        
+        # 채팅방 메타데이터 파일이 없으면 생성
+        self._ensure_chatroom_metadata_exists(room_id)
+        
+        chatroom_memory = self.get_chatroom_memory(room_id)
+        
+        # 메시지 데이터 구성
+        message_data = {
+            "sender": sender,
+            "content": content,
+            "timestamp": timestamp,
+            "room_id": room_id
+        }
+        
+        # 메모리에 추가 (전역 인덱스는 요약하지 않고 원본을 그대로 보관)
+        chatroom_memory.add_memory(content, message_data)
+        self._queue_global_message(content, dict(message_data))
+        
+        # 핫 인덱스가 임계치를 넘으면 오래된 메시지를 요약하고 콜드 스토리지로 이동
+        if chatroom_memory.metadata["count"] > self.summary_threshold:
+            self.summarize_chatroom(room_id)
+        
+        # 메타데이터 업데이트
+        self._update_chatroom_metadata(room_id, sender)
+        
+        # MD 파일로도 저장
+        self._save_message_to_md(room_id, message_data)
+
     def _update_chatroom_metadata(self, room_id: str, participant: str):
         """채팅방 메타데이터 업데이트"""
         metadata_path = f"{self.memory_dir}/chatrooms/{room_id}_chatroom.json"
@@ -236,20 +406,251 @@ class FAISSMemorySystem:
             f.write(f"{message_data['content']}\n\n")
             f.write("---\n\n")
     
-    def search_agent_context(self, agent_name: str, query: str, top_k: int = 5) -> List[Dict]:
+    def _cached_search(self, scope: str, indexes: List['MemoryIndex'], query: str, top_k: int,
+                       filters: Tuple, search_fn) -> List[Dict]:
+        """검색 결과 캐시 조회 후 없으면 검색 수행
+        
+        키에 관련 인덱스들의 세대(generation)가 포함되므로 쓰기가 일어나면 이전 결과는 다시 쓰이지 않습니다.
+        """
+        key = (scope, query, top_k, filters, tuple(index.generation for index in indexes))
+        cached = self.search_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        results = search_fn()
+        self.search_cache.put(key, copy.deepcopy(results))
+        return results
+    
+    @timed_memory_operation("search_agent")
+    def search_agent_context(self, agent_name: str, query: str, top_k: int = 5,
+                             mode: str = "vector", alpha: float = 0.5) -> List[Dict]:
         """에이전트별 맥락 검색"""
         agent_memory = self.get_agent_memory(agent_name)
-        return agent_memory.search(query, top_k)
+        return self._cached_search(
+            f"agent:{agent_name}", [agent_memory], query, top_k, (("mode", mode), ("alpha", alpha)),
+            lambda: agent_memory.search(query, top_k, mode=mode, alpha=alpha)
+        )
     
-    def search_common_context(self, query: str, top_k: int = 5) -> List[Dict]:
+    @timed_memory_operation("search_common")
+    def search_common_context(self, query: str, top_k: int = 5,
+                              mode: str = "vector", alpha: float = 0.5) -> List[Dict]:
         """공통 맥락 검색"""
-        return self.common_memory.search(query, top_k)
+        return self._cached_search(
+            "common", [self.common_memory], query, top_k, (("mode", mode), ("alpha", alpha)),
+            lambda: self.common_memory.search(query, top_k, mode=mode, alpha=alpha)
+        )
     
-    def search_chatroom_context(self, room_id: str, query: str, top_k: int = 5) -> List[Dict]:
-        """채팅방별 대화 내용 검색"""
+    @timed_memory_operation("search_chatroom", room_arg=0)
+    def search_chatroom_context(self, room_id: str, query: str, top_k: int = 5,
+                                include_archive: bool = False, mode: str = "vector",
+                                alpha: float = 0.5) -> List[Dict]:
+        """채팅방별 대화 내용 검색 (include_archive=True면 요약된 원본 메시지까지 검색)"""
         chatroom_memory = self.get_chatroom_memory(room_id)
-        return chatroom_memory.search(query, top_k)
+        
+        archive_path = f"{self.memory_dir}/archive/{room_id}_index.faiss"
+        use_archive = include_archive and (room_id in self.archive_memories or os.path.exists(archive_path))
+        indexes = [chatroom_memory, self.get_chatroom_archive(room_id)] if use_archive else [chatroom_memory]
+        
+        return self._cached_search(
+            f"chatroom:{room_id}", indexes, query, top_k,
+            (("include_archive", use_archive), ("mode", mode), ("alpha", alpha)),
+            lambda: self._search_chatroom(room_id, query, top_k, use_archive, mode, alpha)
+        )
     
+    def _search_chatroom(self, room_id: str, query: str, top_k: int, use_archive: bool,
+                         mode: str = "vector", alpha: float = 0.5) -> List[Dict]:
+        """채팅방 핫 인덱스 검색 (use_archive면 콜드 스토리지 결과와 병합)"""
+        chatroom_memory = self.get_chatroom_memory(room_id)
+        results = chatroom_memory.search(query, top_k, mode=mode, alpha=alpha)
+        
+        if use_archive:
+            archived = self.get_chatroom_archive(room_id).search(query, top_k, mode=mode, alpha=alpha)
+            for result in archived:
+                result["archived"] = True
+            results = sorted(results + archived, key=lambda r: r["similarity_score"], reverse=True)[:top_k]
+            for i, result in enumerate(results):
+                result["rank"] = i + 1
+        
+        return results
+    
+    @timed_memory_operation("search_all")
+    def search_all_chatrooms(self, query: str, top_k: int = 5, room_ids: Optional[List[str]] = None,
+                             since: Optional[str] = None, until: Optional[str] = None,
+                             mode: str = "vector", alpha: float = 0.5) -> List[Dict]:
+        """모든 채팅방 대화를 한 번에 검색
+        
+        room_ids: 지정하면 해당 채팅방 메시지만
+        since/until: ISO 8601 날짜/시각 문자열 (until은 주어진 정밀도까지 포함, 예: "2025-01-31"이면 그날 전체)
+        """
+        self.flush_global_memory()
+        global_memory = self.get_global_memory()
+        filters = (
+            ("room_ids", tuple(sorted(room_ids)) if room_ids else None),
+            ("since", since), ("until", until), ("mode", mode), ("alpha", alpha)
+        )
+        return self._cached_search(
+            "global", [global_memory], query, top_k, filters,
+            lambda: self._search_global(query, top_k, set(room_ids) if room_ids else None,
+                                        since, until, mode, alpha)
+        )
+    
+    def _search_global(self, query: str, top_k: int, room_ids: Optional[set], since: Optional[str],
+                       until: Optional[str], mode: str, alpha: float) -> List[Dict]:
+        """전역 인덱스 검색 후 채팅방/기간 필터 적용
+        
+        필터로 걸러질 결과를 감안해 top_k보다 많이 가져오고, 부족하면 후보 수를 두 배씩 늘립니다.
+        """
+        global_memory = self.get_global_memory()
+        
+        def matches(data: Dict) -> bool:
+            if room_ids is not None and data.get("room_id") not in room_ids:
+                return False
+            timestamp = data.get("timestamp", "")
+            if since and timestamp < since:
+                return False
+            if until and timestamp[:len(until)] > until:
+                return False
+            return True
+        
+        if room_ids is None and not since and not until:
+            return global_memory.search(query, top_k, mode=mode, alpha=alpha)
+        
+        total = global_memory.metadata["count"]
+        fetch_k = top_k * 4
+        while True:
+            results = [r for r in global_memory.search(query, fetch_k, mode=mode, alpha=alpha)
+                       if matches(r["metadata"])]
+            if len(results) >= top_k or fetch_k >= total:
+                break
+            fetch_k *= 2
+        
+        results = results[:top_k]
+        for i, result in enumerate(results):
+            result["rank"] = i + 1
+        return results
+    
+    @timed_memory_operation("rebuild_global")
+    def rebuild_global_index(self) -> int:
+        """채팅방별 인덱스(핫 + 콜드 스토리지)의 원본 메시지로 전역 인덱스 재구성, 메시지 수 반환
+        
+        요약 항목은 제외하고 시간순으로 정렬합니다.
+        메시지 추가와 같은 순서(채팅방 잠금 → 전역 잠금)로 모든 채팅방 잠금을 잡고 스캔하므로
+        스캔 도중 들어온 메시지가 대기열에서 지워져 누락되는 일이 없습니다.
+        """
+        messages = []
+        chatrooms_dir = f"{self.memory_dir}/chatrooms"
+        room_ids = sorted(file.replace("_index.faiss", "") for file in os.listdir(chatrooms_dir)
+                          if file.endswith("_index.faiss")) if os.path.exists(chatrooms_dir) else []
+        
+        with contextlib.ExitStack() as stack:
+            for room_id in room_ids:
+                stack.enter_context(self._room_lock(room_id))
+            stack.enter_context(self._global_lock)
+            
+            for room_id in room_ids:
+                sources = [self.get_chatroom_memory(room_id)]
+                if room_id in self.archive_memories or os.path.exists(f"{self.memory_dir}/archive/{room_id}_index.faiss"):
+                    sources.insert(0, self.get_chatroom_archive(room_id))
+                for memory in sources:
+                    for text, data in zip(memory.metadata["texts"], memory.metadata["data"]):
+                        if data.get("type") == "summary":
+                            continue
+                        messages.append((text, {**data, "room_id": data.get("room_id", room_id)}))
+            
+            messages.sort(key=lambda item: item[1].get("timestamp", ""))
+            # 스캔한 채팅방의 대기 메시지는 재구성 결과에 포함되므로 버리고, 나머지(스캔 이후 생긴 채팅방)는 유지
+            scanned = set(room_ids)
+            self._global_pending = [item for item in self._global_pending if item[1].get("room_id") not in scanned]
+            if not self._global_pending:
+                self._global_pending_since = None
+            self.get_global_memory().rebuild([t for t, _ in messages], [d for _, d in messages])
+        print(f"🌐 전역 대화 인덱스 재구성 완료: 채팅방 {len(room_ids)}개, 메시지 {len(messages)}개")
+        return len(messages)
+    
+    @timed_memory_operation("summarize_chatroom", room_arg=0)
+    def summarize_chatroom(self, room_id: str) -> int:
+        """오래된 메시지 구간을 추출 요약으로 압축하고 원본은 콜드 스토리지로 이동
+        
+        LLM을 사용하지 않고 구간 내 문장 간 n-gram 유사도 중심성으로 대표 문장을 고릅니다.
+        이미 만들어진 요약 항목은 그대로 유지되며, 반환값은 새로 만든 요약 개수입니다.
+        핫 인덱스를 다시 만들므로 같은 채팅방의 메시지 추가와 겹치지 않게 채팅방 잠금을 잡고 실행합니다.
+        """
+        with self._room_lock(room_id):
+            return self._summarize_chatroom_locked(room_id)
+    
+    def _summarize_chatroom_locked(self, room_id: str) -> int:
+        chatroom_memory = self.get_chatroom_memory(room_id)
+        texts = chatroom_memory.metadata["texts"]
+        data = chatroom_memory.metadata["data"]
+        
+        summary_positions = [i for i, d in enumerate(data) if d.get("type") == "summary"]
+        raw_positions = [i for i, d in enumerate(data) if d.get("type") != "summary"]
+        
+        windows = []
+        while len(raw_positions) - sum(len(w) for w in windows) >= self.summary_keep_recent + self.summary_window:
+            start = sum(len(w) for w in windows)
+            windows.append(raw_positions[start:start + self.summary_window])
+        
+        if not windows:
+            return 0
+        
+        archive = self.get_chatroom_archive(room_id)
+        new_summaries = []
+        for window in windows:
+            window_messages = [data[i] for i in window]
+            archive_start = archive.metadata["count"]
+            archive.add_memories([texts[i] for i in window], window_messages)
+            
+            period_start = window_messages[0].get("timestamp", "")
+            period_end = window_messages[-1].get("timestamp", "")
+            selected = extractive_summary(window_messages)
+            summary_text = format_summary(selected, len(window), f"{period_start[:16]} ~ {period_end[:16]}")
+            new_summaries.append((summary_text, {
+                "type": "summary",
+                "sender": "요약",
+                "room_id": room_id,
+                "timestamp": period_end,
+                "period_start": period_start,
+                "period_end": period_end,
+                "message_count": len(window),
+                "archive_range": [archive_start, archive_start + len(window)],
+                "sentences": selected,
+                "level": 1
+            }))
+        
+        # 요약 항목도 summary_window개를 넘으면 가장 오래된 요약들을 한 단계 위 요약으로 병합
+        summaries = [(texts[i], data[i]) for i in summary_positions] + new_summaries
+        if len(summaries) > self.summary_window:
+            merge_count = len(summaries) - self.summary_window + 1
+            merged = summaries[:merge_count]
+            selected = extractive_summary([d for _, d in merged])
+            period_start = merged[0][1].get("period_start", "")
+            period_end = merged[-1][1].get("period_end", "")
+            message_count = sum(d.get("message_count", 0) for _, d in merged)
+            summaries = [(format_summary(selected, message_count, f"{period_start[:16]} ~ {period_end[:16]}"), {
+                "type": "summary",
+                "sender": "요약",
+                "room_id": room_id,
+                "timestamp": period_end,
+                "period_start": period_start,
+                "period_end": period_end,
+                "message_count": message_count,
+                "archive_range": [merged[0][1]["archive_range"][0], merged[-1][1]["archive_range"][1]],
+                "sentences": selected,
+                "level": 2
+            })] + summaries[merge_count:]
+        
+        # 요약 + 요약되지 않은 최근 원본 순서로 핫 인덱스 재구성
+        summarized = {i for window in windows for i in window}
+        kept = [i for i in raw_positions if i not in summarized]
+        new_texts = [t for t, _ in summaries] + [texts[i] for i in kept]
+        new_data = [d for _, d in summaries] + [data[i] for i in kept]
+        chatroom_memory.rebuild(new_texts, new_data)
+        
+        print(f"🗜️ 채팅방 요약 완료 ({room_id[:8]}): {len(summarized)}개 메시지 → 요약 {len(new_summaries)}개")
+        return len(new_summaries)
+    
+    @timed_memory_operation("add_agent_context")
     def add_agent_context(self, agent_name: str, context: str, metadata: Dict = None):
         """에이전트별 맥락 추가"""
         agent_memory = self.get_agent_memory(agent_name)
@@ -259,6 +660,7 @@ class FAISSMemorySystem:
             metadata.update({"agent": agent_name, "timestamp": datetime.now().isoformat()})
         agent_memory.add_memory(context, metadata)
     
+    @timed_memory_operation("add_common_context")
     def add_common_context(self, context: str, metadata: Dict = None):
         """공통 맥락 추가"""
         if metadata is None:
@@ -299,32 +701,18 @@ class MemoryIndex:
         self.index_path = f"{base_dir}/{name}_index.faiss"
         self.metadata_path = f"{base_dir}/{name}_metadata.json"
         
+        # 쓰기마다 갱신되는 세대 번호 (검색 결과 캐시 무효화용, 프로세스 내에서만 유효)
+        self.generation = next(_generation_counter)
+        
+        # BM25 역색인은 어휘/하이브리드 검색이 처음 요청될 때 구축
+        self._lexical: Optional[LexicalIndex] = None
+        
         # FAISS 인덱스와 메타데이터 로드 또는 생성
         self._load_or_create_index()
     
     def _create_simple_embedding(self, text: str) -> np.ndarray:
         """간단한 해시 기반 임베딩 생성"""
-        # 텍스트를 해시하고 고정 크기 벡터로 변환
-        text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-        
-        # 해시를 숫자로 변환하여 임베딩 벡터 생성
-        embedding = np.array([
-            int(text_hash[i:i+2], 16) / 255.0  # 0-1 범위로 정규화
-            for i in range(0, min(len(text_hash), self.embedding_dim * 2), 2)
-        ])
-        
-        # 부족한 차원은 0으로 채움
-        if len(embedding) < self.embedding_dim:
-            embedding = np.pad(embedding, (0, self.embedding_dim - len(embedding)))
-        else:
-            embedding = embedding[:self.embedding_dim]
-            
-        # L2 정규화
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            embedding = embedding / norm
-            
-        return embedding.reshape(1, -1).astype('float32')
+        return create_simple_embedding(text, self.embedding_dim)
     
     def _load_or_create_index(self):
         """FAISS 인덱스와 메타데이터 로드 또는 생성"""
@@ -353,7 +741,8 @@ class MemoryIndex:
                 "texts": [],
                 "data": [],
                 "created_at": datetime.now().isoformat(),
-                "count": 0
+                "count": 0,
+                "embedder": EMBEDDER_VERSION
             }
             self._save_index()
     
@@ -368,20 +757,88 @@ class MemoryIndex:
         # FAISS 인덱스에 추가
         self.index.add(embedding.astype('float32'))
         
+        # 역색인이 구축되어 있으면 함께 갱신
+        if self._lexical is not None:
+            self._lexical.add(len(self.metadata["texts"]), text)
+        
         # 메타데이터 추가
         self.metadata["texts"].append(text)
         self.metadata["data"].append(data)
         self.metadata["count"] += 1
         self.metadata["last_updated"] = datetime.now().isoformat()
+        self.generation = next(_generation_counter)
         
         # 저장
         self._save_index()
     
-    def search(self, query: str, top_k: int = 5) -> List[Dict]:
-        """쿼리로 유사한 메모리 검색"""
+    def add_memories(self, texts: List[str], data_list: List[Dict]):
+        """여러 메모리를 한 번에 추가 (저장은 한 번만 수행)"""
+        if not texts:
+            return
+        
+        embeddings = embed_texts(texts, self.embedding_dim)
+        self.index.add(embeddings.astype('float32'))
+        
+        if self._lexical is not None:
+            for offset, text in enumerate(texts):
+                self._lexical.add(len(self.metadata["texts"]) + offset, text)
+        
+        self.metadata["texts"].extend(texts)
+        self.metadata["data"].extend(data_list)
+        self.metadata["count"] += len(texts)
+        self.metadata["last_updated"] = datetime.now().isoformat()
+        self.generation = next(_generation_counter)
+        
+        self._save_index()
+    
+    def rebuild(self, texts: List[str], data_list: List[Dict]):
+        """인덱스를 주어진 항목들로 새로 구성 (요약 후 핫 인덱스 교체용)"""
+        self.index = faiss.IndexFlatIP(self.embedding_dim)
+        self._lexical = None
+        self.metadata["texts"] = []
+        self.metadata["data"] = []
+        self.metadata["count"] = 0
+        self.generation = next(_generation_counter)
+        self.add_memories(texts, data_list)
+        if not texts:
+            self._save_index()
+    
+    def get_lexical_index(self) -> LexicalIndex:
+        """BM25 역색인 (처음 필요할 때 메타데이터 텍스트로 구축하고 이후 추가 시 증분 갱신)"""
+        if self._lexical is None:
+            lexical = LexicalIndex()
+            for doc_id, text in enumerate(self.metadata["texts"]):
+                lexical.add(doc_id, text)
+            self._lexical = lexical
+        return self._lexical
+    
+    def _result(self, idx: int, score: float, rank: int, **scores) -> Dict:
+        return {
+            "text": self.metadata["texts"][idx],
+            "metadata": self.metadata["data"][idx],
+            "similarity_score": float(score),
+            "rank": rank,
+            **scores
+        }
+    
+    def search(self, query: str, top_k: int = 5, mode: str = "vector", alpha: float = 0.5) -> List[Dict]:
+        """쿼리로 유사한 메모리 검색
+        
+        mode: "vector"(해시 임베딩), "lexical"(n-gram BM25), "hybrid"(alpha*벡터 + (1-alpha)*어휘 점수)
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"지원하지 않는 검색 모드: {mode} (가능: {', '.join(SEARCH_MODES)})")
+        
         if self.metadata["count"] == 0:
             return []
         
+        if mode == "lexical":
+            hits = self.get_lexical_index().search(query, top_k)
+            return [self._result(idx, score, i + 1, lexical_score=score) for i, (idx, score) in enumerate(hits)]
+        
+        if mode == "hybrid":
+            return self._hybrid_search(query, top_k, alpha)
+        
         # 쿼리 임베딩 생성
         query_embedding = self._create_simple_embedding(query)
         
@@ -393,27 +850,44 @@ class MemoryIndex:
         results = []
         for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
             if idx >= 0:  # 유효한 인덱스인 경우
-                result = {
-                    "text": self.metadata["texts"][idx],
-                    "metadata": self.metadata["data"][idx],
-                    "similarity_score": float(score),
-                    "rank": i + 1
-                }
-                results.append(result)
+                results.append(self._result(idx, score, i + 1))
         
         return results
     
-    def _save_index(self):
-        """FAISS 인덱스와 메타데이터 저장"""
-        # 디렉토리 생성
-        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+    def _hybrid_search(self, query: str, top_k: int, alpha: float) -> List[Dict]:
+        """벡터/어휘 후보를 모아 각각 최댓값으로 정규화한 뒤 가중 결합"""
+        candidate_k = min(self.metadata["count"], max(top_k * 4, 20))
+        query_embedding = self._create_simple_embedding(query)
         
-        # FAISS 인덱스 저장
-        faiss.write_index(self.index, self.index_path)
+        _, vector_indices = self.index.search(query_embedding, candidate_k)
+        lexical_hits = dict(self.get_lexical_index().search(query, candidate_k))
+        candidates = {int(idx) for idx in vector_indices[0] if idx >= 0} | set(lexical_hits)
+        if not candidates:
+            return []
         
-        # 메타데이터 저장
-        with open(self.metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+        # 어휘 후보에만 있는 문서도 정확한 벡터 점수를 갖도록 저장된 벡터로 직접 계산
+        ordered = sorted(candidates)
+        vectors = np.vstack([self.index.reconstruct(idx) for idx in ordered])
+        vector_scores = dict(zip(ordered, (vectors @ query_embedding[0]).tolist()))
+        
+        max_vector = max(max(vector_scores.values()), 1e-9)
+        max_lexical = max(max(lexical_hits.values(), default=0.0), 1e-9)
+        fused = []
+        for idx in ordered:
+            vector_score = max(vector_scores[idx], 0.0) / max_vector
+            lexical_score = lexical_hits.get(idx, 0.0) / max_lexical
+            fused.append((idx, alpha * vector_score + (1 - alpha) * lexical_score,
+                          vector_scores[idx], lexical_hits.get(idx, 0.0)))
+        
+        fused.sort(key=lambda item: item[1], reverse=True)
+        return [
+            self._result(idx, score, i + 1, vector_score=vector_score, lexical_score=lexical_score)
+            for i, (idx, score, vector_score, lexical_score) in enumerate(fused[:top_k])
+        ]
+    
+    def _save_index(self):
+        """FAISS 인덱스와 메타데이터 저장"""
+        write_index_atomic(self.index, self.index_path, self.metadata, self.metadata_path)
     
     def get_stats(self) -> Dict:
         """메모리 인덱스 통계 정보"""
@@ -422,5 +896,56 @@ class MemoryIndex:
             "count": self.metadata["count"],
             "created_at": self.metadata.get("created_at"),
             "last_updated": self.metadata.get("last_updated"),
-            "embedding_dim": self.embedding_dim
-        }
\ No newline at end of file
+            "embedding_dim": self.embedding_dim,
+            "generation": self.generation,
+            "lexical_index": self._lexical.get_stats() if self._lexical is not None else None
+        }
+
+
+class SearchResultCache:
+    """검색 결과 LRU 캐시 (실행 풀 스레드에서 동시에 조회/저장하므로 잠금으로 보호)"""
+    
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        """캐시된 결과 반환 (없으면 None)"""
+        with self._lock:
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return results
+    
+    def put(self, key: Tuple, results: List[Dict]):
+        """결과 저장, 용량 초과 시 가장 오래 사용되지 않은 항목 제거"""
+        with self._lock:
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict:
+        """캐시 적중률 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
\ No newline at end of file
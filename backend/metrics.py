@@ -0,0 +1,281 @@
+"""Prometheus 형식 지표
+
+LLM 호출, 도구 호출(웹 검색 단계별), 메모리 작업, WebSocket 브로드캐스트, HTTP 요청의 지연 히스토그램과
+횟수/토큰 수/오류를 에이전트 역할, 엔드포인트, 채팅방 라벨과 함께 모아 GET /metrics 로 내보냅니다.
+추가 의존성 없이 텍스트 노출 형식(version 0.0.4)을 직접 생성합니다.
+
+캐시 적중, 실행 풀, 이벤트 루프 지연처럼 이미 다른 모듈이 세고 있는 값은 수집 시점에 콜백으로 읽어
+중복으로 세지 않습니다.
+
+채팅방 ID처럼 값이 계속 늘어나는 라벨 때문에 지표가 무한히 커지지 않도록, 지표마다 라벨 조합은
+MAX_SERIES개까지만 두고 넘치면 "_other"로 합칩니다.
+"""
+import functools
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+MAX_SERIES = 2000
+OVERFLOW_LABEL = "_other"
+# 초 단위 지연 구간 (빠른 메모리 작업 ~ 느린 crew.kickoff)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """최근 샘플 창의 백분위수 (가장 가까운 순위, 샘플이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        if key not in self._series and len(self._series) >= MAX_SERIES:
+            key = tuple(OVERFLOW_LABEL for _ in self.labelnames)
+        return key
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        with self._lock:
+            key = self._key(labels)
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(tuple(str(labels.get(n, "")) for n in self.labelnames), 0.0)
+
+    def total(self, **labels) -> float:
+        """주어진 라벨 값이 일치하는 모든 조합의 합 (예: total(direction="prompt"))"""
+        indexes = [(self.labelnames.index(name), str(value)) for name, value in labels.items()]
+        with self._lock:
+            return sum(v for key, v in self._series.items() if all(key[i] == value for i, value in indexes))
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._series.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._series[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        with self._lock:
+            key = self._key(labels)
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._series.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        with self._lock:
+            key = self._key(labels)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(s["counts"]), s["sum"], s["count"]) for key, s in self._series.items()]
+        lines = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', le))} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표 모음 + 수집 시점 콜백"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._callbacks: List[Tuple[str, str, str, Callable[[], Iterable[Tuple[Dict[str, str], float]]]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 지표: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def register_callback(self, name: str, help_text: str, kind: str,
+                          fn: Callable[[], Iterable[Tuple[Dict[str, str], float]]]):
+        """수집할 때마다 fn()이 돌려주는 [(라벨, 값)]을 그대로 내보냄 (다른 모듈이 이미 세는 값용)"""
+        self._callbacks.append((name, help_text, kind, fn))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        for name, help_text, kind, fn in self._callbacks:
+            try:
+                samples = list(fn())
+            except Exception as e:  # 콜백 하나가 실패해도 나머지 지표는 내보냄
+                lines.append(f"# {name} 수집 실패: {_escape(e)}")
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if value is None:
+                    continue
+                lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ---- LLM ----
+llm_calls = registry.counter(
+    "roundtable_llm_calls_total", "LLM 호출 수 (kind: stream/direct/kickoff/research, outcome: ok/error/cancelled/cached)",
+    ("kind", "agent", "outcome"))
+llm_call_seconds = registry.histogram(
+    "roundtable_llm_call_seconds", "LLM 호출 전체 시간", ("kind", "agent"))
+llm_ttft_seconds = registry.histogram(
+    "roundtable_llm_time_to_first_token_seconds", "스트리밍 첫 토큰까지 시간", ("agent",))
+llm_tokens = registry.counter(
+    "roundtable_llm_tokens_total", "LLM 토큰 수 (direction: prompt/completion, 응답에 사용량이 없으면 추정치)",
+    ("kind", "agent", "direction"))
+
+# ---- 도구 ----
+tool_calls = registry.counter(
+    "roundtable_tool_calls_total", "도구 호출 수 (provider: 웹 검색 대체 단계)", ("tool", "provider", "outcome"))
+tool_call_seconds = registry.histogram(
+    "roundtable_tool_call_seconds", "도구 호출 시간", ("tool", "provider"))
+
+# ---- 메모리 ----
+memory_operations = registry.counter(
+    "roundtable_memory_operations_total", "메모리 시스템 작업 수", ("operation", "room", "outcome"))
+memory_operation_seconds = registry.histogram(
+    "roundtable_memory_operation_seconds", "메모리 시스템 작업 시간", ("operation", "room"))
+
+# ---- WebSocket / HTTP ----
+broadcasts = registry.counter(
+    "roundtable_broadcasts_total", "WebSocket 브로드캐스트 수", ("type", "room"))
+broadcast_seconds = registry.histogram(
+    "roundtable_broadcast_seconds", "브로드캐스트 한 번(전체 클라이언트 전송) 시간", ("type",))
+broadcast_send_failures = registry.counter(
+    "roundtable_broadcast_send_failures_total", "전송 실패로 끊긴 클라이언트 수")
+http_requests = registry.counter(
+    "roundtable_http_requests_total", "HTTP 요청 수", ("endpoint", "method", "status"))
+http_request_seconds = registry.histogram(
+    "roundtable_http_request_seconds", "HTTP 요청 처리 시간", ("endpoint", "method"))
+
+
+def observe_llm_call(kind: str, agent: str, outcome: str, duration_s: float,
+                     prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None):
+    llm_calls.inc(kind=kind, agent=agent, outcome=outcome)
+    if outcome != "cached":
+        llm_call_seconds.observe(duration_s, kind=kind, agent=agent)
+    if prompt_tokens:
+        llm_tokens.inc(prompt_tokens, kind=kind, agent=agent, direction="prompt")
+    if completion_tokens:
+        llm_tokens.inc(completion_tokens, kind=kind, agent=agent, direction="completion")
+
+
+def observe_tool_call(tool: str, provider: str, ok: bool, duration_s: float):
+    tool_calls.inc(tool=tool, provider=provider, outcome="ok" if ok else "error")
+    tool_call_seconds.observe(duration_s, tool=tool, provider=provider)
+
+
+def timed_memory_operation(operation: str, room_arg: Optional[int] = None):
+    """메모리 시스템 메서드 데코레이터 (room_arg: 채팅방 ID가 있는 위치 인자 번호, self 제외)"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            room = ""
+            if room_arg is not None:
+                room = kwargs.get("room_id", args[room_arg] if len(args) > room_arg else "")
+            started = time.perf_counter()
+            outcome = "ok"
+            try:
+                return fn(self, *args, **kwargs)
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                memory_operations.inc(operation=operation, room=room, outcome=outcome)
+                memory_operation_seconds.observe(time.perf_counter() - started, operation=operation, room=room)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> str:
+    return registry.render()
@@ -1,7 +1,8 @@
+import copy
 import json
 import os
 from typing import Dict, Any
-from chat_roundtable import get_default_personas
+from discussion_models import get_default_personas
 
 class PersonaStorage:
     """페르소나 저장 및 관리 클래스"""
@@ -9,9 +10,27 @@ class PersonaStorage:
     def __init__(self, storage_file: str = "custom_personas.json"):
         self.storage_file = storage_file
         self.storage_path = os.path.join(os.path.dirname(__file__), storage_file)
-        
+        # (파일 수정 시각, 크기) → 병합된 페르소나: 파일이 그대로면 다시 읽지 않음
+        self._cache = None
+    
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.storage_path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+    
     def load_personas(self) -> Dict[str, Any]:
-        """저장된 페르소나 로드, 없으면 기본 페르소나 반환"""
+        """저장된 페르소나 로드, 없으면 기본 페르소나 반환 (호출자가 수정해도 되도록 사본 반환)"""
+        signature = self._file_signature()
+        if self._cache is not None and self._cache[0] == signature:
+            return copy.deepcopy(self._cache[1])
+        
+        personas = self._read_personas()
+        self._cache = (signature, personas)
+        return copy.deepcopy(personas)
+    
+    def _read_personas(self) -> Dict[str, Any]:
         try:
             if os.path.exists(self.storage_path):
                 with open(self.storage_path, 'r', encoding='utf-8') as f:
@@ -61,6 +80,7 @@ class PersonaStorage:
             with open(self.storage_path, 'w', encoding='utf-8') as f:
                 json.dump(custom_personas, f, ensure_ascii=False, indent=2)
             
+            self._cache = None
             return True
             
         except Exception as e:
@@ -72,6 +92,7 @@ class PersonaStorage:
         try:
             if os.path.exists(self.storage_path):
                 os.remove(self.storage_path)
+            self._cache = None
             return True
         except Exception as e:
             print(f"페르소나 리셋 실패: {e}")
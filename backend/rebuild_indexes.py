@@ -0,0 +1,248 @@
+"""대화 기록(MD)으로부터 채팅방 FAISS 인덱스 일괄 재구축
+
+크래시, 임베딩 방식 변경, 차원 불일치 등으로 인덱스가 비었거나 없을 때
+memory_storage/chatrooms/*_conversation.md 를 다시 읽어 인덱스와 메타데이터를 만듭니다.
+원본 파일의 체크섬이 메타데이터에 기록된 값과 같으면 건너뜁니다.
+
+실행 예시 (backend 디렉토리에서, 서버가 꺼진 상태에서 실행):
+    python rebuild_indexes.py --workers 4 --batch-size 512
+    python rebuild_indexes.py --global   # 채팅방 전체 검색용 전역 인덱스까지
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import faiss
+import numpy as np
+
+from memory_system import (
+    EMBEDDER_VERSION,
+    embed_texts,
+    iter_transcript_messages,
+    write_index_atomic,
+)
+
+DEFAULT_EMBEDDING_DIM = 128
+
+
+def file_checksum(path: str) -> str:
+    """파일 SHA-256 (큰 파일도 조금씩 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_up_to_date(index_path: str, metadata_path: str, checksum: str, embedding_dim: int) -> bool:
+    """기존 인덱스가 같은 원본/임베딩 방식/차원으로 만들어졌는지 확인"""
+    if not (os.path.exists(index_path) and os.path.exists(metadata_path)):
+        return False
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        if metadata.get("source_checksum") != checksum or metadata.get("embedder") != EMBEDDER_VERSION:
+            return False
+        return faiss.read_index(index_path).d == embedding_dim
+    except Exception:
+        return False
+
+
+def ensure_chatroom_metadata(chatrooms_dir: str, room_id: str, messages: List[Dict]):
+    """채팅방 메타데이터(_chatroom.json)가 없으면 대화 기록으로 생성"""
+    metadata_path = f"{chatrooms_dir}/{room_id}_chatroom.json"
+    if os.path.exists(metadata_path):
+        return
+
+    participants = []
+    for msg in messages:
+        if msg["sender"] not in participants:
+            participants.append(msg["sender"])
+    created_at = messages[0]["timestamp"] if messages else datetime.now().isoformat()
+    metadata = {
+        "room_id": room_id,
+        "room_name": f"채팅방 {room_id[:8]}",
+        "topic": f"채팅방 {room_id[:8]}",
+        "created_at": created_at,
+        "participants": participants,
+        "message_count": len(messages),
+        "last_updated": messages[-1]["timestamp"] if messages else created_at
+    }
+    with open(metadata_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+
+def remove_stale_archive(memory_dir: str, room_id: str):
+    """재구축한 핫 인덱스가 전체 원본을 담으므로 이전 요약의 콜드 스토리지는 제거"""
+    for suffix in ("_index.faiss", "_metadata.json"):
+        path = f"{memory_dir}/archive/{room_id}{suffix}"
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def build_index(pool: Optional[ProcessPoolExecutor], texts: List[str], embedding_dim: int,
+                batch_size: int) -> faiss.Index:
+    """텍스트를 배치로 나눠 (프로세스 풀이 있으면 병렬로) 임베딩한 FAISS 인덱스"""
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    if pool is not None:
+        embedded = list(pool.map(embed_texts, batches, [embedding_dim] * len(batches)))
+    else:
+        embedded = [embed_texts(batch, embedding_dim) for batch in batches]
+
+    index = faiss.IndexFlatIP(embedding_dim)
+    if embedded:
+        index.add(np.vstack(embedded).astype('float32'))
+    return index
+
+
+def rebuild_room(pool: Optional[ProcessPoolExecutor], memory_dir: str, room_id: str, md_path: str,
+                 checksum: str, embedding_dim: int, batch_size: int) -> int:
+    """채팅방 하나의 인덱스를 재구축하고 메시지 수를 반환"""
+    messages = list(iter_transcript_messages(md_path))
+    texts = [msg["content"] for msg in messages]
+
+    index = build_index(pool, texts, embedding_dim, batch_size)
+
+    now = datetime.now().isoformat()
+    metadata = {
+        "texts": texts,
+        "data": [{**msg, "room_id": room_id} for msg in messages],
+        "created_at": messages[0]["timestamp"] if messages else now,
+        "count": len(messages),
+        "last_updated": now,
+        "embedder": EMBEDDER_VERSION,
+        "source_checksum": checksum,
+        "rebuilt_at": now
+    }
+
+    chatrooms_dir = f"{memory_dir}/chatrooms"
+    write_index_atomic(index, f"{chatrooms_dir}/{room_id}_index.faiss",
+                       metadata, f"{chatrooms_dir}/{room_id}_metadata.json")
+    ensure_chatroom_metadata(chatrooms_dir, room_id, messages)
+    remove_stale_archive(memory_dir, room_id)
+    return len(messages)
+
+
+def rebuild_global(pool: Optional[ProcessPoolExecutor], memory_dir: str, embedding_dim: int,
+                   batch_size: int) -> int:
+    """모든 대화 기록으로 전역 대화 인덱스(global/conversations)를 재구축하고 메시지 수를 반환"""
+    chatrooms_dir = f"{memory_dir}/chatrooms"
+    messages = []
+    for file in sorted(os.listdir(chatrooms_dir)) if os.path.exists(chatrooms_dir) else []:
+        if file.endswith("_conversation.md"):
+            room_id = file.replace("_conversation.md", "")
+            messages.extend({**msg, "room_id": room_id}
+                            for msg in iter_transcript_messages(f"{chatrooms_dir}/{file}"))
+    messages.sort(key=lambda msg: msg["timestamp"])
+    texts = [msg["content"] for msg in messages]
+
+    index = build_index(pool, texts, embedding_dim, batch_size)
+
+    now = datetime.now().isoformat()
+    metadata = {
+        "texts": texts,
+        "data": messages,
+        "created_at": messages[0]["timestamp"] if messages else now,
+        "count": len(messages),
+        "last_updated": now,
+        "embedder": EMBEDDER_VERSION,
+        "rebuilt_at": now
+    }
+    os.makedirs(f"{memory_dir}/global", exist_ok=True)
+    write_index_atomic(index, f"{memory_dir}/global/conversations_index.faiss",
+                       metadata, f"{memory_dir}/global/conversations_metadata.json")
+    return len(messages)
+
+
+def rebuild_all(memory_dir: str, workers: int = 0, batch_size: int = 512, force: bool = False,
+                room_ids: Optional[List[str]] = None, embedding_dim: int = DEFAULT_EMBEDDING_DIM,
+                dry_run: bool = False, include_global: bool = False) -> Dict:
+    """모든 대화 기록에 대해 인덱스 재구축 후 요약 통계 반환"""
+    chatrooms_dir = f"{memory_dir}/chatrooms"
+    transcripts = sorted(
+        file for file in os.listdir(chatrooms_dir) if file.endswith("_conversation.md")
+    ) if os.path.exists(chatrooms_dir) else []
+    if room_ids:
+        wanted = set(room_ids)
+        transcripts = [file for file in transcripts if file.replace("_conversation.md", "") in wanted]
+
+    summary = {"rooms": len(transcripts), "rebuilt": 0, "skipped": 0, "failed": 0, "messages": 0}
+    started = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 and not dry_run else None
+
+    try:
+        for position, file in enumerate(transcripts, 1):
+            room_id = file.replace("_conversation.md", "")
+            md_path = f"{chatrooms_dir}/{file}"
+            prefix = f"[{position}/{len(transcripts)}] {room_id[:8]}"
+
+            checksum = file_checksum(md_path)
+            index_path = f"{chatrooms_dir}/{room_id}_index.faiss"
+            metadata_path = f"{chatrooms_dir}/{room_id}_metadata.json"
+            if not force and is_up_to_date(index_path, metadata_path, checksum, embedding_dim):
+                summary["skipped"] += 1
+                print(f"⏭️ {prefix} 최신 상태, 건너뜀")
+                continue
+
+            if dry_run:
+                summary["rebuilt"] += 1
+                print(f"📝 {prefix} 재구축 대상")
+                continue
+
+            try:
+                room_started = time.perf_counter()
+                count = rebuild_room(pool, memory_dir, room_id, md_path, checksum, embedding_dim, batch_size)
+                elapsed = time.perf_counter() - room_started
+                summary["rebuilt"] += 1
+                summary["messages"] += count
+                rate = count / elapsed if elapsed > 0 else 0.0
+                print(f"✅ {prefix} 메시지 {count}개, {elapsed:.2f}초 ({rate:,.0f} msg/s)")
+            except Exception as e:
+                summary["failed"] += 1
+                print(f"❌ {prefix} 재구축 실패: {e}")
+
+        if include_global and not dry_run:
+            global_started = time.perf_counter()
+            count = rebuild_global(pool, memory_dir, embedding_dim, batch_size)
+            summary["global_messages"] = count
+            print(f"🌐 전역 대화 인덱스: 메시지 {count}개, {time.perf_counter() - global_started:.2f}초")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_s"] = round(elapsed, 3)
+    summary["throughput_msgs_per_s"] = round(summary["messages"] / elapsed, 1) if elapsed > 0 else 0.0
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="대화 기록으로 채팅방 인덱스 재구축")
+    parser.add_argument("--memory-dir", default="memory_storage", help="메모리 저장 디렉토리")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="임베딩 프로세스 수 (0이면 현재 프로세스에서 처리)")
+    parser.add_argument("--batch-size", type=int, default=512, help="임베딩 배치 크기")
+    parser.add_argument("--rooms", default=None, help="재구축할 채팅방 ID (쉼표 구분, 기본: 전체)")
+    parser.add_argument("--force", action="store_true", help="체크섬이 같아도 다시 만듦")
+    parser.add_argument("--dry-run", action="store_true", help="재구축 대상만 출력")
+    parser.add_argument("--global", dest="include_global", action="store_true",
+                        help="모든 대화 기록으로 전역 대화 인덱스도 재구축")
+    args = parser.parse_args(argv)
+
+    room_ids = [r.strip() for r in args.rooms.split(",") if r.strip()] if args.rooms else None
+    summary = rebuild_all(args.memory_dir, args.workers, args.batch_size, args.force, room_ids,
+                          dry_run=args.dry_run, include_global=args.include_global)
+    print(f"🏁 완료: 재구축 {summary['rebuilt']}개, 건너뜀 {summary['skipped']}개, 실패 {summary['failed']}개, "
+          f"메시지 {summary['messages']}개, {summary['elapsed_s']}초 "
+          f"({summary['throughput_msgs_per_s']:,.0f} msg/s)")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""웹 검색/조사 결과 캐시
+
+같은 토론에서 에이전트들이 거의 같은 질의(조사, SerpAPI, DuckDuckGo)를 반복해 매번 네트워크를 타고
+API 사용량을 쓰던 것을 막습니다. (제공자, 정규화한 질의)를 키로 결과 문자열을 저장합니다.
+메모리 LRU → 디스크(JSON 파일) 순으로 조회하고, 제공자마다 TTL이 다릅니다.
+
+질의 정규화: 유니코드 NFKC, 소문자, 문장부호/공백 정리, 단어 끝 조사 제거
+  ("AI의 최신 동향은?" 과 "ai 최신 동향" 은 같은 키)
+
+Stale-while-revalidate: TTL이 지났어도 stale 기간 안이면 저장된 결과를 바로 돌려주고 뒤에서 새로 가져와
+갱신합니다 (같은 키는 한 번만 갱신). 자주 쓰는 주제는 항상 즉시 응답합니다.
+
+환경 변수:
+  RESEARCH_CACHE_MODE          : "on"(기본) / "off"
+  RESEARCH_CACHE_DIR           : 디스크 저장 위치 (기본 research_cache)
+  RESEARCH_CACHE_TTL_<제공자>   : 제공자별 TTL(초), 예: RESEARCH_CACHE_TTL_SERPAPI=3600
+  RESEARCH_CACHE_STALE         : TTL 이후 stale 결과를 쓰며 갱신하는 기간(초, 기본 1일)
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+CACHE_MODES = ("on", "off")
+# 제공자별 기본 TTL(초): 검색 결과는 빨리 바뀌고 조사 요약은 비교적 오래 유효
+DEFAULT_TTLS = {"openai": 86400.0, "serpapi": 6 * 3600.0, "duckduckgo": 12 * 3600.0}
+FALLBACK_TTL = 6 * 3600.0
+
+# 긴 조사부터 비교해야 "에서"가 "서"보다 먼저 떨어짐
+KOREAN_PARTICLES = tuple(sorted((
+    "은", "는", "이", "가", "을", "를", "의", "에", "에서", "에게", "께", "한테", "으로", "로", "와", "과",
+    "도", "만", "까지", "부터", "보다", "처럼", "이나", "나", "이란", "란", "이라는", "라는", "에는", "에서는",
+    "으로는", "로는", "과의", "와의", "에의", "이랑", "랑", "하고",
+), key=len, reverse=True))
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+_HANGUL_RE = re.compile(r"[가-힣]")
+
+
+def _strip_particle(word: str) -> str:
+    # 조사를 떼고도 두 글자 이상 남을 때만 뗌 ("국가", "평가"처럼 조사로 끝나는 듯한 두 글자 단어는 그대로)
+    if not _HANGUL_RE.match(word[-1]):
+        return word
+    for particle in KOREAN_PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= 2:
+            return word[:-len(particle)]
+    return word
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 질의 정규화 (대소문자, 공백, 문장부호, 한국어 조사)"""
+    text = unicodedata.normalize("NFKC", query or "").lower()
+    text = _PUNCT_RE.sub(" ", text)
+    words = [_strip_particle(word) for word in _SPACE_RE.split(text) if word]
+    return " ".join(words)
+
+
+def make_cache_key(provider: str, query: str) -> str:
+    payload = json.dumps([provider, normalize_query(query)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResearchCache:
+    """제공자별 TTL + 메모리 LRU + 디스크 저장소 + stale-while-revalidate"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 2048,
+                 stale_seconds: Optional[float] = None, mode: Optional[str] = None):
+        self.cache_dir = cache_dir or os.getenv("RESEARCH_CACHE_DIR", "research_cache")
+        self.max_entries = max_entries
+        self.stale_seconds = (stale_seconds if stale_seconds is not None
+                              else float(os.getenv("RESEARCH_CACHE_STALE", "86400")))
+        self.mode = mode or os.getenv("RESEARCH_CACHE_MODE", "on")
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"지원하지 않는 캐시 모드: {self.mode} (가능: {', '.join(CACHE_MODES)})")
+
+        self._entries = OrderedDict()  # 키 → {"provider", "query", "result", "created_at"}
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="research-refresh")
+        self.hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def ttl_for(self, provider: str) -> float:
+        env = os.getenv(f"RESEARCH_CACHE_TTL_{provider.upper()}")
+        return float(env) if env else DEFAULT_TTLS.get(provider, FALLBACK_TTL)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _age_state(self, entry: Dict) -> str:
+        """fresh / stale / expired"""
+        age = time.time() - entry["created_at"]
+        ttl = self.ttl_for(entry["provider"])
+        if age <= ttl:
+            return "fresh"
+        return "stale" if age <= ttl + self.stale_seconds else "expired"
+
+    def _load(self, key: str) -> Optional[Dict]:
+        """메모리 → 디스크 순으로 항목 조회 (기간이 완전히 지난 항목은 삭제)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        from_disk = entry is None
+        if from_disk:
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None
+
+        if self._age_state(entry) == "expired":
+            with self._lock:
+                self._entries.pop(key, None)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            return None
+        if from_disk:
+            with self._lock:
+                self._remember(key, entry)
+                self.disk_hits += 1
+        return entry
+
+    def _remember(self, key: str, entry: Dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def contains(self, provider: str, query: str) -> bool:
+        """신선하거나 stale 기간인 결과가 있는지 (통계에 세지 않음)"""
+        if self.mode == "off":
+            return False
+        key = make_cache_key(provider, query)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return os.path.exists(self._path(key))
+        return self._age_state(entry) != "expired"
+
+    def put(self, provider: str, query: str, result: str):
+        if self.mode == "off":
+            return
+        key = make_cache_key(provider, query)
+        entry = {"provider": provider, "query": query, "result": result, "created_at": time.time()}
+        with self._lock:
+            self._remember(key, entry)
+            self.stores += 1
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _refresh(self, key: str, provider: str, query: str, fetch: Callable[[], str],
+                 accept: Callable[[str], bool]):
+        try:
+            result = fetch()
+            if result and accept(result):
+                self.put(provider, query, result)
+                with self._lock:
+                    self.refreshes += 1
+            else:
+                with self._lock:
+                    self.refresh_failures += 1
+        except Exception:
+            with self._lock:
+                self.refresh_failures += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def fetch(self, provider: str, query: str, fetch: Callable[[], str],
+              accept: Callable[[str], bool], refresh: Optional[Callable[[], str]] = None) -> str:
+        """캐시를 거쳐 결과 반환: 신선하면 그대로, stale이면 그대로 돌려주고 뒤에서 갱신, 없으면 fetch()
+
+        accept(결과)가 참인 결과(오류 안내 문구가 아닌 것)만 저장합니다.
+        refresh: 뒤에서 갱신할 때 쓸 함수 (기본 fetch, 호출자의 취소 토큰이 묶이지 않은 버전을 넘김)
+        """
+        if self.mode == "off":
+            return fetch()
+
+        key = make_cache_key(provider, query)
+        entry = self._load(key)
+        if entry is not None:
+            if self._age_state(entry) == "fresh":
+                with self._lock:
+                    self.hits += 1
+                return entry["result"]
+            with self._lock:
+                self.stale_hits += 1
+                start_refresh = key not in self._refreshing
+                if start_refresh:
+                    self._refreshing.add(key)
+            if start_refresh:
+                self._refresher.submit(self._refresh, key, provider, query, refresh or fetch, accept)
+            return entry["result"]
+
+        with self._lock:
+            self.misses += 1
+        result = fetch()
+        if result and accept(result):
+            self.put(provider, query, result)
+        return result
+
+    def clear(self, disk: bool = False):
+        with self._lock:
+            self._entries.clear()
+        if disk and os.path.exists(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "mode": self.mode,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": {provider: self.ttl_for(provider) for provider in DEFAULT_TTLS},
+                "stale_seconds": self.stale_seconds,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "refreshing": len(self._refreshing),
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+            }
+
+
+# 전역 인스턴스
+research_cache = ResearchCache()
@@ -0,0 +1,157 @@
+"""누적 토론 요약과 토큰 예산
+
+결론/심화 질문 프롬프트에 chat_history 전체를 붙이면 토론이 길어질수록 지연과 비용이 끝없이 늘어납니다.
+RunningSummary는 새 메시지가 update_interval개 쌓일 때마다 (이전 요약 문장 + 새 메시지)만 다시
+추출 요약하므로 갱신 비용은 새 메시지 수에 비례하고, 프롬프트는 "요약 + 최근 대화"를 토큰 예산
+안에서 구성합니다.
+
+토큰 수는 tiktoken이 설치되어 있으면 실제 토크나이저로, 없으면 문자 종류별 추정치로 셉니다.
+"""
+import threading
+from typing import Dict, List, Optional
+
+from summarizer import extractive_summary
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # 미설치 또는 인코딩 파일을 받을 수 없는 환경
+    _encoding = None
+
+TOKENIZER = "tiktoken:cl100k_base" if _encoding is not None else "estimate"
+RECENT_HEADER = "[최근 대화]\n"
+
+
+def count_tokens(text: str) -> int:
+    """텍스트의 토큰 수 (tiktoken이 없으면 추정: 한글 등 비ASCII 1자≈1토큰, ASCII 4자≈1토큰)"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + (ascii_chars + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """앞에서부터 max_tokens 안에 들어가는 만큼만 남김"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text)[:max_tokens])
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low]
+
+
+def format_message(msg) -> str:
+    return f"{msg.sender}: {msg.content}"
+
+
+class RunningSummary:
+    """update_interval개 메시지마다 점진적으로 갱신되는 추출 요약
+
+    요약에 반영된 마지막 메시지(id, 시각)를 기억해 두고, 다음 갱신 때는 그 이후 메시지만 읽습니다.
+    갱신은 llm_executor 스레드에서 돌 수 있도록 잠금으로 보호됩니다.
+    """
+
+    SKIPPED_TYPES = ("system",)
+
+    def __init__(self, update_interval: int = 6, max_sentences: int = 12):
+        self.update_interval = update_interval
+        self.max_sentences = max_sentences
+        self.sentences: List[Dict] = []  # {"sender", "sentence"}
+        self.covered_count = 0
+        self.last_message_id: Optional[str] = None
+        self.last_timestamp = None
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def _new_messages(self, history: List) -> List:
+        """요약에 아직 반영되지 않은 메시지 (시스템 메시지 제외)"""
+        start = 0
+        if self.last_message_id is not None:
+            for i in range(len(history) - 1, -1, -1):
+                if history[i].message_id == self.last_message_id:
+                    start = i + 1
+                    break
+            else:
+                # 마지막으로 반영한 메시지가 압축으로 빠졌으면 시각으로 이어서 읽음 (압축 요약 메시지 포함)
+                return [m for m in history
+                        if m.timestamp > self.last_timestamp and m.message_type not in self.SKIPPED_TYPES]
+        return [m for m in history[start:]
+                if m.message_type not in self.SKIPPED_TYPES and m.message_type != "summary"]
+
+    def pending_count(self, history: List) -> int:
+        return len(self._new_messages(history))
+
+    def update(self, history: List, force: bool = False) -> bool:
+        """새 메시지가 update_interval개 이상이면(force면 1개 이상) 요약을 갱신"""
+        with self._lock:
+            new_messages = self._new_messages(history)
+            if not new_messages or (not force and len(new_messages) < self.update_interval):
+                return False
+
+            candidates = [{"sentences": self.sentences}] if self.sentences else []
+            candidates.extend(
+                {"sender": m.sender, "content": m.content, "sentences": getattr(m, "sentences", None)}
+                for m in new_messages
+            )
+            self.sentences = extractive_summary(candidates, max_sentences=self.max_sentences)
+            self.covered_count += sum(getattr(m, "covered_count", 1) for m in new_messages)
+            self.last_message_id = new_messages[-1].message_id
+            self.last_timestamp = new_messages[-1].timestamp
+            self.updates += 1
+            return True
+
+    def render(self) -> str:
+        with self._lock:
+            if not self.sentences:
+                return ""
+            lines = [f"[지금까지의 토론 요약] ({self.covered_count}개 메시지)"]
+            lines.extend(f"- {item['sender']}: {item['sentence']}" for item in self.sentences)
+            return "\n".join(lines)
+
+    def build_context(self, history: List, token_budget: int) -> str:
+        """요약 + 최근 대화를 token_budget 안에서 구성 (최근 대화는 최신 메시지부터 채움)
+
+        요약은 예산의 절반까지만 쓰고, 남은 예산으로 원문 메시지를 최신순으로 넣습니다.
+        """
+        summary = truncate_to_tokens(self.render(), token_budget // 2)
+        # 구분 줄바꿈과 "[최근 대화]" 머리말도 예산에 포함
+        remaining = token_budget - count_tokens(summary) - count_tokens("\n\n" + RECENT_HEADER)
+
+        tail = []
+        for msg in reversed(history):
+            if msg.message_type in self.SKIPPED_TYPES or msg.message_type == "summary":
+                continue
+            line = format_message(msg)
+            cost = count_tokens(line) + 1
+            if cost > remaining:
+                if not tail:
+                    # 가장 최근 메시지는 잘라서라도 포함
+                    tail.append(truncate_to_tokens(line, max(remaining - 1, 0)))
+                break
+            tail.append(line)
+            remaining -= cost
+
+        parts = []
+        if summary:
+            parts.append(summary)
+        if tail:
+            parts.append(RECENT_HEADER + "\n".join(reversed(tail)))
+        return "\n\n".join(parts)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "tokenizer": TOKENIZER,
+                "update_interval": self.update_interval,
+                "sentences": len(self.sentences),
+                "covered_messages": self.covered_count,
+                "updates": self.updates
+            }
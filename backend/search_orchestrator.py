@@ -0,0 +1,207 @@
+"""웹 검색 제공자 경주(hedging)
+
+web_search_tool은 OpenAI 조사 → SerpAPI → DuckDuckGo를 차례로 시도해, 앞 단계가 느리거나 실패하면
+그 시간(각각 최대 10초 이상)이 그대로 발언 지연에 더해졌습니다. SearchOrchestrator는 제공자마다
+시작 지연(hedge_delay)을 두고 동시에 실행합니다.
+  - 제공자 i는 검색 시작 후 hedge_delay초가 지났거나, 먼저 시작한 제공자가 모두 실패하면 시작
+  - 먼저 도착한 "쓸 만한" 결과를 채택하고 나머지는 취소 (시작 전이면 아예 시작하지 않음)
+  - 전체 마감 시간(deadline)을 넘기면 결과 없이 반환
+
+전략(SEARCH_STRATEGY 환경 변수):
+  hedged     : 우선순위 순으로 시작 지연을 둠 (기본, 0초 / 1.5초 / 3초)
+  parallel   : 모든 제공자를 동시에 시작
+  sequential : 앞 제공자가 실패해야 다음 제공자 시작 (기존 동작)
+
+진 제공자 처리(SEARCH_LOSERS 환경 변수):
+  cancel : 취소 토큰을 취소해 진행 중인 요청의 연결을 닫음 (기본)
+  drain  : 취소하지 않고 제공자 시간 제한 안에서 마저 받게 둠. 결과는 버리지만 research_cache가 채워지고
+           연결이 풀로 돌아감. 취소가 아니므로 "cancelled"가 아닌 "drained"로 기록
+
+제공자별 시작/승리/실패/취소/drained 횟수와 지연은 get_stats()와 /metrics의 도구 호출 지표로 기록됩니다.
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from cancellation import CancellationToken
+from metrics import observe_tool_call, percentile, tool_calls
+
+STRATEGIES = ("hedged", "parallel", "sequential")
+LOSER_POLICIES = ("cancel", "drain")
+# hedged 전략에서 우선순위별 시작 지연(초)
+DEFAULT_HEDGE_DELAYS = (0.0, 1.5, 3.0)
+
+
+@dataclass
+class SearchProvider:
+    """검색 제공자: search(query, cancel_token) → 결과 문자열, accept(결과) → 채택 가능 여부"""
+    name: str
+    search: Callable[[str, CancellationToken], str]
+    accept: Callable[[str], bool]
+
+
+class ProviderStats:
+    def __init__(self, window: int = 500):
+        self.launched = 0
+        self.wins = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.drained = 0
+        self.latencies = deque(maxlen=window)
+
+    def to_dict(self, searches: int) -> Dict:
+        latencies = list(self.latencies)
+        return {
+            "launched": self.launched,
+            "wins": self.wins,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "drained": self.drained,
+            "win_rate": round(self.wins / searches, 4) if searches else 0.0,
+            "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+            "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        }
+
+
+class SearchOrchestrator:
+    """제공자들을 시작 지연을 두고 경주시켜 먼저 도착한 쓸 만한 결과를 반환"""
+
+    def __init__(self, strategy: Optional[str] = None, deadline_s: Optional[float] = None,
+                 hedge_delays=DEFAULT_HEDGE_DELAYS, max_workers: int = 16, losers: Optional[str] = None):
+        self.strategy = strategy or os.getenv("SEARCH_STRATEGY", "hedged")
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"지원하지 않는 검색 전략: {self.strategy} (가능: {', '.join(STRATEGIES)})")
+        self.losers = losers or os.getenv("SEARCH_LOSERS", "cancel")
+        if self.losers not in LOSER_POLICIES:
+            raise ValueError(f"지원하지 않는 진 제공자 처리 방식: {self.losers} (가능: {', '.join(LOSER_POLICIES)})")
+        self.deadline_s = deadline_s if deadline_s is not None else float(os.getenv("SEARCH_DEADLINE", "12"))
+        self.hedge_delays = tuple(hedge_delays)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+        self._lock = threading.Lock()
+        self._providers: Dict[str, ProviderStats] = {}
+        self.searches = 0
+        self.no_result = 0
+        self.deadline_exceeded = 0
+        self.latencies = deque(maxlen=500)
+
+    def _hedge_delay(self, position: int) -> float:
+        if self.strategy == "parallel":
+            return 0.0
+        if self.strategy == "sequential":
+            return 0.0 if position == 0 else float("inf")
+        return self.hedge_delays[min(position, len(self.hedge_delays) - 1)]
+
+    def _stats(self, name: str) -> ProviderStats:
+        stats = self._providers.get(name)
+        if stats is None:
+            stats = self._providers[name] = ProviderStats()
+        return stats
+
+    def _run_provider(self, provider: SearchProvider, query: str, token: CancellationToken):
+        started = time.perf_counter()
+        try:
+            result = provider.search(query, token)
+            ok = not token.cancelled and bool(result) and provider.accept(result)
+        except Exception:
+            result, ok = None, False
+        return result, ok, time.perf_counter() - started
+
+    def search(self, query: str, providers: List[SearchProvider]) -> Dict:
+        """반환: {"result": 채택된 결과 또는 None, "provider", "elapsed_s", "launched": [...], "deadline_exceeded"}"""
+        started = time.perf_counter()
+        deadline = started + self.deadline_s
+        pending = {}  # future -> (provider, token)
+        launched: List[str] = []
+        next_index = 0
+        winner = None
+        timed_out = False
+
+        while True:
+            now = time.perf_counter()
+            # 시작 지연이 지났거나 진행 중인 제공자가 없으면(모두 실패) 다음 제공자 시작
+            while next_index < len(providers) and (
+                    now - started >= self._hedge_delay(next_index) or not pending):
+                provider = providers[next_index]
+                token = CancellationToken(f"search:{provider.name}")
+                pending[self._executor.submit(self._run_provider, provider, query, token)] = (provider, token)
+                launched.append(provider.name)
+                with self._lock:
+                    self._stats(provider.name).launched += 1
+                next_index += 1
+            if not pending:
+                break
+            if now >= deadline:
+                timed_out = True
+                break
+
+            timeout = deadline - now
+            if next_index < len(providers):
+                timeout = min(timeout, max(0.0, started + self._hedge_delay(next_index) - now))
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider, _token = pending.pop(future)
+                result, ok, elapsed = future.result()
+                observe_tool_call("web_search", provider.name, ok, elapsed)
+                with self._lock:
+                    stats = self._stats(provider.name)
+                    stats.latencies.append(elapsed)
+                    if ok and winner is None:
+                        stats.wins += 1
+                    elif not ok:
+                        stats.failures += 1
+                if ok and winner is None:
+                    winner = (provider.name, result)
+            if winner is not None:
+                break
+
+        # 진 제공자는 취소 (취소 토큰을 쓰는 제공자는 요청을 끊음), drain이면 마저 받게 둠. 늦게 도착한 결과는 버림
+        for provider, token in pending.values():
+            if self.losers == "drain":
+                tool_calls.inc(tool="web_search", provider=provider.name, outcome="drained")
+                with self._lock:
+                    self._stats(provider.name).drained += 1
+                continue
+            token.cancel("lost race" if winner else "deadline")
+            tool_calls.inc(tool="web_search", provider=provider.name, outcome="cancelled")
+            with self._lock:
+                self._stats(provider.name).cancelled += 1
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.searches += 1
+            self.latencies.append(elapsed)
+            if winner is None:
+                self.no_result += 1
+                if timed_out:
+                    self.deadline_exceeded += 1
+        return {
+            "result": winner[1] if winner else None,
+            "provider": winner[0] if winner else None,
+            "elapsed_s": elapsed,
+            "launched": launched,
+            "deadline_exceeded": timed_out and winner is None,
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            latencies = list(self.latencies)
+            return {
+                "strategy": self.strategy,
+                "losers": self.losers,
+                "deadline_s": self.deadline_s,
+                "hedge_delays_s": [self._hedge_delay(i) for i in range(len(self.hedge_delays))],
+                "searches": self.searches,
+                "no_result": self.no_result,
+                "deadline_exceeded": self.deadline_exceeded,
+                "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+                "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+                "providers": {name: stats.to_dict(self.searches) for name, stats in self._providers.items()},
+            }
+
+
+# 전역 인스턴스
+search_orchestrator = SearchOrchestrator()
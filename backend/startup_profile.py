@@ -0,0 +1,151 @@
+"""서버 시작 시간 측정
+
+실행 중인 서버: startup_profile이 시작 단계(메모리 시스템 초기화, 토론 모듈 import, 에이전트 풀 예열)와
+지연 import된 모듈의 소요 시간을 기록하고 GET /api/debug/startup 으로 보여줍니다.
+
+배포 점검: `python -X importtime`으로 `import main`을 새 프로세스에서 측정해 최상위 패키지별로 합산합니다.
+    python -m startup_profile --max-ms 1500        # 넘으면 종료 코드 1
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# 이 모듈이 처음 import된 시각 ≈ main.py 로드 시작
+PROCESS_T0 = time.perf_counter()
+
+
+class StartupProfile:
+    """시작 단계와 지연 import 소요 시간 기록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phases: "OrderedDict[str, Dict]" = OrderedDict()
+        self.imports: "OrderedDict[str, Dict]" = OrderedDict()
+        self.ready_s: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """with startup_profile.phase("memory_system"): ... 형태로 단계 시간 기록"""
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except Exception as e:
+            status = f"error: {e}"
+            raise
+        finally:
+            self.record(name, started, status)
+
+    def record(self, name: str, started: float, status: str = "ok"):
+        """started(perf_counter)부터 지금까지를 단계 name으로 기록"""
+        with self._lock:
+            self.phases[name] = {
+                "started_at_s": round(started - PROCESS_T0, 4),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "status": status,
+                "thread": threading.current_thread().name,
+            }
+
+    def import_module(self, name: str):
+        """모듈을 (처음이면 시간을 재며) import
+
+        다른 스레드(백그라운드 예열)가 import하는 중이면 importlib이 모듈 잠금에서 끝날 때까지 기다리므로,
+        sys.modules에 있더라도 반드시 importlib을 거쳐야 초기화가 덜 된 모듈을 받지 않습니다.
+        """
+        first = name not in sys.modules
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        if not first:
+            return module
+        with self._lock:
+            self.imports.setdefault(name, {
+                "started_at_s": round(started - PROCESS_T0, 4),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "thread": threading.current_thread().name,
+            })
+        return module
+
+    def mark_ready(self):
+        """요청을 받을 수 있게 된 시점 (startup 훅 완료)"""
+        self.ready_s = time.perf_counter() - PROCESS_T0
+
+    def get_report(self) -> Dict:
+        with self._lock:
+            return {
+                "ready_ms": round(self.ready_s * 1000, 2) if self.ready_s is not None else None,
+                "phases": dict(self.phases),
+                "lazy_imports": dict(self.imports),
+            }
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """-X importtime 출력 → [{"module", "self_us", "cumulative_us", "depth"}]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            parts = line[len("import time:"):].split("|")
+            self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        except (ValueError, IndexError):
+            continue
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append({"module": name.strip(), "self_us": self_us, "cumulative_us": cumulative_us, "depth": depth})
+    return rows
+
+
+def measure_import_time(target: str = "main", top: int = 15, cwd: Optional[str] = None) -> Dict:
+    """새 프로세스에서 target을 import하며 최상위 패키지별 self 시간 합계를 구함"""
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=cwd, capture_output=True, text=True
+    )
+    rows = parse_importtime(result.stderr)
+    by_package: Dict[str, int] = {}
+    for row in rows:
+        package = row["module"].split(".")[0]
+        by_package[package] = by_package.get(package, 0) + row["self_us"]
+    total_us = next((r["cumulative_us"] for r in rows if r["module"] == target), sum(by_package.values()))
+    ranked = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "target": target,
+        "returncode": result.returncode,
+        "total_ms": round(total_us / 1000, 2),
+        "modules": len(rows),
+        "top_packages": [{"package": name, "self_ms": round(us / 1000, 2)} for name, us in ranked],
+    }
+
+
+# 전역 인스턴스
+startup_profile = StartupProfile()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="백엔드 import 시간 측정 (배포 시 시작 시간 점검)")
+    parser.add_argument("--target", default="main", help="측정할 모듈 (기본: main)")
+    parser.add_argument("--top", type=int, default=15, help="표시할 패키지 수")
+    parser.add_argument("--max-ms", type=float, default=None, help="총 import 시간 상한 (넘으면 종료 코드 1)")
+    args = parser.parse_args(argv)
+
+    report = measure_import_time(args.target, args.top)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if report["returncode"] != 0:
+        print(f"❌ {args.target} import 실패", file=sys.stderr)
+        return 1
+    if args.max_ms is not None and report["total_ms"] > args.max_ms:
+        print(f"❌ import 시간 {report['total_ms']}ms > 상한 {args.max_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
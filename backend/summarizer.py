@@ -0,0 +1,95 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# 문장 경계: 마침표/물음표/느낌표 또는 줄바꿈
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?。])\s+|\n+')
+
+
+def char_ngrams(text: str, sizes: Tuple[int, ...] = (2, 3)) -> Counter:
+    """공백을 제거한 문자 n-gram 빈도 (한국어는 형태소 분석 없이도 어절 일부가 잘 맞음)"""
+    normalized = re.sub(r'\s+', ' ', text.lower()).strip()
+    grams = Counter()
+    for token in normalized.split(' '):
+        if not token:
+            continue
+        if len(token) < min(sizes):
+            grams[token] += 1
+            continue
+        for n in sizes:
+            for i in range(len(token) - n + 1):
+                grams[token[i:i + n]] += 1
+    return grams
+
+
+def split_sentences(text: str) -> List[str]:
+    """텍스트를 문장 단위로 분리"""
+    return [s.strip() for s in SENTENCE_SPLIT_PATTERN.split(text) if s and len(s.strip()) > 1]
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(count * b.get(gram, 0) for gram, count in a.items())
+    if dot == 0:
+        return 0.0
+    norm_a = math.sqrt(sum(c * c for c in a.values()))
+    norm_b = math.sqrt(sum(c * c for c in b.values()))
+    return dot / (norm_a * norm_b)
+
+
+def rank_by_centrality(texts: List[str]) -> List[float]:
+    """각 텍스트가 나머지 텍스트들과 얼마나 비슷한지(중심성) 점수화"""
+    vectors = [char_ngrams(text) for text in texts]
+    scores = [0.0] * len(texts)
+    for i in range(len(vectors)):
+        for j in range(i + 1, len(vectors)):
+            similarity = _cosine(vectors[i], vectors[j])
+            scores[i] += similarity
+            scores[j] += similarity
+    return scores
+
+
+def extractive_summary(messages: List[Dict], max_sentences: int = 5,
+                       redundancy_threshold: float = 0.8) -> List[Dict]:
+    """메시지 묶음에서 중심성이 높은 문장을 골라 원래 순서대로 반환 (LLM 미사용)
+
+    messages: {"sender": str, "content": str} 목록. 이전 요약을 다시 요약할 때는
+              "sentences"에 이전에 고른 문장 목록을 넘기면 그 문장들이 후보가 됩니다.
+    반환: {"sender": str, "sentence": str} 목록
+    """
+    candidates = []
+    for msg in messages:
+        if msg.get("sentences"):
+            candidates.extend(msg["sentences"])
+            continue
+        for sentence in split_sentences(msg.get("content", "")):
+            candidates.append({"sender": msg.get("sender", ""), "sentence": sentence})
+
+    if len(candidates) <= max_sentences:
+        return candidates
+
+    scores = rank_by_centrality([c["sentence"] for c in candidates])
+    vectors = [char_ngrams(c["sentence"]) for c in candidates]
+
+    # 중심성 순으로 고르되 이미 고른 문장과 거의 같은 문장은 건너뜀 (중복 억제)
+    top = []
+    for i in sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True):
+        if any(_cosine(vectors[i], vectors[j]) > redundancy_threshold for j in top):
+            continue
+        top.append(i)
+        if len(top) >= max_sentences:
+            break
+    return [candidates[i] for i in sorted(top)]
+
+
+def format_summary(selected: List[Dict], message_count: int, period: str = "") -> str:
+    """추출된 문장들을 요약 텍스트로 구성"""
+    header = f"[요약] {period} ({message_count}개 메시지)" if period else f"[요약] ({message_count}개 메시지)"
+    lines = [header]
+    for item in selected:
+        lines.append(f"- {item['sender']}: {item['sentence']}")
+    return "\n".join(lines)
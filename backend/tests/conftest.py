@@ -0,0 +1,7 @@
+"""backend 모듈을 benchmarks와 같은 방식(backend 디렉토리 기준 import)으로 불러오도록 경로 추가"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
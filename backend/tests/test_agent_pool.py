@@ -0,0 +1,100 @@
+"""AgentPool: 페르소나/접속 설정 기반 키, LRU, Crew 실행 직렬화"""
+import threading
+import time
+
+import pytest
+
+import agent_pool as agent_pool_module
+from agent_pool import AgentPool, persona_key
+
+PERSONA = {"role": "분석가", "goal": "시장 분석", "backstory": "10년 경력"}
+SETTINGS = {"api_key": "sk-test", "base_url": None}
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    current = dict(SETTINGS)
+    monkeypatch.setattr(agent_pool_module, "_openai_settings", lambda: dict(current))
+    return current
+
+
+@pytest.fixture
+def pool(monkeypatch, settings):
+    # CrewAI Agent/LLM 대신 생성 인자를 담은 객체를 만들어 키와 재사용만 확인
+    pool = AgentPool(max_size=2, enabled=True)
+    monkeypatch.setattr(pool, "_get_llm", lambda llm_settings: ("llm", llm_settings["api_key"], llm_settings["base_url"]))
+    monkeypatch.setattr(pool, "_build", lambda persona, llm: {"persona": dict(persona), "llm": llm})
+    return pool
+
+
+def test_persona_key_covers_persona_model_and_settings():
+    base = persona_key(PERSONA, "gpt-4o-mini", SETTINGS)
+    assert base == persona_key(dict(PERSONA), "gpt-4o-mini", dict(SETTINGS))
+    assert base != persona_key({**PERSONA, "goal": "다른 목표"}, "gpt-4o-mini", SETTINGS)
+    assert base != persona_key(PERSONA, "gpt-4o", SETTINGS)
+    assert base != persona_key(PERSONA, "gpt-4o-mini", {**SETTINGS, "base_url": "http://localhost:8000/v1"})
+    assert base != persona_key(PERSONA, "gpt-4o-mini", {**SETTINGS, "api_key": "sk-other"})
+
+
+def test_same_persona_is_reused(pool):
+    first = pool.get(PERSONA)
+    assert pool.get(dict(PERSONA)) is first
+    stats = pool.get_stats()
+    assert stats["hits"] == 1 and stats["size"] == 1
+
+
+def test_changed_settings_build_new_agent(pool, settings):
+    first = pool.get(PERSONA)
+    settings["base_url"] = "http://localhost:8000/v1"
+    second = pool.get(PERSONA)
+    assert second is not first
+    assert second["llm"] == ("llm", "sk-test", "http://localhost:8000/v1")
+
+
+def test_least_recently_used_agent_is_evicted(pool):
+    first = pool.get(PERSONA)
+    pool.get({**PERSONA, "role": "투자자"})
+    pool.get({**PERSONA, "role": "기술자"})
+    assert pool.get_stats()["size"] == 2
+    assert pool.get(PERSONA) is not first
+
+
+def test_exclusive_serializes_shared_agents():
+    pool = AgentPool(enabled=True)
+    shared, other = object(), object()
+    active = []
+    overlaps = []
+
+    def run(agents):
+        with pool.exclusive(agents):
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(True)
+            time.sleep(0.05)
+            active.pop()
+
+    threads = [threading.Thread(target=run, args=([shared, other],)),
+               threading.Thread(target=run, args=([other, shared],)),
+               threading.Thread(target=run, args=([shared],))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert not any(thread.is_alive() for thread in threads)
+    assert not overlaps
+
+
+def test_exclusive_does_not_block_unrelated_agents():
+    pool = AgentPool(enabled=True)
+    first, second = object(), object()
+    entered = threading.Event()
+
+    def other():
+        with pool.exclusive([second]):
+            entered.set()
+
+    with pool.exclusive([first]):
+        thread = threading.Thread(target=other)
+        thread.start()
+        assert entered.wait(1.0)
+    thread.join()
@@ -0,0 +1,70 @@
+"""CancellationToken: 취소 신호, 콜백 등록/해제, TurnCancelled"""
+import threading
+
+import pytest
+
+from cancellation import CancellationToken, TurnCancelled
+
+
+def test_cancel_sets_reason_and_runs_callbacks_once():
+    token = CancellationToken("turn")
+    calls = []
+    token.on_cancel(lambda: calls.append("a"))
+    token.on_cancel(lambda: calls.append("b"))
+    token.cancel("timeout")
+    token.cancel("stop")
+    assert token.cancelled
+    assert token.reason == "timeout"
+    assert calls == ["a", "b"]
+
+
+def test_callback_registered_after_cancel_runs_immediately():
+    token = CancellationToken()
+    token.cancel()
+    calls = []
+    token.on_cancel(lambda: calls.append(1))
+    assert calls == [1]
+
+
+def test_removed_callback_is_not_called():
+    token = CancellationToken()
+    calls = []
+
+    def callback():
+        calls.append(1)
+
+    token.on_cancel(callback)
+    token.remove_callback(callback)
+    token.remove_callback(callback)  # 없는 콜백 해제는 무시
+    token.cancel()
+    assert calls == []
+
+
+def test_failing_callback_does_not_stop_others():
+    token = CancellationToken("turn")
+    calls = []
+
+    def broken():
+        raise RuntimeError("close failed")
+
+    token.on_cancel(broken)
+    token.on_cancel(lambda: calls.append(1))
+    token.cancel()
+    assert calls == [1]
+
+
+def test_raise_if_cancelled():
+    token = CancellationToken("발언")
+    token.raise_if_cancelled()
+    token.cancel("pause")
+    with pytest.raises(TurnCancelled, match="pause"):
+        token.raise_if_cancelled()
+
+
+def test_cancel_from_another_thread_wakes_waiting_work():
+    token = CancellationToken()
+    released = threading.Event()
+    token.on_cancel(released.set)
+    threading.Timer(0.05, token.cancel, args=("stop",)).start()
+    assert released.wait(1.0)
+    assert token.cancelled
@@ -0,0 +1,156 @@
+"""CircuitBreaker 상태 전이 (closed → open → half_open → closed/open)"""
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+def make_breaker(**kwargs):
+    options = dict(failure_rate=0.5, window=10, min_calls=4, open_seconds=30, max_open_seconds=100)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def trip(breaker, failures=4):
+    for _ in range(failures):
+        assert breaker.allow()
+        breaker.record_failure("boom")
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    trip(breaker, failures=3)
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_opens_when_failure_rate_reached(clock):
+    breaker = make_breaker()
+    for _ in range(2):
+        breaker.record_success()
+    breaker.record_failure("a")
+    assert breaker.state == "closed"  # 1/3
+    breaker.record_failure("b")
+    assert breaker.state == "open"  # 2/4 = 0.5
+    assert breaker.opened == 1
+    assert breaker.last_failure == "b"
+
+
+def test_open_rejects_until_open_seconds_elapse(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    clock.now += 10
+    assert breaker.retry_in_s() == pytest.approx(20)
+    assert not breaker.allow()
+
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()  # 시험 호출 진행 중에는 다른 호출 거절
+
+
+def test_successful_probe_closes_and_clears_window(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.get_stats()["window_calls"] == 1
+    # 기록이 초기화되어 다시 min_calls만큼 실패해야 열림
+    trip(breaker, failures=2)
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens_with_doubled_wait(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    for expected in (60, 100, 100):  # 두 배씩, max_open_seconds까지
+        clock.now += breaker.retry_in_s()
+        assert breaker.allow()
+        breaker.record_failure("still down")
+        assert breaker.state == "open"
+        assert breaker.retry_in_s() == pytest.approx(expected)
+
+
+def test_released_probe_lets_next_call_probe(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release()  # 취소되어 결과를 알 수 없음
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def test_late_failure_while_open_is_ignored(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    breaker.record_failure("started before opening")
+    assert breaker.opened == 1
+    assert breaker.retry_in_s() == pytest.approx(30)
+
+
+def test_reset_closes(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    breaker.reset()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_registry_uses_env_defaults(monkeypatch):
+    monkeypatch.setenv("CIRCUIT_MIN_CALLS", "2")
+    monkeypatch.setenv("CIRCUIT_OPEN_SECONDS", "7")
+    registry = CircuitBreakerRegistry()
+    breaker = registry.get("serpapi")
+    assert registry.get("serpapi") is breaker
+    assert breaker.min_calls == 2 and breaker.open_seconds == 7
+    breaker.record_failure("x")
+    breaker.record_failure("y")
+    assert registry.get_stats()["serpapi"]["state"] == "open"
+    registry.reset("serpapi")
+    assert breaker.state == "closed"
+
+
+def test_only_provider_side_llm_errors_count_as_failures():
+    httpx = pytest.importorskip("httpx")
+    openai = pytest.importorskip("openai")
+    from direct_llm import _is_provider_failure
+
+    request = httpx.Request("POST", "http://127.0.0.1/v1/chat/completions")
+
+    def status_error(cls, code):
+        return cls("error", response=httpx.Response(code, request=request), body=None)
+
+    assert _is_provider_failure(status_error(openai.RateLimitError, 429))
+    assert _is_provider_failure(status_error(openai.InternalServerError, 503))
+    assert _is_provider_failure(openai.APITimeoutError(request=request))
+    assert _is_provider_failure(httpx.ReadTimeout("stream stalled"))
+    # 요청별 오류(컨텍스트 길이 초과 등)는 제공자 장애가 아님
+    assert not _is_provider_failure(status_error(openai.BadRequestError, 400))
+    assert not _is_provider_failure(ValueError("빈 응답"))
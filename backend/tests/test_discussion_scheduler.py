@@ -0,0 +1,150 @@
+"""DiscussionScheduler: 일시정지/재개, 진행 중인 턴 중단, 턴 타임아웃, 페이싱 정책"""
+import asyncio
+
+import pytest
+
+from discussion_models import ChatMessage
+from discussion_scheduler import (DiscussionScheduler, FixedPacing, NoDelayPacing, ReadingTimePacing,
+                                  make_pacing)
+
+
+class FakeChatSystem:
+    """턴마다 turn_delay초 걸려 메시지를 만드는 최소 토론 (취소되면 cancelled에 기록)"""
+
+    def __init__(self, turn_delay=0.0):
+        self.turn_delay = turn_delay
+        self.auto_discussion_enabled = True
+        self.user_intervention_pending = False
+        self.generated = 0
+        self.cancelled = 0
+
+    def start_speculative_turn(self):
+        pass
+
+    async def generate_auto_response_async(self, callback):
+        try:
+            await asyncio.sleep(self.turn_delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.generated += 1
+        return ChatMessage("분석가", f"{self.generated}번째 발언")
+
+
+async def noop_callback(event, data):
+    pass
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def test_pause_stops_turns_and_resume_continues():
+    async def scenario():
+        chat = FakeChatSystem(turn_delay=0.01)
+        scheduler = DiscussionScheduler(chat, noop_callback, pacing=NoDelayPacing())
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        scheduler.pause("user")
+        await asyncio.sleep(0.02)
+        paused_at = chat.generated
+        assert paused_at > 0 and scheduler.state == "paused" and scheduler.pause_reason == "user"
+        await asyncio.sleep(0.1)
+        assert chat.generated == paused_at
+
+        scheduler.resume()
+        await asyncio.sleep(0.1)
+        assert chat.generated > paused_at
+        await scheduler.stop()
+        assert scheduler.state == "stopped" and not scheduler.is_active
+
+    run(scenario())
+
+
+def test_pause_interrupts_turn_in_progress():
+    async def scenario():
+        chat = FakeChatSystem(turn_delay=10.0)
+        scheduler = DiscussionScheduler(chat, noop_callback, pacing=NoDelayPacing())
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        scheduler.pause()
+        await asyncio.sleep(0.05)
+        assert chat.cancelled == 1 and chat.generated == 0
+        assert scheduler.interrupted_turns == 1
+        await scheduler.stop()
+
+    run(scenario())
+
+
+def test_pause_interrupts_pacing_delay():
+    async def scenario():
+        chat = FakeChatSystem()
+        scheduler = DiscussionScheduler(chat, noop_callback, pacing=FixedPacing(10.0))
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        scheduler.pause()
+        await scheduler.stop(timeout=1.0)
+        assert chat.generated == 0 and scheduler.state == "stopped"
+
+    run(scenario())
+
+
+def test_turn_timeout_cancels_turn_and_continues():
+    async def scenario():
+        chat = FakeChatSystem(turn_delay=10.0)
+        scheduler = DiscussionScheduler(chat, noop_callback, pacing=NoDelayPacing(), turn_timeout=0.05)
+        scheduler.start()
+        await asyncio.sleep(0.2)
+        assert scheduler.timeouts >= 2 and chat.cancelled >= 2
+        await scheduler.stop()
+
+    run(scenario())
+
+
+def test_user_intervention_pauses_after_turn():
+    events = []
+
+    async def callback(event, data):
+        events.append(event)
+
+    async def scenario():
+        chat = FakeChatSystem()
+        chat.user_intervention_pending = True
+        scheduler = DiscussionScheduler(chat, callback, pacing=NoDelayPacing())
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert chat.generated == 1
+        assert scheduler.state == "paused" and scheduler.pause_reason == "user_intervention"
+        assert events == ["user_intervention_requested"]
+        await scheduler.stop()
+
+    run(scenario())
+
+
+def test_waits_for_clients_before_generating():
+    async def scenario():
+        chat = FakeChatSystem()
+        connected = asyncio.Event()
+        scheduler = DiscussionScheduler(chat, noop_callback, pacing=NoDelayPacing(), clients_connected=connected)
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert chat.generated == 0
+        connected.set()
+        await asyncio.sleep(0.05)
+        assert chat.generated > 0
+        await scheduler.stop()
+
+    run(scenario())
+
+
+def test_pacing_policies():
+    message = ChatMessage("분석가", "가" * 120)
+    assert FixedPacing(3.0).delay(message) == 3.0
+    assert NoDelayPacing().delay(message) == 0.0
+    adaptive = ReadingTimePacing(chars_per_second=12.0, min_delay=2.0, max_delay=15.0)
+    assert adaptive.delay(None) == 2.0
+    assert adaptive.delay(message) == pytest.approx(10.0)
+    assert adaptive.delay(ChatMessage("분석가", "가" * 1000)) == 15.0
+    assert isinstance(make_pacing("adaptive"), ReadingTimePacing)
+    with pytest.raises(ValueError):
+        make_pacing("random")
@@ -0,0 +1,45 @@
+"""ClientPool: 유휴 클라이언트 재사용, 취소 시 폐기, 생성 실패 시 통계 복구"""
+import pytest
+
+from cancellation import CancellationToken
+from http_clients import ClientPool
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_released_client_is_reused():
+    pool = ClientPool("test", FakeClient)
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        assert second is first
+    stats = pool.get_stats()
+    assert stats["created"] == 1 and stats["reused"] == 1 and stats["in_use"] == 0
+
+
+def test_cancelled_lease_closes_client_and_does_not_return_it():
+    pool = ClientPool("test", FakeClient)
+    token = CancellationToken("turn")
+    with pool.lease(token) as client:
+        token.cancel("stop")
+        assert client.closed
+    stats = pool.get_stats()
+    assert stats["discarded"] == 1 and stats["idle"] == 0 and stats["in_use"] == 0
+
+
+def test_factory_failure_rolls_back_counters():
+    def broken():
+        raise RuntimeError("connect failed")
+
+    pool = ClientPool("test", broken)
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass
+    stats = pool.get_stats()
+    assert stats["in_use"] == 0 and stats["created"] == 0
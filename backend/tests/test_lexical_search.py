@@ -0,0 +1,79 @@
+"""n-gram BM25 역색인과 벡터/어휘 하이브리드 결합"""
+import pytest
+
+from lexical_index import LexicalIndex
+from memory_system import MemoryIndex
+
+DOCS = [
+    "전기차 배터리 가격이 내려가고 있습니다",
+    "반도체 공급망 재편과 수출 규제",
+    "전기차 충전 인프라 확충 계획",
+    "오늘 점심 메뉴는 김치찌개",
+]
+
+
+def test_bm25_ranks_documents_sharing_query_ngrams():
+    index = LexicalIndex()
+    for doc_id, text in enumerate(DOCS):
+        index.add(doc_id, text)
+    hits = index.search("전기차 배터리", top_k=4)
+    assert hits[0][0] == 0
+    assert {doc_id for doc_id, _ in hits} <= {0, 2}
+    assert all(score > 0 for _, score in hits)
+
+
+def test_documents_must_be_added_in_order():
+    index = LexicalIndex()
+    index.add(0, DOCS[0])
+    with pytest.raises(ValueError):
+        index.add(2, DOCS[1])
+
+
+def test_empty_index_returns_nothing():
+    assert LexicalIndex().search("전기차") == []
+
+
+@pytest.fixture
+def memory_index(tmp_path):
+    index = MemoryIndex("test", str(tmp_path), embedding_dim=128)
+    index.add_memories(DOCS, [{"n": i} for i in range(len(DOCS))])
+    return index
+
+
+def test_lexical_mode_matches_bm25_scores(memory_index):
+    results = memory_index.search("반도체 수출", top_k=2, mode="lexical")
+    assert results[0]["metadata"] == {"n": 1}
+    assert results[0]["lexical_score"] == results[0]["similarity_score"]
+
+
+def test_hybrid_alpha_extremes_follow_each_signal(memory_index):
+    lexical_only = memory_index.search("전기차 충전", top_k=4, mode="hybrid", alpha=0.0)
+    assert lexical_only[0]["metadata"] == {"n": 2}
+    # alpha=0이면 결합 점수는 최고 어휘 점수로 정규화된 값
+    assert lexical_only[0]["similarity_score"] == pytest.approx(1.0)
+
+    vector_only = memory_index.search("전기차 충전", top_k=4, mode="hybrid", alpha=1.0)
+    vector = memory_index.search("전기차 충전", top_k=4, mode="vector")
+    assert vector_only[0]["metadata"] == vector[0]["metadata"]
+
+
+def test_hybrid_scores_are_weighted_sum_of_normalized_scores(memory_index):
+    alpha = 0.3
+    results = memory_index.search("전기차 배터리", top_k=4, mode="hybrid", alpha=alpha)
+    max_vector = max(max(r["vector_score"] for r in results), 1e-9)
+    max_lexical = max(max(r["lexical_score"] for r in results), 1e-9)
+    for result in results:
+        expected = alpha * max(result["vector_score"], 0.0) / max_vector + (1 - alpha) * result["lexical_score"] / max_lexical
+        assert result["similarity_score"] == pytest.approx(expected)
+    assert [r["rank"] for r in results] == list(range(1, len(results) + 1))
+
+
+def test_lexical_index_tracks_later_additions(memory_index):
+    memory_index.search("배터리", mode="lexical")
+    memory_index.add_memory("수소차 연료전지 보급", {"n": 4})
+    assert memory_index.search("수소차 연료전지", top_k=1, mode="lexical")[0]["metadata"] == {"n": 4}
+
+
+def test_unknown_search_mode_rejected(memory_index):
+    with pytest.raises(ValueError):
+        memory_index.search("전기차", mode="semantic")
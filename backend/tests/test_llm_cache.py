@@ -0,0 +1,88 @@
+"""llm_cache: on/off/replay 모드, 우회, TTL, 디스크 적중"""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from llm_cache import LLMCacheMiss, LLMResponseCache, cache_model_name, crew_cache_key
+
+
+class FakeCrew:
+    """kickoff 횟수를 세는 최소 Crew (작업 하나, 에이전트 하나)"""
+
+    def __init__(self, description="전기차 시장 전망을 정리해주세요", base_url=None):
+        self.agent = SimpleNamespace(role="분석가", goal="분석", backstory="경력",
+                                     llm=SimpleNamespace(model="gpt-4o-mini", base_url=base_url))
+        self.agents = [self.agent]
+        self.tasks = [SimpleNamespace(agent=self.agent, description=description, expected_output="한국어 요약")]
+        self.calls = 0
+
+    def kickoff(self):
+        self.calls += 1
+        return SimpleNamespace(raw=f"응답 {self.calls}", token_usage=None)
+
+
+def make_cache(tmp_path, mode, **kwargs):
+    return LLMResponseCache(cache_dir=str(tmp_path / "llm_cache"), mode=mode, **kwargs)
+
+
+def test_unknown_mode_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        make_cache(tmp_path, "sometimes")
+
+
+def test_off_mode_always_calls_and_stores_nothing(tmp_path):
+    cache = make_cache(tmp_path, "off")
+    crew = FakeCrew()
+    assert cache.kickoff(crew) == "응답 1"
+    assert cache.kickoff(crew) == "응답 2"
+    assert cache.get_stats()["stores"] == 0
+
+
+def test_on_mode_reuses_response_and_bypass_refreshes_it(tmp_path):
+    cache = make_cache(tmp_path, "on")
+    crew = FakeCrew()
+    assert cache.kickoff(crew) == "응답 1"
+    assert cache.kickoff(crew) == "응답 1"
+    assert crew.calls == 1
+
+    assert cache.kickoff(crew, bypass=True) == "응답 2"
+    assert cache.kickoff(crew) == "응답 2"
+    stats = cache.get_stats()
+    assert stats["hits"] == 2 and stats["bypassed"] == 1
+
+
+def test_different_task_or_server_is_a_different_key():
+    assert crew_cache_key(FakeCrew()) != crew_cache_key(FakeCrew(description="다른 작업"))
+    assert crew_cache_key(FakeCrew()) != crew_cache_key(FakeCrew(base_url="http://localhost:8000/v1"))
+    assert cache_model_name("gpt-4o-mini", "http://localhost:8000/v1") == "gpt-4o-mini@http://localhost:8000/v1"
+
+
+def test_disk_entries_survive_a_new_instance(tmp_path):
+    make_cache(tmp_path, "on").kickoff(FakeCrew())
+    cache = make_cache(tmp_path, "on")
+    crew = FakeCrew()
+    assert cache.kickoff(crew) == "응답 1"
+    assert crew.calls == 0
+    assert cache.get_stats()["disk_hits"] == 1
+
+
+def test_expired_entries_are_regenerated(tmp_path):
+    cache = make_cache(tmp_path, "on", ttl_seconds=0.05)
+    crew = FakeCrew()
+    cache.kickoff(crew)
+    time.sleep(0.1)
+    assert cache.kickoff(crew) == "응답 2"
+    assert cache.get_stats()["expired"] >= 1
+
+
+def test_replay_mode_serves_recorded_responses_and_raises_on_miss(tmp_path):
+    make_cache(tmp_path, "on", ttl_seconds=0.05).kickoff(FakeCrew())
+    time.sleep(0.1)
+    replay = make_cache(tmp_path, "replay", ttl_seconds=0.05)
+    crew = FakeCrew()
+    # replay는 TTL과 bypass를 무시하고 녹화된 응답만 사용
+    assert replay.kickoff(crew, bypass=True) == "응답 1"
+    assert crew.calls == 0
+    with pytest.raises(LLMCacheMiss):
+        replay.kickoff(FakeCrew(description="녹화되지 않은 작업"))
@@ -0,0 +1,186 @@
+"""FAISSMemorySystem: 채팅방 롤링 요약과 콜드 스토리지 이동, 세대 기반 검색 캐시 무효화, 전역 대화 인덱스"""
+import threading
+
+import pytest
+
+from memory_system import FAISSMemorySystem, SearchResultCache
+
+
+@pytest.fixture
+def memory(tmp_path):
+    return FAISSMemorySystem(str(tmp_path / "memory"), summary_threshold=30, summary_window=10,
+                             summary_keep_recent=10, global_flush_batch=1000, global_flush_seconds=3600)
+
+
+def add_messages(memory, room_id, count, start=0, day="2025-01-01"):
+    for n in range(start, start + count):
+        memory.add_message_to_chatroom(room_id, f"agent{n % 3}", f"전기차 배터리 시장 의견 {n}번째 메시지입니다.",
+                                       f"{day}T10:{n // 60:02d}:{n % 60:02d}")
+
+
+def raw_entries(index):
+    return [d for d in index.metadata["data"] if d.get("type") != "summary"]
+
+
+def test_summarize_moves_old_window_to_archive_and_keeps_recent(memory):
+    room_id = memory.create_chatroom("요약", "전기차")
+    add_messages(memory, room_id, 31)
+
+    hot = memory.get_chatroom_memory(room_id)
+    archive = memory.get_chatroom_archive(room_id)
+    summaries = [d for d in hot.metadata["data"] if d.get("type") == "summary"]
+    # 31개 중 최근 10개를 남기고 10개씩 두 구간을 요약 → 요약 2개 + 원본 11개
+    assert len(summaries) == 2
+    assert len(raw_entries(hot)) == 11
+    assert archive.metadata["count"] == 20
+    # 요약은 콜드 스토리지의 원본 구간을 가리키고, 원본은 순서대로 보존됨
+    assert [s["archive_range"] for s in summaries] == [[0, 10], [10, 20]]
+    assert archive.metadata["data"][0]["content"].endswith("0번째 메시지입니다.")
+    assert hot.metadata["data"][-1]["content"].endswith("30번째 메시지입니다.")
+
+
+def test_summarize_below_threshold_is_noop(memory):
+    room_id = memory.create_chatroom("짧은 방")
+    add_messages(memory, room_id, 5)
+    assert memory.summarize_chatroom(room_id) == 0
+    assert memory.get_chatroom_memory(room_id).metadata["count"] == 5
+
+
+def test_search_with_archive_finds_summarized_messages(memory):
+    room_id = memory.create_chatroom("검색", "전기차")
+    add_messages(memory, room_id, 31)
+    results = memory.search_chatroom_context(room_id, "전기차 배터리 시장 의견 3번째 메시지입니다.", top_k=20,
+                                             include_archive=True, mode="lexical")
+    assert any(r.get("archived") for r in results)
+
+
+def test_concurrent_adds_keep_every_message(memory):
+    room_id = memory.create_chatroom("동시", "전기차")
+
+    def writer(offset):
+        add_messages(memory, room_id, 25, start=offset * 100)
+
+    threads = [threading.Thread(target=writer, args=(k,)) for k in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    hot = memory.get_chatroom_memory(room_id)
+    archive = memory.get_chatroom_archive(room_id)
+    assert len(raw_entries(hot)) + archive.metadata["count"] == 100
+
+
+def test_repeated_search_is_served_from_cache(memory):
+    room_id = memory.create_chatroom("캐시")
+    add_messages(memory, room_id, 5)
+    first = memory.search_chatroom_context(room_id, "배터리 시장", top_k=3)
+    second = memory.search_chatroom_context(room_id, "배터리 시장", top_k=3)
+    assert first == second
+    stats = memory.search_cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_write_bumps_generation_and_invalidates_cached_results(memory):
+    room_id = memory.create_chatroom("무효화")
+    add_messages(memory, room_id, 3)
+    generation = memory.get_chatroom_memory(room_id).generation
+    memory.search_chatroom_context(room_id, "새로운 충전소 소식", top_k=10)
+
+    memory.add_message_to_chatroom(room_id, "agent0", "새로운 충전소 소식", "2025-01-02T09:00:00")
+    assert memory.get_chatroom_memory(room_id).generation > generation
+    results = memory.search_chatroom_context(room_id, "새로운 충전소 소식", top_k=10)
+    assert any(r["text"] == "새로운 충전소 소식" for r in results)
+    assert memory.search_cache.get_stats()["misses"] == 2
+
+
+def test_cached_results_are_copies(memory):
+    room_id = memory.create_chatroom("복사")
+    add_messages(memory, room_id, 3)
+    memory.search_chatroom_context(room_id, "시장", top_k=2)[0]["metadata"]["sender"] = "변경됨"
+    assert memory.search_chatroom_context(room_id, "시장", top_k=2)[0]["metadata"]["sender"] != "변경됨"
+
+
+def test_search_result_cache_evicts_least_recently_used():
+    cache = SearchResultCache(max_entries=2)
+    cache.put(("a",), [1])
+    cache.put(("b",), [2])
+    assert cache.get(("a",)) == [1]
+    cache.put(("c",), [3])
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == [1] and cache.get(("c",)) == [3]
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_global_search_filters_by_room_and_time(memory):
+    first = memory.create_chatroom("첫째")
+    second = memory.create_chatroom("둘째")
+    add_messages(memory, first, 5, day="2025-01-01")
+    add_messages(memory, second, 5, day="2025-02-01")
+
+    results = memory.search_all_chatrooms("배터리 시장", top_k=20, room_ids=[second], mode="lexical")
+    assert len(results) == 5 and {r["metadata"]["room_id"] for r in results} == {second}
+
+    results = memory.search_all_chatrooms("배터리 시장", top_k=20, since="2025-01-15", mode="lexical")
+    assert {r["metadata"]["room_id"] for r in results} == {second}
+
+    # until은 주어진 정밀도까지 포함 (그날 전체)
+    results = memory.search_all_chatrooms("배터리 시장", top_k=20, until="2025-01-01", mode="lexical")
+    assert len(results) == 5 and {r["metadata"]["room_id"] for r in results} == {first}
+    assert [r["rank"] for r in results] == list(range(1, 6))
+
+
+def test_global_index_keeps_summarized_messages(memory):
+    room_id = memory.create_chatroom("요약 후 전역")
+    add_messages(memory, room_id, 31)
+    memory.flush_global_memory()
+    global_data = memory.get_global_memory().metadata["data"]
+    assert len(global_data) == 31
+    assert all(d.get("type") != "summary" for d in global_data)
+
+
+def test_pending_messages_are_flushed_before_global_search(memory):
+    room_id = memory.create_chatroom("대기")
+    add_messages(memory, room_id, 3)
+    assert memory.get_global_memory().metadata["count"] == 0
+    assert len(memory.search_all_chatrooms("배터리", top_k=10, mode="lexical")) == 3
+
+
+def test_rebuild_global_index_collects_hot_and_archive_in_time_order(memory):
+    first = memory.create_chatroom("첫째")
+    second = memory.create_chatroom("둘째")
+    add_messages(memory, first, 31, day="2025-01-02")
+    add_messages(memory, second, 4, day="2025-01-01")
+
+    assert memory.rebuild_global_index() == 35
+    data = memory.get_global_memory().metadata["data"]
+    timestamps = [d["timestamp"] for d in data]
+    assert timestamps == sorted(timestamps)
+    assert sum(1 for d in data if d["room_id"] == first) == 31
+    # 재구성 결과에 이미 들어간 대기 메시지는 다시 추가되지 않음
+    assert memory.flush_global_memory() == 0
+
+
+def test_rebuild_during_concurrent_adds_loses_no_messages(memory):
+    rooms = [memory.create_chatroom(f"방{k}") for k in range(3)]
+    stop = threading.Event()
+
+    def writer(room_id):
+        n = 0
+        while not stop.is_set():
+            memory.add_message_to_chatroom(room_id, "agent", f"메시지 {n}", f"2025-01-01T10:00:{n % 60:02d}")
+            n += 1
+
+    threads = [threading.Thread(target=writer, args=(room_id,)) for room_id in rooms]
+    for thread in threads:
+        thread.start()
+    for _ in range(3):
+        memory.rebuild_global_index()
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    memory.flush_global_memory()
+    total = sum(len(raw_entries(memory.get_chatroom_memory(r))) + memory.get_chatroom_archive(r).metadata["count"]
+                for r in rooms)
+    assert memory.get_global_memory().metadata["count"] == total
@@ -0,0 +1,46 @@
+"""대화 기록(.md)으로 채팅방/전역 인덱스 일괄 재구축"""
+import numpy as np
+
+from memory_system import FAISSMemorySystem, MemoryIndex, iter_transcript_messages
+from rebuild_indexes import rebuild_all
+
+MESSAGES = [
+    ("사회자", "오늘 주제는 전기차 시장입니다.\n\n두 줄로 된 메시지도 있습니다."),
+    ("분석가", "배터리 가격이 계속 내려가고 있습니다."),
+    ("투자자", "충전 인프라가 관건입니다."),
+]
+
+
+def write_room(memory_dir):
+    memory = FAISSMemorySystem(memory_dir)
+    room_id = memory.create_chatroom("재구축", "전기차")
+    for n, (sender, content) in enumerate(MESSAGES):
+        memory.add_message_to_chatroom(room_id, sender, content, f"2025-01-01T09:00:0{n}")
+    return room_id
+
+
+def test_transcript_parser_round_trips_messages(tmp_path):
+    memory_dir = str(tmp_path / "memory")
+    room_id = write_room(memory_dir)
+    parsed = list(iter_transcript_messages(f"{memory_dir}/chatrooms/{room_id}_conversation.md"))
+    assert [(m["sender"], m["content"]) for m in parsed] == MESSAGES
+    assert parsed[0]["timestamp"] == "2025-01-01T09:00:00"
+
+
+def test_rebuild_matches_incremental_index_and_skips_unchanged(tmp_path):
+    memory_dir = str(tmp_path / "memory")
+    room_id = write_room(memory_dir)
+    incremental = MemoryIndex(f"chatrooms/{room_id}", memory_dir, 128)
+    expected = np.vstack([incremental.index.reconstruct(i) for i in range(incremental.index.ntotal)])
+
+    summary = rebuild_all(memory_dir, workers=0, force=True, include_global=True)
+    assert summary["rebuilt"] == 1 and summary["messages"] == len(MESSAGES)
+    assert summary["global_messages"] == len(MESSAGES)
+
+    rebuilt = MemoryIndex(f"chatrooms/{room_id}", memory_dir, 128)
+    assert rebuilt.metadata["texts"] == [content for _, content in MESSAGES]
+    actual = np.vstack([rebuilt.index.reconstruct(i) for i in range(rebuilt.index.ntotal)])
+    assert np.allclose(actual, expected)
+
+    # 대화 기록이 그대로면 체크섬이 같아 다시 만들지 않음
+    assert rebuild_all(memory_dir, workers=0)["skipped"] == 1
@@ -0,0 +1,95 @@
+"""research_cache: 질의 정규화와 캐시 조회(적중, 저장 조건, stale-while-revalidate)"""
+import pytest
+
+from research_cache import ResearchCache, make_cache_key, normalize_query
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("AI의 최신 동향은?", "ai 최신 동향"),
+    ("  전기차   시장에서  전망!! ", "전기차 시장 전망"),
+    ("한국에서는 어떻게", "한국 어떻게"),  # 긴 조사("에서는")가 먼저 떨어짐
+    ("ＡＩ 시장", "ai 시장"),  # NFKC (전각 문자)
+    ("2024년 반도체와 배터리", "2024년 반도체 배터리"),
+])
+def test_normalize_query_strips_particles_and_punctuation(query, expected):
+    assert normalize_query(query) == expected
+
+
+@pytest.mark.parametrize("word", ["국가", "평가", "나이", "도", "만"])
+def test_normalize_query_keeps_short_words_that_end_like_particles(word):
+    # 조사를 떼면 한 글자 이하만 남는 단어는 그대로 둠
+    assert normalize_query(word) == word
+
+
+def test_normalize_query_handles_empty_and_non_korean_words():
+    assert normalize_query("") == ""
+    assert normalize_query(None) == ""
+    assert normalize_query("EV market, 2024") == "ev market 2024"
+
+
+def test_cache_key_ignores_surface_differences_but_not_provider():
+    assert make_cache_key("serpapi", "AI의 최신 동향은?") == make_cache_key("serpapi", "ai 최신 동향")
+    assert make_cache_key("serpapi", "ai 최신 동향") != make_cache_key("duckduckgo", "ai 최신 동향")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    instance = ResearchCache(cache_dir=str(tmp_path / "research_cache"), mode="on", stale_seconds=3600)
+    yield instance
+    instance._refresher.shutdown(wait=True)
+
+
+def test_fetch_miss_then_hit(cache):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return "검색 결과"
+
+    assert cache.fetch("serpapi", "전기차 시장은?", fetch, bool) == "검색 결과"
+    assert cache.fetch("serpapi", "전기차 시장", fetch, bool) == "검색 결과"
+    assert len(calls) == 1
+    stats = cache.get_stats()
+    assert stats["misses"] == 1 and stats["hits"] == 1
+
+
+def test_unaccepted_result_is_not_stored(cache):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return "오류: 결과 없음"
+
+    for _ in range(2):
+        cache.fetch("serpapi", "q", fetch, lambda result: not result.startswith("오류"))
+    assert len(calls) == 2
+    assert not cache.contains("serpapi", "q")
+
+
+def test_disk_entry_survives_new_instance(cache, tmp_path):
+    cache.put("duckduckgo", "반도체 수요", "저장된 결과")
+    other = ResearchCache(cache_dir=cache.cache_dir, mode="on")
+    try:
+        assert other.fetch("duckduckgo", "반도체 수요", lambda: "새 결과", bool) == "저장된 결과"
+        assert other.get_stats()["disk_hits"] == 1
+    finally:
+        other._refresher.shutdown(wait=True)
+
+
+def test_stale_entry_is_served_and_refreshed_in_background(cache):
+    cache.put("serpapi", "q", "오래된 결과")
+    key = make_cache_key("serpapi", "q")
+    cache._entries[key]["created_at"] -= cache.ttl_for("serpapi") + 1
+
+    assert cache.fetch("serpapi", "q", lambda: "새 결과", bool) == "오래된 결과"
+    cache._refresher.shutdown(wait=True)
+    assert cache.get_stats()["stale_hits"] == 1
+    assert cache.get_stats()["refreshes"] == 1
+    assert cache.fetch("serpapi", "q", lambda: "다른 결과", bool) == "새 결과"
+
+
+def test_off_mode_always_fetches(tmp_path):
+    cache = ResearchCache(cache_dir=str(tmp_path), mode="off")
+    results = iter(["a", "b"])
+    assert cache.fetch("serpapi", "q", lambda: next(results), bool) == "a"
+    assert cache.fetch("serpapi", "q", lambda: next(results), bool) == "b"
@@ -0,0 +1,58 @@
+"""RunningSummary: 토큰 예산 안의 문맥 구성과 점진적 갱신"""
+import datetime
+
+from discussion_models import ChatMessage
+from running_summary import RunningSummary, count_tokens, truncate_to_tokens
+
+START = datetime.datetime(2025, 1, 1, 9, 0, 0)
+
+
+def history(count, message_type="message"):
+    return [ChatMessage(f"agent{n % 3}", f"{n}번째 의견입니다. 전기차 배터리 원가가 핵심 변수라고 봅니다.",
+                        START + datetime.timedelta(seconds=n), message_type)
+            for n in range(count)]
+
+
+def test_truncate_to_tokens_respects_budget():
+    text = "전기차 시장은 빠르게 성장하고 있습니다. " * 20
+    truncated = truncate_to_tokens(text, 15)
+    assert count_tokens(truncated) <= 15
+    assert text.startswith(truncated)
+    assert truncate_to_tokens("짧음", 100) == "짧음"
+
+
+def test_update_waits_for_interval_unless_forced():
+    summary = RunningSummary(update_interval=6)
+    messages = history(5)
+    assert not summary.update(messages)
+    assert summary.update(messages, force=True)
+    assert summary.covered_count == 5
+    # 이미 반영한 메시지는 다시 읽지 않음
+    assert summary.pending_count(messages) == 0
+    messages += history(8)[5:]
+    assert summary.pending_count(messages) == 3
+
+
+def test_system_messages_are_not_summarized():
+    summary = RunningSummary(update_interval=1)
+    assert not summary.update(history(3, message_type="system"))
+
+
+def test_build_context_stays_within_budget_and_keeps_latest_messages():
+    messages = history(40)
+    summary = RunningSummary(update_interval=6)
+    summary.update(messages[:30])
+    for budget in (50, 200, 800):
+        context = summary.build_context(messages, budget)
+        assert count_tokens(context) <= budget
+        assert messages[-1].content[:10] in context
+    context = summary.build_context(messages, 800)
+    assert context.startswith("[지금까지의 토론 요약]")
+    # 요약은 예산의 절반을 넘지 않음
+    assert count_tokens(context.split("\n\n[최근 대화]")[0]) <= 400
+
+
+def test_build_context_truncates_single_long_message():
+    message = ChatMessage("사회자", "아주 긴 발언입니다. " * 200, START)
+    context = RunningSummary().build_context([message], 30)
+    assert 0 < count_tokens(context) <= 30
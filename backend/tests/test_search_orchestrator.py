@@ -0,0 +1,135 @@
+"""SearchOrchestrator: 전략별 승자 선택, 시작 지연, 마감 시간"""
+import threading
+import time
+
+import pytest
+
+from search_orchestrator import SearchOrchestrator, SearchProvider
+
+# 테스트 시간을 줄이려고 시작 지연을 짧게 잡음 (타이밍 판정은 지연보다 충분히 큰 여유를 둠)
+DELAYS = (0.0, 0.2, 0.4)
+
+
+def provider(name, result="결과", delay=0.0, ok=True, calls=None):
+    def search(query, token):
+        if calls is not None:
+            calls.append(name)
+        # 취소되면 바로 끝나도록 토큰을 기다림
+        cancelled = threading.Event()
+        token.on_cancel(cancelled.set)
+        cancelled.wait(delay)
+        return f"{name}:{result}"
+    return SearchProvider(name, search, lambda r: ok)
+
+
+def failing(name, delay=0.0, calls=None):
+    def search(query, token):
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        raise RuntimeError("provider down")
+    return SearchProvider(name, search, lambda r: True)
+
+
+def orchestrator(strategy, deadline_s=5.0):
+    return SearchOrchestrator(strategy=strategy, deadline_s=deadline_s, hedge_delays=DELAYS, max_workers=8)
+
+
+def test_unknown_strategy_rejected():
+    with pytest.raises(ValueError):
+        SearchOrchestrator(strategy="random")
+    with pytest.raises(ValueError):
+        SearchOrchestrator(losers="ignore")
+
+
+def test_hedged_first_provider_wins_without_launching_others():
+    outcome = orchestrator("hedged").search("q", [provider("a", delay=0.05), provider("b"), provider("c")])
+    assert outcome["provider"] == "a"
+    assert outcome["result"] == "a:결과"
+    assert outcome["launched"] == ["a"]
+
+
+def test_hedged_launches_backup_after_delay_and_takes_faster_result():
+    calls = []
+    outcome = orchestrator("hedged").search("q", [provider("slow", delay=2.0, calls=calls),
+                                                  provider("fast", delay=0.05, calls=calls)])
+    assert outcome["provider"] == "fast"
+    assert outcome["launched"] == ["slow", "fast"]
+    # 백업은 시작 지연(0.2초) 뒤에 시작했고, 느린 제공자를 끝까지 기다리지 않음
+    assert 0.2 <= outcome["elapsed_s"] < 1.0
+
+
+def test_hedged_starts_next_provider_immediately_when_previous_fails():
+    outcome = orchestrator("hedged").search("q", [failing("a"), provider("b")])
+    assert outcome["provider"] == "b"
+    assert outcome["elapsed_s"] < DELAYS[1]
+
+
+def test_unacceptable_result_is_not_chosen():
+    orch = orchestrator("hedged")
+    outcome = orch.search("q", [provider("a", ok=False), provider("b")])
+    assert outcome["provider"] == "b"
+    assert orch.get_stats()["providers"]["a"]["failures"] == 1
+
+
+def test_parallel_launches_all_and_fastest_wins():
+    orch = orchestrator("parallel")
+    outcome = orch.search("q", [provider("a", delay=1.0), provider("b", delay=0.5), provider("c", delay=0.05)])
+    assert outcome["provider"] == "c"
+    assert outcome["launched"] == ["a", "b", "c"]
+    stats = orch.get_stats()["providers"]
+    assert stats["c"]["wins"] == 1
+    assert stats["a"]["cancelled"] == 1 and stats["b"]["cancelled"] == 1
+
+
+def test_sequential_waits_for_failure_before_next_provider():
+    calls = []
+    outcome = orchestrator("sequential").search("q", [provider("a", delay=0.3, calls=calls),
+                                                      provider("b", calls=calls)])
+    # 첫 제공자가 느려도 성공하면 다음 제공자는 시작하지 않음
+    assert outcome["provider"] == "a"
+    assert calls == ["a"]
+
+    outcome = orchestrator("sequential").search("q", [failing("a"), failing("b"), provider("c")])
+    assert outcome["provider"] == "c"
+    assert outcome["launched"] == ["a", "b", "c"]
+
+
+def test_all_providers_fail_returns_no_result():
+    orch = orchestrator("hedged")
+    outcome = orch.search("q", [failing("a"), failing("b")])
+    assert outcome["result"] is None and outcome["provider"] is None
+    assert not outcome["deadline_exceeded"]
+    assert orch.get_stats()["no_result"] == 1
+
+
+def test_deadline_expiry_cancels_pending_providers():
+    orch = orchestrator("parallel", deadline_s=0.3)
+    started = time.perf_counter()
+    outcome = orch.search("q", [provider("a", delay=5.0), provider("b", delay=5.0)])
+    assert time.perf_counter() - started < 1.0
+    assert outcome["result"] is None
+    assert outcome["deadline_exceeded"]
+    stats = orch.get_stats()
+    assert stats["deadline_exceeded"] == 1
+    assert stats["providers"]["a"]["cancelled"] == 1
+
+
+def test_drain_policy_lets_losers_finish_and_counts_them_separately():
+    finished = threading.Event()
+    tokens = []
+
+    def slow(query, token):
+        tokens.append(token)
+        time.sleep(0.3)
+        finished.set()
+        return "slow:결과"
+
+    orch = SearchOrchestrator(strategy="parallel", deadline_s=5.0, hedge_delays=DELAYS, max_workers=8, losers="drain")
+    outcome = orch.search("q", [SearchProvider("slow", slow, lambda r: True), provider("fast")])
+    assert outcome["provider"] == "fast"
+    stats = orch.get_stats()["providers"]["slow"]
+    assert stats["drained"] == 1 and stats["cancelled"] == 0
+    # 진 제공자의 토큰은 취소되지 않고 요청을 끝까지 마침
+    assert finished.wait(2.0)
+    assert not tokens[0].cancelled
@@ -66,6 +66,8 @@ function App() {
   const { 
     messages, 
     addMessage, 
+    applyMessageDelta,
+    completeMessage,
     clearMessages,
     status,
     updateStatus 
@@ -81,6 +83,10 @@ function App() {
     onMessage: (data) => {
       if (data.type === 'message') {
         addMessage(data.data);
+      } else if (data.type === 'message_delta') {
+        applyMessageDelta(data.data);
+      } else if (data.type === 'message_complete') {
+        completeMessage(data.data);
       } else if (data.type === 'discussion_started') {
         // 이미 discussionStarted가 true이므로 상태 변경 없이 메시지만 추가
         if (data.data.messages) {
@@ -304,6 +304,7 @@ function MemoryDashboard() {
   const [chatrooms, setChatrooms] = useState([]);
   const [searchQuery, setSearchQuery] = useState('');
   const [searchType, setSearchType] = useState('common');
+  const [searchMode, setSearchMode] = useState('hybrid');
   const [searchResults, setSearchResults] = useState([]);
   const [isSearching, setIsSearching] = useState(false);
   const [selectedChatroom, setSelectedChatroom] = useState(null);
@@ -366,7 +367,8 @@ function MemoryDashboard() {
         body: JSON.stringify({
           query: searchQuery,
           agent_name: searchType === 'common' ? null : searchType,
-          top_k: 10
+          top_k: 10,
+          mode: searchMode
         }),
       });
 
@@ -597,6 +599,14 @@ function MemoryDashboard() {
                 <option value="최홍보">최홍보 (마케팅)</option>
                 <option value="박테크">박테크 (IT)</option>
               </SearchTypeSelect>
+              <SearchTypeSelect
+                value={searchMode}
+                onChange={(e) => setSearchMode(e.target.value)}
+              >
+                <option value="hybrid">하이브리드</option>
+                <option value="lexical">키워드</option>
+                <option value="vector">벡터</option>
+              </SearchTypeSelect>
               <SearchButton
                 type="submit"
                 disabled={isSearching}
@@ -618,7 +628,11 @@ function MemoryDashboard() {
                 >
                   <ResultText>{result.text}</ResultText>
                   <ResultMeta>
-                    <span>유사도: {(result.similarity_score * 100).toFixed(1)}%</span>
+                    {searchMode === 'lexical' ? (
+                      <span>BM25: {result.similarity_score.toFixed(2)}</span>
+                    ) : (
+                      <span>유사도: {(result.similarity_score * 100).toFixed(1)}%</span>
+                    )}
                     <span>순위: #{result.rank}</span>
                   </ResultMeta>
                 </ResultItem>
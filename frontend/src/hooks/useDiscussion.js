@@ -39,6 +39,43 @@ export const useDiscussion = () => {
     }));
   }, []);
 
+  // 스트리밍 중인 발언 조각: 같은 id 메시지에 이어 붙이고, 없으면 새로 만듦
+  const applyMessageDelta = useCallback(({ id, sender, delta }) => {
+    setMessages(prev => {
+      const index = prev.findIndex(msg => msg.id === id);
+      if (index === -1) {
+        return [...prev, {
+          id,
+          sender,
+          content: delta,
+          timestamp: new Date().toISOString(),
+          message_type: 'message',
+          streaming: true
+        }];
+      }
+      const updated = [...prev];
+      updated[index] = { ...updated[index], content: updated[index].content + delta };
+      return updated;
+    });
+  }, []);
+
+  // 스트리밍 완료: 최종 내용으로 교체 (스트리밍 없이 온 메시지면 새로 추가)
+  const completeMessage = useCallback((message) => {
+    setMessages(prev => {
+      const index = prev.findIndex(msg => msg.id === message.id);
+      if (index === -1) {
+        return [...prev, message];
+      }
+      const updated = [...prev];
+      updated[index] = { ...message, streaming: false };
+      return updated;
+    });
+    setStatus(prev => ({
+      ...prev,
+      totalMessages: prev.totalMessages + 1
+    }));
+  }, []);
+
   const clearMessages = useCallback(() => {
     setMessages([]);
   }, []);
@@ -54,6 +91,8 @@ export const useDiscussion = () => {
   return {
     messages,
     addMessage,
+    applyMessageDelta,
+    completeMessage,
     clearMessages,
     status,
     updateStatus